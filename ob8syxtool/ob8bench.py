@@ -0,0 +1,236 @@
+#
+# MIT License
+#
+# Copyright (c) 2022 Christian-E! / Ten by Ten Software
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+#
+# This script times the OB-8 program decoders and renderers in the ob8syx package on random banks of any size
+#
+
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from ob8syx import getOB8Programs, getOB8ProgramColumns, getOB8ProgramsFromColumns, getOB8FramesFromRecords, writeOB8ProgramsText, writeOB8ProgramsHTML, writeOB8ProgramsStaticHTML, writeOB8ProgramsLazyHTML
+from ob8syx import writeOB8ColumnsText, writeOB8ColumnsHTML, writeOB8ColumnsStaticHTML, writeOB8ColumnsLazyHTML
+
+# makes a bank of programCount programs by repeating the programs of a sysex file
+def makeOB8Bank(sampleBuf, programCount):
+	sampleCount = int(len(sampleBuf)/60)
+	repeats = int(programCount / sampleCount) + 1
+	return (sampleBuf * repeats)[:programCount*60]
+
+# makes a bank of programCount valid programs with random parameters, in slot order like a synth's bank dump
+# the programs are made a million at a time and the bank is returned as a bytearray without copying it,
+# so even banks of 10 million programs only take the memory of their bytes
+def makeOB8RandomBank(programCount, seed=0, chunkSize=1000000):
+	import numpy as np
+	rng = np.random.default_rng(seed)
+	frames = bytearray(programCount*60)
+	for start in range(0, programCount, chunkSize):
+		count = min(chunkSize, programCount - start)
+		records = rng.integers(0, 256, size=(count, 28), dtype=np.uint8)
+		records[:, 0] = np.arange(start, start+count) % 120
+		frames[start*60:(start+count)*60] = getOB8FramesFromRecords(records.tobytes())
+	return frames
+
+# an output file that throws the text away and counts it, so renderers can be timed on any number of programs
+class OB8BenchSink:
+	__slots__ = ('size',)
+
+	def __init__(self):
+		self.size = 0
+
+	def write(self, text):
+		self.size += len(text)
+
+# the stages timed on every bank as (prepare, run): prepare turns a chunk of the bank into the input of run, untimed,
+# and run(sink, input) is timed, with an OB8BenchSink for the renderers to write to
+# the col- renderers write the same output from the columns of the batch decoder, as --batch does
+ob8BenchStages = {
+	'dict': (None, lambda sink, buf: getOB8Programs(buf)),
+	'columns': (None, lambda sink, buf: getOB8ProgramColumns(buf)),
+	'batch': (None, lambda sink, buf: getOB8ProgramsFromColumns(getOB8ProgramColumns(buf))),
+	'text': (getOB8Programs, writeOB8ProgramsText),
+	'html': (getOB8Programs, writeOB8ProgramsHTML),
+	'static': (getOB8Programs, writeOB8ProgramsStaticHTML),
+	'lazy': (getOB8Programs, writeOB8ProgramsLazyHTML),
+	'col-text': (getOB8ProgramColumns, writeOB8ColumnsText),
+	'col-html': (getOB8ProgramColumns, writeOB8ColumnsHTML),
+	'col-static': (getOB8ProgramColumns, writeOB8ColumnsStaticHTML),
+	'col-lazy': (getOB8ProgramColumns, writeOB8ColumnsLazyHTML),
+}
+
+# the decode stages are measured against the sysex bytes read, the render stages against the text written
+ob8BenchDecodeStages = ('dict', 'columns', 'batch')
+
+# runs a stage over a bank chunkSize programs at a time and returns (seconds, outputSize)
+def runOB8BenchStage(stage, buf, chunkSize):
+	prepare, run = ob8BenchStages[stage]
+	sink = OB8BenchSink()
+	seconds = 0
+	for start in range(0, len(buf), chunkSize*60):
+		chunk = buf[start:start+chunkSize*60]
+		data = prepare(chunk) if prepare else chunk
+		startTime = time.perf_counter()
+		run(sink, data)
+		seconds += time.perf_counter() - startTime
+		del data
+	return seconds, sink.size
+
+# returns the most memory a stage needs on top of its input, from the first chunk of a bank: the chunks are run one
+# at a time, so this is the peak of the whole stage. It is the growth of the peak resident set size of a forked process
+# that runs the stage, which costs no more than the stage itself. Where there is no fork, tracemalloc counts the
+# Python allocations instead, which slows pure Python stages down more than twentyfold
+def traceOB8BenchStage(stage, buf, chunkSize):
+	prepare, run = ob8BenchStages[stage]
+	chunk = buf[:chunkSize*60]
+	data = prepare(chunk) if prepare else chunk
+	if not hasattr(os, 'fork'):
+		tracemalloc.start()
+		try:
+			run(OB8BenchSink(), data)
+			return tracemalloc.get_traced_memory()[1]
+		finally:
+			tracemalloc.stop()
+
+	import resource
+	readFd, writeFd = os.pipe()
+	pid = os.fork()
+	if not pid:
+		# a forked process starts with a peak of what it has resident, the bank and the prepared input
+		os.close(readFd)
+		start = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+		run(OB8BenchSink(), data)
+		os.write(writeFd, str(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - start).encode('ascii'))
+		os._exit(0)
+	os.close(writeFd)
+	with os.fdopen(readFd, 'rb') as f:
+		growth = f.read()
+	os.waitpid(pid, 0)
+	# ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+	return int(growth) * (1 if sys.platform == 'darwin' else 1024)
+
+# times a stage on a bank, repeating it until it has run for at least minSeconds so small banks are timed reliably,
+# and measures its peak memory with traceOB8BenchStage unless traceMemory is False
+# returns a result dict for the JSON report
+def timeOB8BenchStage(stage, buf, chunkSize, minSeconds=0.2, traceMemory=True):
+	programCount = len(buf)//60
+	runs = 0
+	seconds = 0
+	while seconds < minSeconds or not runs:
+		runSeconds, outputSize = runOB8BenchStage(stage, buf, chunkSize)
+		seconds += runSeconds
+		runs += 1
+	seconds /= runs
+	peakBytes = traceOB8BenchStage(stage, buf, chunkSize) if traceMemory else None
+	size = len(buf) if stage in ob8BenchDecodeStages else outputSize
+	return {'programs': programCount, 'stage': stage, 'runs': runs, 'seconds': seconds,
+		'programsPerSecond': programCount/seconds if seconds else None,
+		'megabytesPerSecond': size/1e6/seconds if seconds else None,
+		'peakBytes': peakBytes}
+
+# returns what the results were measured on, so reports from different versions and machines can be told apart,
+# with a hash of the sources of the ob8syx package as the version
+def getOB8BenchInfo(args):
+	import numpy
+	import ob8syx
+	packageDir = os.path.dirname(os.path.abspath(ob8syx.__file__))
+	toolHash = hashlib.sha1()
+	for name in sorted(os.listdir(packageDir)):
+		if name.endswith('.py'):
+			with open(os.path.join(packageDir, name), 'rb') as f:
+				toolHash.update(f.read())
+	return {'date': datetime.datetime.now().isoformat(timespec='seconds'), 'ob8syxtool': toolHash.hexdigest(), 'python': platform.python_version(),
+		'numpy': numpy.__version__, 'platform': platform.platform(), 'processor': platform.processor(),
+		'seed': args.seed, 'sample': args.sample, 'chunk': args.chunk}
+
+# prints how much faster (above 1) or slower every stage ran than in an earlier JSON report
+def printOB8BenchChanges(results, baseline):
+	before = {(result['programs'], result['stage']): result for result in baseline['results']}
+	print('\nchanges from {} ({})'.format(baseline['info']['date'], baseline['info']['ob8syxtool'][:12]))
+	for result in results:
+		old = before.get((result['programs'], result['stage']))
+		if not old or not result['seconds']:
+			continue
+		memory = ''
+		if result['peakBytes'] is not None and old['peakBytes']:
+			memory = '  memory {: >6.2f}x'.format(result['peakBytes']/old['peakBytes'])
+		print('{: >9}  {: <10} speed {: >6.2f}x{}'.format(result['programs'], result['stage'], old['seconds']/result['seconds'], memory))
+
+# main
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Times the OB-8 decoders and renderers on random banks, reporting throughput and peak memory')
+	parser.add_argument('counts', type=int, nargs='*', default=[120, 10000, 1000000], metavar='count', help='number of programs per bank')
+	parser.add_argument('--stages', default=','.join(ob8BenchStages), metavar='stage,...', help='stages to time, from {} (default all)'.format(', '.join(ob8BenchStages)))
+	parser.add_argument('--sample', metavar='inFile', help='build the banks by repeating the programs of an OB-8 sysex file instead of making random ones')
+	parser.add_argument('--seed', type=int, default=0, help='seed of the random banks (default 0)')
+	parser.add_argument('--chunk', type=int, default=65536, metavar='N', help='programs decoded and rendered at a time (default 65536)')
+	parser.add_argument('--no-memory', dest='memory', action='store_false', help='skip the extra runs that measure peak memory')
+	parser.add_argument('--json', metavar='outFile', help='save the results as JSON')
+	parser.add_argument('--baseline', type=argparse.FileType('r'), metavar='jsonFile', help='compare the results with an earlier --json report')
+	parser.add_argument('--write', metavar='syxFile', help='only write a random bank of the first count programs to a sysex file')
+	args = parser.parse_args()
+	stages = args.stages.split(',')
+	for stage in stages:
+		if stage not in ob8BenchStages:
+			parser.error('unknown stage {}'.format(stage))
+
+	if args.write:
+		with open(args.write, 'wb') as f:
+			f.write(makeOB8RandomBank(args.counts[0], args.seed))
+		sys.exit()
+
+	if args.sample:
+		with open(args.sample, 'rb') as f:
+			sampleBuf = f.read()
+
+	# warm up so the NumPy import is not counted against the first bank
+	getOB8ProgramColumns(makeOB8RandomBank(1))
+
+	results = []
+	print('{: >9}  {: <10}  {: >10}  {: >12}  {: >8}  {: >10}'.format('programs', 'stage', 'seconds', 'programs/s', 'MB/s', 'peak MB'))
+	for programCount in args.counts:
+		buf = makeOB8Bank(sampleBuf, programCount) if args.sample else makeOB8RandomBank(programCount, args.seed)
+		# the batch decoder must decode the same programs as the dict decoder
+		sample = buf[:1000*60]
+		if getOB8Programs(sample) != getOB8ProgramsFromColumns(getOB8ProgramColumns(sample)):
+			print('{: >9}  the dict and batch decoders disagree'.format(programCount))
+		for stage in stages:
+			result = timeOB8BenchStage(stage, buf, args.chunk, traceMemory=args.memory)
+			results.append(result)
+			peak = '-' if result['peakBytes'] is None else '{:.1f}'.format(result['peakBytes']/1e6)
+			print('{: >9}  {: <10}  {: >9.4f}s  {: >12.0f}  {: >8.1f}  {: >10}'.format(programCount, stage, result['seconds'], result['programsPerSecond'] or 0, result['megabytesPerSecond'] or 0, peak), flush=True)
+		del buf
+
+	report = {'info': getOB8BenchInfo(args), 'results': results}
+	if args.json:
+		with open(args.json, 'w') as f:
+			json.dump(report, f, indent='\t')
+	if args.baseline:
+		printOB8BenchChanges(results, json.load(args.baseline))
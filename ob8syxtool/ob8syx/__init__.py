@@ -0,0 +1,95 @@
+#
+# MIT License
+#
+# Copyright (c) 2022 Christian-E! / Ten by Ten Software
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+#
+# The ob8syx package decodes, prints, exports and compares Oberheim OB-8 sysex programs. Its modules are only
+# imported when one of their names is first used, so a program that just decodes sysex does not pay for the html
+# renderers, the exporters or the command line:
+#
+#   import ob8syx
+#   programs = ob8syx.getOB8Programs(sysexBytes)
+#
+
+import importlib
+
+# the module of every public name
+ob8Modules = {
+	'ledOnOff': 'programs', 'getOB8ProgramGroup': 'programs', 'getOB8ProgramNumber': 'programs', 'getOB8Program': 'programs',
+	'getOB8Programs': 'programs', 'ob8SysexHeader': 'programs', 'findOB8Frame': 'programs', 'ob8DataBytes': 'programs', 'ob8RealtimeBytes': 'programs', 'ob8FrameRunLength': 'programs',
+	'isOB8FrameRun': 'programs', 'scanOB8FrameRuns': 'programs', 'scanOB8FrameRange': 'programs', 'scanOB8Frames': 'programs', 'OB8ProgramParser': 'programs', 'mapOB8File': 'programs',
+	'iterOB8Frames': 'programs', 'getOB8ProgramAt': 'programs', 'readOB8Chunks': 'programs', 'iterOB8Programs': 'programs', 'ob8ProgramGroups': 'programs', 'ob8ProgramKeys': 'programs',
+	'ob8ProgramFields': 'programs', 'ob8ProgramRecordSize': 'programs', 'getOB8ProgramRecord': 'programs', 'ob8ProgramSchema': 'programs', 'getOB8FieldSource': 'programs', 'getOB8FieldValue': 'programs', 'ob8HighNibbleMask': 'programs', 'getOB8SchemaSource': 'programs', 'compileOB8Schema': 'programs', 'getOB8ProgramFromRecord': 'programs', 'getOB8PackedFields': 'programs', 'makeOB8ProgramField': 'programs', 'OB8Program': 'programs', 'ob8ProgramKeySet': 'programs',
+	'OB8ProgramBank': 'programs', 'ob8ProgramPackedFields': 'programs', 'getOB8ParameterBytes': 'programs', 'getOB8ProgramRecordFromDict': 'programs', 'ob8LowNibbles': 'programs', 'ob8HighNibbles': 'programs',
+	'getOB8FramesFromRecords': 'programs', 'getOB8ProgramFrame': 'programs', 'getOB8ProgramRecords': 'programs', 'writeOB8Programs': 'programs', 'getOB8ProgramHash': 'programs', 'ob8KnobKeys': 'programs',
+	'ob8SwitchKeys': 'programs', 'printOB8BadFrames': 'programs',
+	'ob8ProgramTextLines': 'text', 'ob8ProgramTextFormat': 'text', 'ob8ProgramTextFields': 'text', 'writeOB8ProgramText': 'text', 'writeOB8ProgramsText': 'text',
+	'getOB8ProgramTextTemplate': 'text', 'writeOB8ColumnsText': 'text', 'dumpOB8ProgramsText': 'text',
+	'dumpOB8ProgramDictToJS': 'panels', 'dumpOB8StyleCSS': 'panels', 'dumpOB8HeadHTML': 'panels', 'dumpOB8TopBoilerplateHTML': 'panels', 'dumpOB8RendererJS': 'panels', 'dumpOB8ProgramsHeaderHTML': 'panels',
+	'dumpOB8ProgramHTML': 'panels', 'writeOB8ProgramsHTML': 'panels', 'writeOB8ColumnsHTML': 'panels', 'dumpOB8ProgramsHTML': 'panels', 'dumpOB8LazyRendererHTML': 'panels', 'writeOB8ProgramsLazyHTML': 'panels', 'writeOB8ColumnsLazyHTML': 'panels',
+	'dumpOB8BottomBoilerplateHTML': 'panels',
+	'ob8PanelColumns': 'panels', 'ob8StaticCellWidth': 'panels', 'ob8StaticGap': 'panels', 'ob8StaticRowHeights': 'panels', 'ob8StaticKnobSVG': 'panels', 'ob8StaticButtonSVGs': 'panels',
+	'getOB8StaticPanelLayout': 'panels', 'getOB8KnobRotation': 'panels', 'getOB8StaticControlCorner': 'panels', 'dumpOB8StaticSpritesHTML': 'panels', 'getOB8StaticDataURL': 'panels',
+	'dumpOB8StaticStyleCSS': 'panels', 'getOB8StaticControls': 'panels', 'getOB8StaticControlCells': 'panels',
+	'getOB8StaticPanelTemplate': 'panels', 'writeOB8ProgramStaticHTML': 'panels', 'writeOB8ProgramsStaticHTML': 'panels', 'writeOB8ColumnsStaticHTML': 'panels', 'dumpOB8ProgramsHeaderStaticHTML': 'panels', 'dumpOB8StaticTopBoilerplateHTML': 'panels', 'dumpOB8StaticBottomBoilerplateHTML': 'panels',
+	'getOB8RecordsFromColumns': 'columns', 'getOB8ProgramColumns': 'columns', 'getOB8ProgramsFromColumns': 'columns', 'getOB8ColumnStrings': 'columns', 'writeOB8ColumnRows': 'columns', 'compileOB8Where': 'columns', 'OB8ProgramListColumns': 'columns', 'filterOB8Columns': 'columns',
+	'filterOB8Programs': 'columns',
+	'openOB8Cache': 'cache', 'getOB8CachedRecords': 'cache', 'touchOB8Cache': 'cache', 'trimOB8Cache': 'cache',
+	'iterOB8FilePrograms': 'files', 'iterOB8CachedFilePrograms': 'files', 'iterOB8RecordPrograms': 'files', 'writeOB8ProgramsHeader': 'files', 'writeOB8ProgramsAs': 'files', 'writeOB8ColumnsAs': 'files', 'ob8StatsPhases': 'files', 'newOB8FileStats': 'files',
+	'getOB8PhaseClock': 'files', 'addOB8PhaseTime': 'files', 'ob8StatsHooks': 'files', 'addOB8StatsHook': 'files', 'removeOB8StatsHook': 'files', 'getOB8PeakRSS': 'files',
+	'writeOB8FileStatsText': 'files', 'getOB8RunStats': 'files', 'writeOB8StatsJSON': 'files', 'writeOB8Profile': 'files', 'writeOB8File': 'files', 'openOB8JobCache': 'files', 'writeOB8FileJob': 'files',
+	'iterOB8FileJobs': 'files',
+	'ob8ExportKeys': 'export', 'ob8ExportFormats': 'export', 'iterOB8ExportFrames': 'export', 'getOB8ExportRecords': 'export', 'getOB8ExportDigests': 'export', 'getOB8IntegerDigits': 'export',
+	'getOB8LabelText': 'export', 'getOB8DigestText': 'export', 'quoteOB8CSV': 'export', 'ob8ExportRowBatchSize': 'export', 'dumpOB8ExportRowsText': 'export', 'dumpOB8ExportText': 'export',
+	'filterOB8ExportFrames': 'export', 'dumpOB8ExportHeaderText': 'export', 'writeOB8ExportText': 'export', 'dumpOB8ExportSchemaSQL': 'export', 'insertOB8ExportBatch': 'export', 'writeOB8ExportSQLite': 'export',
+	'exportOB8Programs': 'export',
+	'openOB8Index': 'library', 'updateOB8Index': 'library', 'findOB8ProgramLocations': 'library', 'getOB8UniquePrograms': 'library', 'getOB8LibraryColumns': 'library', 'getOB8FeatureWeights': 'library', 'getOB8FeatureMatrix': 'library',
+	'findOB8SimilarPrograms': 'library', 'findOB8ProgramFrame': 'library', 'OB8LibraryStats': 'library', 'getOB8LibraryStats': 'library', 'ob8HistogramLevels': 'library', 'writeOB8StatsText': 'library',
+	'writeOB8StatsHTML': 'library',
+	'ob8DiffKeys': 'banks', 'ob8MergeKeys': 'banks', 'getOB8Bank': 'banks', 'getOB8AlignmentKeys': 'banks', 'getOB8BankKeys': 'banks', 'alignOB8Banks': 'banks',
+	'diffOB8Banks': 'banks', 'getOB8BankProgramName': 'banks', 'writeOB8BankDiff': 'banks', 'findOB8Keys': 'banks', 'getOB8KeptPrograms': 'banks', 'mergeOB8Banks': 'banks',
+	'writeOB8MergeConflicts': 'banks',
+	'ob8CompressedMagic': 'archives', 'ob8CompressedSuffixes': 'archives', 'getOB8ArchiveType': 'archives', 'OB8ArchiveMember': 'archives', 'iterOB8ArchiveMembers': 'archives', 'iterOB8InputFiles': 'archives',
+	'iterOB8InputBuffers': 'archives',
+	'ob8StoreMagic': 'store', 'ob8StoreVersion': 'store', 'ob8StoreHeader': 'store', 'ob8StoreSegmentMagic': 'store', 'ob8StoreSegmentHeader': 'store', 'ob8StoreEntry': 'store',
+	'getOB8StoreEntryType': 'store', 'OB8StoreSource': 'store', 'OB8LibraryStore': 'store', 'openOB8LibraryStore': 'store', 'appendOB8LibraryStore': 'store',
+	'OB8ListenSource': 'listen', 'OB8ListenWriter': 'listen', 'listenOB8Sources': 'listen',
+	'ob8SiteManifest': 'sites', 'ob8SiteGroups': 'sites', 'getOB8SitePageName': 'sites', 'getOB8SiteGroupPageName': 'sites', 'dumpOB8SiteCSS': 'sites', 'dumpOB8SiteJS': 'sites',
+	'dumpOB8SiteHeadHTML': 'sites', 'dumpOB8SiteRecordsHTML': 'sites', 'writeOB8SiteFile': 'sites', 'writeOB8SiteFilePage': 'sites', 'getOB8GroupRecords': 'sites', 'writeOB8SiteGroupPage': 'sites',
+	'getOB8ProgramSummary': 'sites', 'dumpOB8SiteIndexHTML': 'sites', 'getOB8SiteRecordsName': 'sites', 'removeOB8SitePages': 'sites', 'readOB8SiteRecords': 'sites', 'getOB8RecordGroups': 'sites', 'writeOB8SitePageJob': 'sites', 'writeOB8Site': 'sites',
+	'getOB8ArgumentParser': 'cli', 'main': 'cli',
+}
+
+__all__ = list(ob8Modules)
+
+# imports the module of a name when the name is first used, and keeps the name so it is only looked up once
+def __getattr__(name):
+	if name not in ob8Modules:
+		raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+	value = getattr(importlib.import_module('.' + ob8Modules[name], __name__), name)
+	globals()[name] = value
+	return value
+
+def __dir__():
+	return sorted(set(globals()) | set(ob8Modules))
@@ -0,0 +1,148 @@
+#
+# MIT License
+#
+# Copyright (c) 2022 Christian-E! / Ten by Ten Software
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+
+#
+# This module reads OB-8 sysex files straight out of zip and tar archives, gzip, bzip2 and xz files and library stores
+#
+
+import os
+from .programs import mapOB8File
+from .store import OB8LibraryStore, ob8StoreMagic
+
+# the first bytes of the compressed files, which may hold a tar archive or a single sysex file
+ob8CompressedMagic = ((b'\x1f\x8b', 'gzip'), (b'BZh', 'bz2'), (b'\xfd7zXZ\x00', 'xz'))
+
+# the suffixes a compressed file's name loses when it holds a single sysex file
+ob8CompressedSuffixes = ('.gz', '.bz2', '.xz')
+
+# returns 'zip', 'tar', 'gzip', 'bz2', 'xz' or 'store' if fileReader holds an archive, a compressed file or
+# a library store, else None
+# peeks at what fileReader has buffered without consuming it; when nothing is buffered yet, as on a pipe, this
+# blocks until the first bytes arrive, but never waits for more than one read, so a tar header that the first
+# read of a slow stream does not reach is not recognized
+def getOB8ArchiveType(fileReader):
+	peek = getattr(fileReader, 'peek', None)
+	if not peek or fileReader.closed:
+		return None
+	head = peek(512)
+	if head[:4] in (b'PK\x03\x04', b'PK\x05\x06'):
+		return 'zip'
+	for magic, archiveType in ob8CompressedMagic:
+		if head.startswith(magic):
+			return archiveType
+	if head[257:262] == b'ustar':
+		return 'tar'
+	if head.startswith(ob8StoreMagic):
+		return 'store'
+	return None
+
+# a member of an archive, read as a stream and named by the archive's name and the member's path in the archive
+class OB8ArchiveMember:
+	__slots__ = ('name', 'fileReader')
+
+	def __init__(self, name, fileReader):
+		self.name = name
+		self.fileReader = fileReader
+
+	def read(self, size=-1):
+		return self.fileReader.read(size)
+
+	def read1(self, size=-1):
+		return self.fileReader.read1(size)
+
+	def seekable(self):
+		return False
+
+	def close(self):
+		self.fileReader.close()
+
+# yields an OB8ArchiveMember for every .syx file in an archive, or the one file in a compressed file, in the order they
+# are stored, reading the archive once from start to end and writing nothing to disk
+# yields an OB8StoreSource for every source file of a library store
+def iterOB8ArchiveMembers(fileReader, archiveType):
+	name = fileReader.name
+	if archiveType == 'store':
+		buf = mapOB8File(fileReader) if fileReader.seekable() else fileReader.read()
+		yield from OB8LibraryStore(buf, name).iterSources()
+		return
+	if archiveType == 'zip':
+		import io
+		import zipfile
+		# the list of members is at the end of a zip file, so a zip file read from a pipe is held in memory
+		source = fileReader if fileReader.seekable() else io.BytesIO(fileReader.read())
+		with zipfile.ZipFile(source) as archive:
+			for info in sorted(archive.infolist(), key=lambda info: info.header_offset):
+				if not info.is_dir() and info.filename.lower().endswith('.syx'):
+					with archive.open(info) as member:
+						yield OB8ArchiveMember('{}/{}'.format(name, info.filename), member)
+		return
+	if archiveType == 'tar':
+		stream = fileReader
+	else:
+		if archiveType == 'gzip':
+			import gzip
+			stream = gzip.GzipFile(fileobj=fileReader)
+		elif archiveType == 'bz2':
+			import bz2
+			stream = bz2.BZ2File(fileReader)
+		else:
+			import lzma
+			stream = lzma.LZMAFile(fileReader)
+		if stream.peek(512)[257:262] != b'ustar':
+			root, suffix = os.path.splitext(name)
+			yield OB8ArchiveMember(root if suffix.lower() in ob8CompressedSuffixes else name, stream)
+			return
+	import tarfile
+	with tarfile.open(fileobj=stream, mode='r|') as archive:
+		for info in archive:
+			if info.isfile() and info.name.lower().endswith('.syx'):
+				yield OB8ArchiveMember('{}/{}'.format(name, info.name), archive.extractfile(info))
+
+# yields the input files, with every archive among them replaced by its members as from iterOB8ArchiveMembers
+def iterOB8InputFiles(fileReaders):
+	for fileReader in fileReaders:
+		archiveType = getOB8ArchiveType(fileReader)
+		if archiveType:
+			yield from iterOB8ArchiveMembers(fileReader, archiveType)
+		else:
+			yield fileReader
+
+# yields (fileReader, buf, offsets) for every sysex file named in paths or held in an archive or store named in paths,
+# where buf is the whole file, memory mapped for a plain file and read into memory for an archive member
+# for the source file of a store, buf holds its programs as back-to-back frames and offsets where each was in the file,
+# otherwise offsets is None
+def iterOB8InputBuffers(paths):
+	for path in paths:
+		with open(path, 'rb') as f:
+			archiveType = getOB8ArchiveType(f)
+			if not archiveType:
+				yield f, mapOB8File(f), None
+			elif archiveType == 'store':
+				for source in OB8LibraryStore(mapOB8File(f), path).iterSources(True):
+					yield source, source.frames, source.offsets
+			else:
+				for member in iterOB8ArchiveMembers(f, archiveType):
+					yield member, member.read(), None
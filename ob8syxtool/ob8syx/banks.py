@@ -0,0 +1,182 @@
+#
+# MIT License
+#
+# Copyright (c) 2022 Christian-E! / Ten by Ten Software
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+#
+# This module compares and merges banks of OB-8 programs
+#
+
+from sys import stderr
+from .programs import ob8ProgramKeys, ob8ProgramPackedFields
+from .columns import getOB8ProgramColumns, getOB8RecordsFromColumns
+from .export import getOB8ExportRecords, iterOB8ExportFrames
+
+# the parameters compared by diffOB8Banks: every parameter once, with the waves as their Tri/Sqr/SnH switches
+ob8DiffKeys = tuple(key for key in ob8ProgramKeys if key not in ('programIndex', 'programGroup', 'programNumber', 'lfoWave', 'trigLfoWave', 'osc1Wave', 'osc2Wave'))
+
+# the parameters merged by mergeOB8Banks: the ones getOB8ParameterBytes packs, which share no bits
+ob8MergeKeys = tuple(name for name, *parts in ob8ProgramPackedFields)
+
+# decodes every good program of a sysex file at once
+# returns (columns, records, offsets): the parameter columns from getOB8ProgramColumns, an (N, 28) array of
+# program records and the byte offset of every program
+def getOB8Bank(path, errorFile=stderr):
+	import numpy as np
+	bufs = []
+	offsets = []
+	for buf, framePaths, batchOffsets in iterOB8ExportFrames([path], errorFile=errorFile):
+		bufs.append(buf)
+		offsets += batchOffsets
+	buf = b''.join(bufs)
+	return getOB8ProgramColumns(buf), getOB8ExportRecords(buf), np.array(offsets, dtype=np.int64)
+
+# returns a key for every program of a bank from an id for every program (its slot, or its content),
+# such that the k-th program with an id in one bank gets the same key as the k-th program with that id in another
+def getOB8AlignmentKeys(ids, idCount):
+	import numpy as np
+	order = np.argsort(ids, kind='stable')
+	sortedIds = ids[order]
+	starts = np.flatnonzero(np.r_[True, sortedIds[1:] != sortedIds[:-1]])
+	occurrences = np.empty(len(ids), dtype=np.int64)
+	occurrences[order] = np.arange(len(ids)) - np.repeat(starts, np.diff(np.r_[starts, len(ids)]))
+	return occurrences * idCount + ids
+
+# returns the alignment keys of the programs of several banks, by slot or by content
+def getOB8BankKeys(banks, align='slot'):
+	import numpy as np
+	if align == 'slot':
+		return [getOB8AlignmentKeys(records[:, 0].astype(np.int64), 256) for columns, records, offsets in banks]
+	# programs with the same 27 parameter bytes get the same id in every bank
+	contents = np.concatenate([records[:, 1:] for columns, records, offsets in banks])
+	contents = np.ascontiguousarray(contents).view(np.dtype((np.void, 27))).reshape(-1)
+	distinct, ids = np.unique(contents, return_inverse=True)
+	ids = ids.reshape(-1).astype(np.int64)
+	bounds = np.cumsum([0] + [len(records) for columns, records, offsets in banks])
+	return [getOB8AlignmentKeys(ids[bounds[i]:bounds[i+1]], max(len(distinct), 1)) for i in range(len(banks))]
+
+# pairs up the programs of two banks from their alignment keys
+# returns (pairsA, pairsB, onlyA, onlyB): the indexes of the paired programs in bank order of A, and of the programs in one bank only
+def alignOB8Banks(keysA, keysB):
+	import numpy as np
+	common, pairsA, pairsB = np.intersect1d(keysA, keysB, assume_unique=True, return_indices=True)
+	order = np.argsort(pairsA, kind='stable')
+	return pairsA[order], pairsB[order], np.flatnonzero(~np.isin(keysA, common)), np.flatnonzero(~np.isin(keysB, common))
+
+# compares two banks from getOB8Bank, pairing their programs by slot or by content
+# every parameter is compared across all paired programs at once
+# returns (changed, removed, added, sameCount), where changed holds (i, j, [(key, old, new), ...]) for every paired
+# program that differs, i and j being indexes into A and B, and removed and added are the indexes of unpaired programs
+def diffOB8Banks(bankA, bankB, align='slot'):
+	import numpy as np
+	columnsA, recordsA, offsetsA = bankA
+	columnsB, recordsB, offsetsB = bankB
+	keysA, keysB = getOB8BankKeys([bankA, bankB], align)
+	pairsA, pairsB, removed, added = alignOB8Banks(keysA, keysB)
+	differences = np.array([columnsA[key][pairsA] != columnsB[key][pairsB] for key in ob8DiffKeys]).reshape(len(ob8DiffKeys), len(pairsA))
+	moved = recordsA[pairsA, 0] != recordsB[pairsB, 0]
+	changed = []
+	for p in np.flatnonzero(differences.any(axis=0) | moved):
+		i, j = int(pairsA[p]), int(pairsB[p])
+		changed.append((i, j, [(key, int(columnsA[key][i]), int(columnsB[key][j])) for key in np.array(ob8DiffKeys)[differences[:, p]]]))
+	return changed, removed.tolist(), added.tolist(), len(pairsA) - len(changed)
+
+# returns 'G-N (I)' for program i of a bank's parameter columns
+def getOB8BankProgramName(columns, i):
+	return '{}-{} ({})'.format(columns['programGroup'][i], columns['programNumber'][i], columns['programIndex'][i])
+
+# writes the result of diffOB8Banks as text
+def writeOB8BankDiff(outputFile, pathA, pathB, bankA, bankB, diff):
+	columnsA, recordsA, offsetsA = bankA
+	columnsB, recordsB, offsetsB = bankB
+	changed, removed, added, sameCount = diff
+	dump = ['--- {}\n+++ {}\n'.format(pathA, pathB)]
+	for i, j, changes in changed:
+		nameA, nameB = getOB8BankProgramName(columnsA, i), getOB8BankProgramName(columnsB, j)
+		name = nameA if nameA == nameB else '{} -> {}'.format(nameA, nameB)
+		dump.append('  {} at byte {}: {}\n'.format(name, offsetsA[i], ', '.join('{} {} -> {}'.format(key, old, new) for key, old, new in changes) or 'moved'))
+	for i in removed:
+		dump.append('- {} at byte {}\n'.format(getOB8BankProgramName(columnsA, i), offsetsA[i]))
+	for j in added:
+		dump.append('+ {} at byte {}\n'.format(getOB8BankProgramName(columnsB, j), offsetsB[j]))
+	dump.append('{} programs the same, {} changed, {} removed, {} added\n'.format(sameCount, len(changed), len(removed), len(added)))
+	outputFile.write(''.join(dump))
+
+# returns the index of every key of wanted in keys, or -1 where keys does not have it
+def findOB8Keys(keys, wanted):
+	import numpy as np
+	order = np.argsort(keys, kind='stable')
+	positions = np.minimum(np.searchsorted(keys[order], wanted), max(len(keys) - 1, 0))
+	if not len(keys):
+		return np.full(len(wanted), -1, dtype=np.int64)
+	found = order[positions]
+	return np.where(keys[found] == wanted, found, -1)
+
+# returns a mask of the programs of a bank that one side still has but the other removed, that should be kept
+# because the side that has them changed or added them
+def getOB8KeptPrograms(keys, records, baseKeys, baseRecords):
+	import numpy as np
+	inBase = findOB8Keys(baseKeys, keys)
+	if not len(baseRecords):
+		return np.ones(len(keys), dtype=bool)
+	return (inBase < 0) | (records != baseRecords[np.maximum(inBase, 0)]).any(axis=1)
+
+# merges the changes that two banks made to a common base bank, pairing programs by slot
+# a parameter changed on one side only takes that side's value; one changed differently on both sides is a conflict
+# and keeps ours; a program added on one side is kept, and one removed on one side is dropped unless the other side changed it
+# every parameter of every program is merged at once
+# returns (records, conflicts): the merged (N, 28) program records in the order of ours followed by programs only
+# theirs has, and (name, key, base, ours, theirs) for every conflict, with base None for a program both sides added
+def mergeOB8Banks(base, ours, theirs):
+	import numpy as np
+	(baseColumns, baseRecords, baseOffsets), (ourColumns, ourRecords, ourOffsets), (theirColumns, theirRecords, theirOffsets) = base, ours, theirs
+	baseKeys, ourKeys, theirKeys = getOB8BankKeys([base, ours, theirs])
+	ourPairs, theirPairs, ourOnly, theirOnly = alignOB8Banks(ourKeys, theirKeys)
+
+	# the programs ours and theirs both have, against the base version where there is one
+	basePairs = findOB8Keys(baseKeys, ourKeys[ourPairs])
+	hasBase = basePairs >= 0
+	merged = {'programIndex': ourColumns['programIndex'][ourPairs]}
+	conflicts = []
+	for key in ob8MergeKeys:
+		ourValues, theirValues = ourColumns[key][ourPairs], theirColumns[key][theirPairs]
+		baseValues = np.where(hasBase, baseColumns[key][np.maximum(basePairs, 0)], ourValues) if len(baseRecords) else ourValues
+		ourChanges, theirChanges = ourValues != baseValues, theirValues != baseValues
+		# both added the program with different values, or both changed the parameter differently
+		clashes = (ourValues != theirValues) & (~hasBase | (ourChanges & theirChanges))
+		merged[key] = np.where(ourChanges | clashes, ourValues, theirValues)
+		for p in np.flatnonzero(clashes):
+			conflicts.append((p, getOB8BankProgramName(ourColumns, ourPairs[p]), key, int(baseValues[p]) if hasBase[p] else None, int(ourValues[p]), int(theirValues[p])))
+	# in bank order
+	conflicts = [conflict[1:] for conflict in sorted(conflicts, key=lambda conflict: conflict[0])]
+	records = ourRecords.copy()
+	records[ourPairs] = getOB8RecordsFromColumns(merged)
+	keep = np.ones(len(ourRecords), dtype=bool)
+	keep[ourOnly] = getOB8KeptPrograms(ourKeys[ourOnly], ourRecords[ourOnly], baseKeys, baseRecords)
+	theirKeep = getOB8KeptPrograms(theirKeys[theirOnly], theirRecords[theirOnly], baseKeys, baseRecords)
+	return np.concatenate([records[keep], theirRecords[theirOnly][theirKeep]]), conflicts
+
+# writes the conflicts of mergeOB8Banks as text
+def writeOB8MergeConflicts(outputFile, conflicts):
+	for name, key, baseValue, ourValue, theirValue in conflicts:
+		outputFile.write('conflict {} {}: base {} ours {} theirs {}, kept ours\n'.format(name, key, '-' if baseValue is None else baseValue, ourValue, theirValue))
@@ -0,0 +1,86 @@
+#
+# MIT License
+#
+# Copyright (c) 2022 Christian-E! / Ten by Ten Software
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+#
+# This module keeps decoded OB-8 programs in an SQLite cache
+#
+
+import hashlib
+import os
+import time
+from .programs import getOB8ProgramRecord, iterOB8Frames
+
+# opens or creates an on-disk cache of the program records decoded from sysex files
+def openOB8Cache(path):
+	import sqlite3
+	cache = sqlite3.connect(path, timeout=60)
+	cache.execute('CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, size INTEGER, mtime REAL, hash TEXT, records BLOB, badFrames TEXT, used REAL)')
+	cache.execute('CREATE INDEX IF NOT EXISTS filesHash ON files (hash)')
+	cache.execute('CREATE INDEX IF NOT EXISTS filesUsed ON files (used)')
+	return cache
+
+# returns (records, badFrames, hit) for an input file, where records holds the file's 28-byte program records and
+# badFrames its bad frames as (offset, error), as iterOB8Frames finds them
+# the cache is keyed by path, size and modification time, and then by content hash, so an unchanged
+# file is served without reading it and a moved or touched file without decoding it
+# a hit is not marked as used here, touchOB8Cache marks every input file of a run at once
+def getOB8CachedRecords(cache, fileReader):
+	import json
+	path = os.path.abspath(fileReader.name)
+	stat = os.fstat(fileReader.fileno())
+	row = cache.execute('SELECT records, badFrames FROM files WHERE path = ? AND size = ? AND mtime = ?', (path, stat.st_size, stat.st_mtime)).fetchone()
+	if row:
+		return row[0], [tuple(badFrame) for badFrame in json.loads(row[1])], True
+
+	buf = fileReader.read()
+	contentHash = hashlib.sha1(buf).hexdigest()
+	row = cache.execute('SELECT records, badFrames FROM files WHERE hash = ?', (contentHash,)).fetchone()
+	hit = row is not None
+	if hit:
+		records, badFrames = row[0], [tuple(badFrame) for badFrame in json.loads(row[1])]
+	else:
+		badFrames = []
+		records = b''.join(getOB8ProgramRecord(frame) for offset, frame in iterOB8Frames(buf, badFrames))
+	with cache:
+		cache.execute('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)', (path, stat.st_size, stat.st_mtime, contentHash, records, json.dumps(badFrames), time.time()))
+	return records, badFrames, hit
+
+# marks the cached files among paths as used now, in one transaction at the end of a run
+def touchOB8Cache(cache, paths):
+	used = time.time()
+	with cache:
+		cache.executemany('UPDATE files SET used = ? WHERE path = ?', [(used, os.path.abspath(path)) for path in paths])
+
+# evicts the least recently used files until the cached records take no more than maxBytes
+def trimOB8Cache(cache, maxBytes):
+	total = cache.execute('SELECT TOTAL(LENGTH(records)) FROM files').fetchone()[0]
+	if total <= maxBytes:
+		return
+	with cache:
+		for path, size in cache.execute('SELECT path, LENGTH(records) FROM files ORDER BY used').fetchall():
+			if total <= maxBytes:
+				break
+			cache.execute('DELETE FROM files WHERE path = ?', (path,))
+			total -= size
@@ -0,0 +1,330 @@
+#
+# MIT License
+#
+# Copyright (c) 2022 Christian-E! / Ten by Ten Software
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+#
+# This module is the ob8syxtool command line
+#
+
+import argparse
+import os
+from sys import stderr, stdout
+from .programs import getOB8FramesFromRecords, getOB8Program, getOB8ProgramGroup, getOB8ProgramNumber
+from .columns import compileOB8Where, getOB8ProgramColumns
+from .archives import getOB8ArchiveType, iterOB8InputFiles
+from .files import getOB8PhaseClock, getOB8RunStats, iterOB8FileJobs, newOB8FileStats, ob8StatsHooks, writeOB8File, writeOB8FileStatsText, writeOB8Profile, writeOB8StatsJSON
+
+# returns the parser of the ob8syxtool command line
+def getOB8ArgumentParser():
+	parser = argparse.ArgumentParser(description='Dumps the patch settings contained in Oberheim OB-8 sysex files')
+	parser.add_argument('inputFile', type=argparse.FileType('rb'), nargs='*',  metavar='inFile', help='OB-8 sysex input files, zip, tar, gzip, bzip2 or xz archives of them, or library stores')
+	parser.add_argument('-o', '--outputFile', type=argparse.FileType('w'), metavar='outFile', help='output file')
+	parser.add_argument('--html', action='store_true', help='output as pretty html')
+	parser.add_argument('--lazy', action='store_true', help='output as pretty html that embeds the programs as compact data and draws them as they scroll into view')
+	parser.add_argument('--static', action='store_true', help='output as pretty html drawn ahead of time, without any script')
+	parser.add_argument('--batch', action='store_true', help='decode each file in one pass with NumPy')
+	parser.add_argument('--mmap', action='store_true', help='decode input files in place from memory-mapped files')
+	parser.add_argument('--syx', type=argparse.FileType('wb'), metavar='syxFile', help='write the programs to a sysex bank instead of printing them')
+	parser.add_argument('-j', '--jobs', type=int, default=1, metavar='N', help='decode and print up to N input files at once')
+	parser.add_argument('--cache', metavar='cacheFile', help='keep decoded programs in a cache file and reuse them for unchanged input files')
+	parser.add_argument('--cache-size', dest='cacheSize', type=int, default=1000, metavar='MB', help='with --cache, the largest the cache may grow before the least recently used files are dropped (default 1000 MB)')
+	parser.add_argument('--stats', action='store_true', help='print the bytes, frames and programs of every input file and the time spent reading, decoding, filtering and rendering them, with cache hits and misses and peak memory')
+	parser.add_argument('--stats-json', dest='statsJson', type=argparse.FileType('w'), metavar='jsonFile', help='write the stats of --stats as JSON')
+	parser.add_argument('--profile', action='store_true', help='profile the run and print the functions it spent the most time in (not the --jobs workers)')
+	parser.add_argument('--profile-file', dest='profileFile', metavar='profFile', help='with --profile, also save the full profile for pstats or other profile viewers')
+	parser.add_argument('--site', metavar='siteDir', help='write the programs as a site of html pages with an index page, rewriting only the pages of changed input files')
+	parser.add_argument('--site-pages', dest='sitePages', choices=('file', 'group'), default='file', help='with --site, write a page per input file or per program group (default file)')
+	parser.add_argument('--diff', action='store_true', help='print the parameter changes from the first input file to the second')
+	parser.add_argument('--align', choices=('slot', 'hash'), default='slot', help='with --diff, pair up programs by slot or by content (default slot)')
+	parser.add_argument('--merge', metavar='mergedFile', help='merge the changes that the second and third input files made to the first into a new sysex bank')
+	parser.add_argument('--stats-report', dest='statsReport', action='store_true', help='print knob histograms, switch frequencies and parameter correlations of all input programs, as html with --html')
+	parser.add_argument('--where', metavar='expression', help='only output the programs that match an expression such as "unison and vcfRes > 40 and fourPole"')
+	parser.add_argument('--export', metavar='exportFile', help='write every parameter of the input programs with their file, offset and hash to a csv, ndjson or sqlite file')
+	parser.add_argument('--export-format', dest='exportFormat', choices=('csv', 'ndjson', 'sqlite'), help='with --export, the format to write (default from the file extension)')
+	parser.add_argument('--store', metavar='storeFile', help='add the programs of the input files that are not yet stored to a packed library store, which is read like an input file')
+	parser.add_argument('--listen', action='append', metavar='source', help='decode live MIDI from a pipe, FIFO, - for standard input or tcp:HOST:PORT, printing each program as it arrives; may be given more than once')
+	parser.add_argument('--index', metavar='indexFile', help='add the input files to a program index instead of printing them')
+	parser.add_argument('--duplicates', action='store_true', help='with --index, print where else each input program occurs')
+	parser.add_argument('--unique', action='store_true', help='with --index, list every unique program in the index')
+	parser.add_argument('--similar', metavar='inFile:program', help='list the input programs most similar to a program such as ob8factory.syx:A-3')
+	parser.add_argument('--top', type=int, default=10, metavar='k', help='with --similar, the number of programs to list')
+	parser.add_argument('--weight', action='append', default=[], metavar='name=weight', help='with --similar, the weight of a parameter (default 1)')
+	parser.add_argument('--kdtree', action='store_true', help='with --similar, search with a SciPy k-d tree')
+	return parser
+
+# runs ob8syxtool with the arguments of the command line, or with argv, a list of arguments without the program name
+def main(argv=None):
+	parser = getOB8ArgumentParser()
+	args = parser.parse_args(argv)
+	if not args.inputFile and not (args.index and args.unique) and not args.listen:
+		parser.error('the following arguments are required: inFile')
+	if args.where:
+		try:
+			compileOB8Where(args.where)
+		except ValueError as e:
+			parser.error(e)
+
+	if args.profile or args.profileFile:
+		import cProfile
+		profiler = cProfile.Profile()
+		profiler.enable()
+		try:
+			runOB8Tool(parser, args)
+		finally:
+			profiler.disable()
+			writeOB8Profile(profiler, args.profileFile)
+	else:
+		runOB8Tool(parser, args)
+
+# runs the mode that the parsed arguments ask for
+def runOB8Tool(parser, args):
+	# write to stdout or file
+	outputFile = stdout
+	if args.outputFile:
+		outputFile = args.outputFile
+
+	if args.listen:
+		import asyncio
+		from .listen import OB8ListenSource, OB8ListenWriter, listenOB8Sources
+		for f in args.inputFile:
+			f.close()
+		if args.static:
+			args.lazy = False
+		if args.lazy or args.static:
+			args.html = True
+		try:
+			listenWriter = OB8ListenWriter(outputFile, args)
+		except ValueError as e:
+			parser.error(e)
+		sources = [OB8ListenSource(name) for name in args.listen]
+		listenWriter.start(sources)
+		try:
+			asyncio.run(listenOB8Sources(sources, listenWriter))
+		except KeyboardInterrupt:
+			pass
+		listenWriter.close()
+		return
+
+	# the index and the site keep track of programs by file, so they only read plain sysex files
+	# the bank modes also read library stores, each compared or merged as one bank
+	plainTypes = ((None,), 'plain sysex files')
+	bankTypes = ((None, 'store'), 'plain sysex files and library stores')
+	for option, value, (archiveTypes, inputs) in (('--index', args.index, plainTypes), ('--site', args.site, plainTypes), ('--diff', args.diff, bankTypes), ('--merge', args.merge, bankTypes)):
+		if value and any(getOB8ArchiveType(f) not in archiveTypes for f in args.inputFile):
+			parser.error('{} only reads {}'.format(option, inputs))
+
+	if args.index:
+		from .library import findOB8ProgramLocations, getOB8UniquePrograms, openOB8Index, updateOB8Index
+		index = openOB8Index(args.index)
+		for f in args.inputFile:
+			f.close()
+		paths = [f.name for f in args.inputFile]
+		outputFile.write('Indexed {} of {} files\n'.format(updateOB8Index(index, paths), len(paths)))
+		if args.duplicates:
+			for path in paths:
+				for programHash, path, offset, slot in index.execute('SELECT hash, path, offset, slot FROM programs WHERE path = ? ORDER BY offset', (os.path.abspath(path),)).fetchall():
+					locations = [location for location in findOB8ProgramLocations(index, programHash) if location[:2] != (path, offset)]
+					if not locations:
+						continue
+					outputFile.write('{} {}-{} ({}) at byte {}:\n'.format(path, getOB8ProgramGroup(slot), getOB8ProgramNumber(slot), slot+1, offset))
+					for otherPath, otherOffset, otherSlot in locations:
+						outputFile.write('  {} {}-{} ({}) at byte {}\n'.format(otherPath, getOB8ProgramGroup(otherSlot), getOB8ProgramNumber(otherSlot), otherSlot+1, otherOffset))
+		if args.unique:
+			for programHash, count, path, offset, slot in getOB8UniquePrograms(index):
+				outputFile.write('{}  {: >4}  {} {}-{} ({}) at byte {}\n'.format(programHash, count, path, getOB8ProgramGroup(slot), getOB8ProgramNumber(slot), slot+1, offset))
+		index.close()
+		return
+
+	if args.diff or args.merge:
+		from .banks import diffOB8Banks, getOB8Bank, mergeOB8Banks, writeOB8BankDiff, writeOB8MergeConflicts
+		for f in args.inputFile:
+			f.close()
+		paths = [f.name for f in args.inputFile]
+		if args.diff and len(paths) != 2:
+			parser.error('--diff needs two input files')
+		if args.merge and len(paths) != 3:
+			parser.error('--merge needs three input files: base, ours and theirs')
+		banks = [getOB8Bank(path) for path in paths]
+		if args.diff:
+			writeOB8BankDiff(outputFile, paths[0], paths[1], banks[0], banks[1], diffOB8Banks(banks[0], banks[1], args.align))
+		else:
+			records, conflicts = mergeOB8Banks(*banks)
+			with open(args.merge, 'wb') as f:
+				f.write(getOB8FramesFromRecords(records.tobytes()))
+			writeOB8MergeConflicts(outputFile, conflicts)
+			outputFile.write('Merged {} programs into {} with {} conflicts\n'.format(len(records), args.merge, len(conflicts)))
+		return
+
+	if args.statsReport:
+		from .library import getOB8LibraryStats, writeOB8StatsHTML, writeOB8StatsText
+		for f in args.inputFile:
+			f.close()
+		stats = getOB8LibraryStats([f.name for f in args.inputFile], args.where)
+		if args.html:
+			writeOB8StatsHTML(outputFile, stats, len(args.inputFile))
+		else:
+			writeOB8StatsText(outputFile, stats, len(args.inputFile))
+		return
+
+	if args.export:
+		from .export import exportOB8Programs
+		for f in args.inputFile:
+			f.close()
+		try:
+			programCount = exportOB8Programs(args.export, [f.name for f in args.inputFile], args.exportFormat, where=args.where)
+		except ValueError as e:
+			parser.error(e)
+		outputFile.write('Exported {} programs to {}\n'.format(programCount, args.export))
+		return
+
+	if args.store:
+		from .store import appendOB8LibraryStore
+		for f in args.inputFile:
+			f.close()
+		try:
+			programCount, fileCount = appendOB8LibraryStore(args.store, [f.name for f in args.inputFile])
+		except ValueError as e:
+			parser.error(e)
+		outputFile.write('Stored {} programs from {} files in {}\n'.format(programCount, fileCount, args.store))
+		return
+
+	if args.site:
+		from .sites import writeOB8Site
+		for f in args.inputFile:
+			f.close()
+		pagesWritten, pageCount = writeOB8Site(args.site, [f.name for f in args.inputFile], args.sitePages, args.jobs)
+		outputFile.write('Wrote {} of {} pages to {}\n'.format(pagesWritten, pageCount, args.site))
+		return
+
+	if args.similar:
+		import importlib.util
+		from .library import findOB8ProgramFrame, findOB8SimilarPrograms, getOB8FeatureMatrix, getOB8FeatureWeights, getOB8LibraryColumns
+		for f in args.inputFile:
+			f.close()
+		if ':' not in args.similar:
+			parser.error('--similar needs a file and a program, such as ob8factory.syx:A-3')
+		if args.kdtree and importlib.util.find_spec('scipy') is None:
+			parser.error('--kdtree needs SciPy, which is not installed')
+		queryPath, queryProgram = args.similar.rsplit(':', 1)
+		try:
+			weights = getOB8FeatureWeights(args.weight)
+			queryFrame, queryOffset = findOB8ProgramFrame(queryPath, queryProgram)
+		except (ValueError, KeyError, OSError) as e:
+			parser.error(e)
+		columns, locations = getOB8LibraryColumns([f.name for f in args.inputFile])
+		features = getOB8FeatureMatrix(columns, weights)
+		query = getOB8FeatureMatrix(getOB8ProgramColumns(queryFrame), weights)[0]
+		queryDict = getOB8Program(queryFrame, 0)
+		outputFile.write('Programs most similar to {} {}-{} ({}):\n'.format(queryPath, queryDict['programGroup'], queryDict['programNumber'], queryDict['programIndex']))
+		# ask for one more in case the query program itself is in the library
+		matches = [(row, distance) for row, distance in findOB8SimilarPrograms(features, query, args.top+1, args.kdtree) if (os.path.abspath(locations[row][0]), locations[row][1]) != (os.path.abspath(queryPath), queryOffset)]
+		for row, distance in matches[:args.top]:
+			path, offset = locations[row]
+			outputFile.write('  {:.4f}  {} {}-{} ({}) at byte {}\n'.format(distance, path, columns['programGroup'][row], columns['programNumber'][row], columns['programIndex'][row], offset))
+		return
+
+	# a sysex bank replaces the text or html output
+	if args.syx:
+		args.html = args.lazy = args.static = False
+	if args.static:
+		args.lazy = False
+	if args.lazy or args.static:
+		args.html = True
+
+	if args.html:
+		from .panels import dumpOB8BottomBoilerplateHTML, dumpOB8LazyRendererHTML, dumpOB8StaticBottomBoilerplateHTML, dumpOB8StaticTopBoilerplateHTML, dumpOB8TopBoilerplateHTML
+	if args.static:
+		outputFile.write(dumpOB8StaticTopBoilerplateHTML())
+	elif args.html:
+		outputFile.write(dumpOB8TopBoilerplateHTML())
+		if args.lazy:
+			outputFile.write(dumpOB8LazyRendererHTML())
+
+	# sysex goes to the sysex bank, everything else to the output file
+	programsFile = args.syx or outputFile
+
+	# the workers reopen the input files by name, so standard input and archives are always read here
+	if args.jobs > 1 and all(os.path.isfile(f.name) and not getOB8ArchiveType(f) for f in args.inputFile):
+		options = argparse.Namespace(**vars(args))
+		options.inputFile = options.outputFile = None
+		options.syx = bool(args.syx)
+		for f in args.inputFile:
+			f.close()
+		results = iterOB8FileJobs([f.name for f in args.inputFile], options, args.jobs)
+		inputFiles = args.inputFile
+	else:
+		results = None
+		inputFiles = iterOB8InputFiles(args.inputFile)
+
+	# the decode cache is opened once for the whole run, or once in every --jobs worker
+	cache = None
+	if args.cache and not results:
+		from .cache import openOB8Cache
+		cache = openOB8Cache(args.cache)
+
+	startClock = getOB8PhaseClock()
+	totalStats = newOB8FileStats()
+	filesStats = []
+	for f in inputFiles:
+		if results:
+			foundPrograms, output, errors, fileStats = next(results)
+			stderr.write(errors)
+			programsFile.write(output)
+			programsFile.flush()
+		else:
+			fileStats = newOB8FileStats()
+			foundPrograms = writeOB8File(f, programsFile, args, stderr, fileStats, cache)
+		for key in totalStats:
+			totalStats[key] += fileStats[key]
+		filesStats.append((f.name, fileStats))
+		for hook in ob8StatsHooks:
+			hook(f.name, fileStats)
+		if not foundPrograms:
+			print('This does not appear to be an OB-8 sysex file')
+			parser.print_usage()
+
+	if args.cache:
+		from .cache import openOB8Cache, touchOB8Cache, trimOB8Cache
+		if not cache:
+			cache = openOB8Cache(args.cache)
+		touchOB8Cache(cache, [f.name for f in args.inputFile])
+		trimOB8Cache(cache, args.cacheSize*1000000)
+		cache.close()
+
+	if args.stats or args.statsJson:
+		runStats = getOB8RunStats(totalStats, startClock)
+	if args.stats:
+		print('cache: {} hits, {} misses'.format(totalStats['cacheHits'], totalStats['cacheMisses']), file=stderr)
+		for path, fileStats in filesStats:
+			writeOB8FileStatsText(stderr, path, fileStats)
+		writeOB8FileStatsText(stderr, 'total', totalStats)
+		peakRSS = 'unknown' if runStats['peakRSS'] is None else '{:.1f} MB'.format(runStats['peakRSS']/1e6)
+		print('run: {:.3f}s ({:.3f}s cpu), {:.0f} programs/s, peak memory {}'.format(runStats['wall'], runStats['cpu'], runStats['programsPerSecond'] or 0, peakRSS), file=stderr)
+	if args.statsJson:
+		writeOB8StatsJSON(args.statsJson, filesStats, runStats)
+
+	if args.static:
+		outputFile.write(dumpOB8StaticBottomBoilerplateHTML())
+	elif args.html:
+		outputFile.write(dumpOB8BottomBoilerplateHTML())
@@ -0,0 +1,198 @@
+#
+# MIT License
+#
+# Copyright (c) 2022 Christian-E! / Ten by Ten Software
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+#
+# This module decodes whole banks of OB-8 programs into NumPy columns and picks programs with --where expressions
+#
+
+import itertools
+from .programs import getOB8FieldValue, getOB8ParameterBytes, ob8ProgramGroups, ob8ProgramKeySet, ob8ProgramRecordSize, ob8ProgramSchema
+
+# packs parameter columns, as from getOB8ProgramColumns, back into an (N, 28) NumPy array of program records
+def getOB8RecordsFromColumns(columns):
+	import numpy as np
+	records = np.zeros((len(columns['programIndex']), ob8ProgramRecordSize), dtype=np.uint8)
+	records[:, 0] = (np.asarray(columns['programIndex']) - 1) & 0x7f
+	for byte, value in enumerate(getOB8ParameterBytes(columns)):
+		records[:, byte+1] = value
+	return records
+
+# decodes all of the programs in buf at once with NumPy
+# returns a dict of parameter columns (one array per parameter) in the same order as getOB8Programs
+def getOB8ProgramColumns(buf):
+
+	import numpy as np
+
+	programCount = int(len(buf)/60)
+	frames = np.frombuffer(buf, dtype=np.uint8, count=programCount*60).reshape(programCount, 60)
+
+	# program data begins at byte 5, combine the 27 nibble pairs into 27 contiguous columns of parameter bytes
+	d = np.ascontiguousarray((frames[:, 5:59:2] | ((frames[:, 6:60:2] & 0xf) << 4)).T, dtype=np.int64)
+
+	programIndex = frames[:, 4].astype(np.int64)
+
+	columns = {}
+	columns['programIndex'] = programIndex+1
+	columns['programGroup'] = np.array(ob8ProgramGroups, dtype=object)[programIndex]
+	columns['programNumber'] = programIndex % 8 + 1
+	for name, *parts in ob8ProgramSchema:
+		columns[name] = getOB8FieldValue(parts, d)
+
+	return columns
+
+# converts parameter columns from getOB8ProgramColumns into the same array of dicts as getOB8Programs
+def getOB8ProgramsFromColumns(columns):
+	keys = list(columns)
+	values = [columns[key].tolist() for key in keys]
+	return [dict(zip(keys, row)) for row in zip(*values)]
+
+# returns a parameter column as a list of strings, every value formatted with spec, after convert (such as ledOnOff) if given
+# parameters are small numbers, so each value is formatted once into a table that the column indexes
+def getOB8ColumnStrings(column, spec='', convert=None):
+	import numpy as np
+	column = np.asarray(column)
+	if column.dtype == object or not len(column):
+		return [format(convert(value) if convert else value, spec) for value in column.tolist()]
+	table = np.array([format(convert(value) if convert else value, spec) for value in range(int(column.max())+1)], dtype=object)
+	return table[column].tolist()
+
+# writes one template (of %s fields) per program, filled with the program's row of fields, lists of strings
+# as from getOB8ColumnStrings; batchSize programs are joined into each write
+def writeOB8ColumnRows(outputFile, template, fields, batchSize=1024):
+	rows = zip(*fields)
+	while True:
+		dump = [template % row for row in itertools.islice(rows, batchSize)]
+		if not dump:
+			break
+		outputFile.write(''.join(dump))
+
+# compiles a --where expression over program parameter names, such as "unison and vcfRes > 40 and fourPole",
+# into a function that takes a mapping of parameter columns (as from getOB8ProgramColumns) and returns a
+# NumPy boolean mask of the matching programs; the whole bank is tested with one array operation per operator
+# the expression may use parameter names, numbers and strings, comparisons, and, or, not and + - * // % & |
+# a ValueError is raised for anything else, and for text (programGroup or a string) compared with a number or used in arithmetic
+def compileOB8Where(expression):
+	import ast
+	import operator
+	import numpy as np
+
+	binaryOperators = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.FloorDiv: operator.floordiv,
+		ast.Mod: operator.mod, ast.BitAnd: operator.and_, ast.BitOr: operator.or_}
+	compareOperators = {ast.Eq: operator.eq, ast.NotEq: operator.ne, ast.Lt: operator.lt, ast.LtE: operator.le,
+		ast.Gt: operator.gt, ast.GtE: operator.ge}
+
+	# programGroup and quoted strings are text, everything else is a number, and text is only compared with text
+	typeNames = {str: 'text', int: 'a number'}
+	def checkTypes(node, operands, kind):
+		for operand, (evaluate, operandKind) in operands:
+			if operandKind is not kind:
+				raise ValueError('cannot use {} in {!r}: {} is {}, not {}'.format(ast.unparse(node), expression, ast.unparse(operand), typeNames[operandKind], typeNames[kind]))
+
+	# returns (function of the columns, type of its values)
+	def compileNode(node):
+		if isinstance(node, ast.Name):
+			if node.id not in ob8ProgramKeySet:
+				raise ValueError('unknown parameter {} in {!r}'.format(node.id, expression))
+			return (lambda columns: np.asarray(columns[node.id])), (str if node.id == 'programGroup' else int)
+		if isinstance(node, ast.Constant) and isinstance(node.value, (bool, int, str)):
+			return (lambda columns: node.value), (str if isinstance(node.value, str) else int)
+		if isinstance(node, ast.BoolOp):
+			operands = [compileNode(value)[0] for value in node.values]
+			combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+			def boolOp(columns):
+				result = operands[0](columns)
+				for operand in operands[1:]:
+					result = combine(result, operand(columns))
+				return result
+			return boolOp, int
+		if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.USub)):
+			operand, kind = compileNode(node.operand)
+			if isinstance(node.op, ast.Not):
+				return (lambda columns: np.logical_not(operand(columns))), int
+			checkTypes(node, [(node.operand, (operand, kind))], int)
+			return (lambda columns: -operand(columns)), int
+		if isinstance(node, ast.BinOp) and type(node.op) in binaryOperators:
+			left, right, op = compileNode(node.left), compileNode(node.right), binaryOperators[type(node.op)]
+			checkTypes(node, [(node.left, left), (node.right, right)], int)
+			left, right = left[0], right[0]
+			return (lambda columns: op(left(columns), right(columns))), int
+		if isinstance(node, ast.Compare) and all(type(op) in compareOperators for op in node.ops):
+			# a < b < c is a < b and b < c
+			nodes = [node.left] + node.comparators
+			compiled = [compileNode(operandNode) for operandNode in nodes]
+			checkTypes(node, list(zip(nodes, compiled)), compiled[0][1])
+			operands = [evaluate for evaluate, kind in compiled]
+			ops = [compareOperators[type(op)] for op in node.ops]
+			def compare(columns):
+				values = [operand(columns) for operand in operands]
+				result = ops[0](values[0], values[1])
+				for i in range(1, len(ops)):
+					result = np.logical_and(result, ops[i](values[i], values[i+1]))
+				return result
+			return compare, int
+		raise ValueError('cannot use {} in {!r}'.format(ast.unparse(node), expression))
+
+	try:
+		tree = ast.parse(expression.strip(), mode='eval')
+	except SyntaxError as e:
+		raise ValueError('bad expression {!r}: {}'.format(expression, e.msg))
+	predicate = compileNode(tree.body)[0]
+
+	def where(columns):
+		count = len(columns['programIndex'])
+		return np.broadcast_to(np.asarray(predicate(columns), dtype=bool), (count,))
+	return where
+
+# a mapping of parameter columns built from an array of program dicts or OB8Programs, one column at a time as
+# a compiled --where expression asks for them
+class OB8ProgramListColumns(dict):
+	__slots__ = ('programs',)
+
+	def __init__(self, programs):
+		self.programs = programs
+
+	def __missing__(self, key):
+		import numpy as np
+		values = [program[key] for program in self.programs]
+		column = np.array(values, dtype=object if key == 'programGroup' else np.int64)
+		self[key] = column
+		return column
+
+# returns the parameter columns of the programs that match a --where expression or compiled expression
+def filterOB8Columns(columns, where):
+	if isinstance(where, str):
+		where = compileOB8Where(where)
+	mask = where(columns)
+	return {key: column[mask] for key, column in columns.items()}
+
+# returns the programs of an array or iterable of program dicts or OB8Programs that match a --where expression or compiled expression
+def filterOB8Programs(programsArray, where):
+	if isinstance(where, str):
+		where = compileOB8Where(where)
+	# the columns and the matching pass both walk the programs, so a generator is read into a list first
+	programsArray = list(programsArray)
+	if not programsArray:
+		return programsArray
+	return list(itertools.compress(programsArray, where(OB8ProgramListColumns(programsArray))))
@@ -0,0 +1,298 @@
+#
+# MIT License
+#
+# Copyright (c) 2022 Christian-E! / Ten by Ten Software
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+#
+# This module exports OB-8 programs to CSV, NDJSON and SQLite
+#
+
+import hashlib
+import itertools
+import os
+from sys import stderr
+from .programs import getOB8FieldSource, getOB8Program, getOB8ProgramHash, getOB8ProgramRecord, ob8ProgramKeys, ob8ProgramRecordSize, ob8ProgramSchema, printOB8BadFrames, scanOB8FrameRuns
+from .columns import compileOB8Where, getOB8ProgramColumns
+from .archives import iterOB8InputBuffers
+
+# the fields of every exported program: where it came from, its content hash and every parameter of getOB8Programs
+ob8ExportKeys = ('path', 'offset', 'hash') + ob8ProgramKeys
+
+# the export formats and the file extensions they are chosen by
+ob8ExportFormats = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson', '.db': 'sqlite', '.sqlite': 'sqlite', '.sqlite3': 'sqlite'}
+
+# yields (buf, paths, offsets) for every good program of the input files, archives and stores in batches of batchSize programs,
+# where buf holds the batch's 60-byte frames back to back and paths and offsets say where each came from
+# the paths are absolute, so a file is recorded the same way whatever directory it was named from, while
+# bad frames are reported with the name it was given by
+# runs of back-to-back frames are copied into a batch a whole run at a time
+def iterOB8ExportFrames(paths, batchSize=65536, errorFile=stderr):
+	bufs = []
+	framePaths = []
+	offsets = []
+	for f, buf, bufOffsets in iterOB8InputBuffers(paths):
+		path = os.path.abspath(f.name)
+		badFrames = []
+		# the programs of a store come as good frames back to back, which need no scanning
+		runs = scanOB8FrameRuns(buf, 0, len(buf)) if bufOffsets is None else [(0, len(buf), None)]
+		for offset, nextPos, error in runs:
+			if error:
+				badFrames.append((offset, error))
+				continue
+			while offset < nextPos:
+				size = min(nextPos - offset, (batchSize - len(offsets))*60)
+				bufs.append(buf[offset:offset+size])
+				offsets.extend(range(offset, offset+size, 60) if bufOffsets is None else bufOffsets[offset//60:(offset+size)//60])
+				framePaths.extend([path]*(size//60))
+				offset += size
+				if len(offsets) == batchSize:
+					yield b''.join(bufs), framePaths, offsets
+					bufs = []
+					framePaths = []
+					offsets = []
+		printOB8BadFrames(f, badFrames, errorFile)
+	if offsets:
+		yield b''.join(bufs), framePaths, offsets
+
+# returns an (N, 28) NumPy array of the program records of a buffer of back-to-back 60-byte frames
+def getOB8ExportRecords(buf):
+	import numpy as np
+	frames = np.frombuffer(buf, dtype=np.uint8).reshape(-1, 60)
+	records = np.empty((len(frames), ob8ProgramRecordSize), dtype=np.uint8)
+	records[:, 0] = frames[:, 4]
+	records[:, 1:] = frames[:, 5:59:2] | ((frames[:, 6:60:2] & 0xf) << 4)
+	return records
+
+# returns the getOB8ProgramHash of every record as an (N, 20) array of SHA-1 digests
+def getOB8ExportDigests(records):
+	import numpy as np
+	data = records[:, 1:].tobytes()
+	digests = b''.join([hashlib.sha1(data[i:i+27]).digest() for i in range(0, len(data), 27)])
+	return np.frombuffer(digests, dtype=np.uint8).reshape(-1, 20)
+
+# the text of a batch is built as an (N, width) uint8 array with one row per program: every row starts as a copy
+# of a template row holding the constant text, the field values are written into their slots column by column,
+# and the NUL bytes that pad the slots are dropped at the end
+
+# returns the digits of non-negative integers right-aligned in an (N, width) array, with NUL bytes for leading zeros
+def getOB8IntegerDigits(values, width):
+	import numpy as np
+	values = np.asarray(values, dtype=np.int64)
+	powers = 10 ** np.arange(width-1, -1, -1, dtype=np.int64)
+	if width <= 3:
+		# small values are looked up in a table of every number of that width
+		table = np.arange(10**width, dtype=np.int64)
+		table = np.where((table[:, None] < powers) & (powers > 1), 0, table[:, None] // powers % 10 + ord('0')).astype(np.uint8)
+		return table[values]
+	digits = (values[:, None] // powers % 10 + ord('0')).astype(np.uint8)
+	digits[(values[:, None] < powers) & (powers > 1)] = 0
+	return digits
+
+# returns the quoted text of strings that have few distinct values, such as paths and program groups,
+# left-aligned in an (N, width) array; each distinct string is quoted and encoded once
+def getOB8LabelText(labels, quote):
+	import numpy as np
+	distinct = {label: code for code, label in enumerate(dict.fromkeys(labels))}
+	encoded = [quote(label).encode('utf-8') for label in distinct]
+	table = np.zeros((len(encoded), max(len(e) for e in encoded)), dtype=np.uint8)
+	for i, e in enumerate(encoded):
+		table[i, :len(e)] = np.frombuffer(e, dtype=np.uint8)
+	return table[np.fromiter(map(distinct.__getitem__, labels), dtype=np.int64, count=len(labels))]
+
+# returns the hex text of an (N, 20) digest array as an (N, 40) array
+def getOB8DigestText(digests):
+	import numpy as np
+	hexDigits = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+	text = np.empty((len(digests), 40), dtype=np.uint8)
+	text[:, 0::2] = hexDigits[digests >> 4]
+	text[:, 1::2] = hexDigits[digests & 0xf]
+	return text
+
+# quotes a CSV field the way the csv module does
+def quoteOB8CSV(text):
+	if any(c in text for c in ',"\r\n'):
+		return '"' + text.replace('"', '""') + '"'
+	return text
+
+# batches with fewer programs are rendered one row at a time, which for a few programs
+# is quicker than the fixed cost of building the NumPy text array
+ob8ExportRowBatchSize = 32
+
+# renders a small batch from iterOB8ExportFrames as dumpOB8ExportText does, one program at a time
+def dumpOB8ExportRowsText(batch, exportFormat):
+	import json
+	buf, paths, offsets = batch
+	dump = []
+	if exportFormat == 'csv':
+		quote, quoteChar, prefixes, separator, start, end = quoteOB8CSV, '', [''] * len(ob8ExportKeys), ',', '', '\r\n'
+	else:
+		quote, quoteChar, prefixes, separator, start, end = json.dumps, '"', [json.dumps(key) + ': ' for key in ob8ExportKeys], ', ', '{', '}\n'
+	for i in range(len(offsets)):
+		values = getOB8Program(buf, i*60)
+		values['path'] = quote(paths[i])
+		values['offset'] = offsets[i]
+		values['hash'] = quoteChar + getOB8ProgramHash(getOB8ProgramRecord(buf, i*60)) + quoteChar
+		values['programGroup'] = quote(values['programGroup'])
+		dump.append(start + separator.join([prefix + str(values[key]) for prefix, key in zip(prefixes, ob8ExportKeys)]) + end)
+	return ''.join(dump).encode('utf-8')
+
+# renders a batch from iterOB8ExportFrames as CSV rows or NDJSON lines, with the fields in ob8ExportKeys order
+def dumpOB8ExportText(batch, exportFormat):
+	buf, paths, offsets = batch
+	if len(offsets) < ob8ExportRowBatchSize:
+		return dumpOB8ExportRowsText(batch, exportFormat)
+	import json
+	import numpy as np
+	columns = getOB8ProgramColumns(buf)
+	if exportFormat == 'csv':
+		quote, quoteChar = quoteOB8CSV, ''
+		prefixes = [''] * len(ob8ExportKeys)
+		separator, start, end = ',', '', '\r\n'
+	else:
+		quote, quoteChar = json.dumps, '"'
+		prefixes = [json.dumps(key) + ': ' for key in ob8ExportKeys]
+		separator, start, end = ', ', '{', '}\n'
+
+	# the value text of every field, and the template row around it
+	values = []
+	for key in ob8ExportKeys:
+		if key == 'path':
+			values.append(getOB8LabelText(paths, quote))
+		elif key == 'offset':
+			values.append(getOB8IntegerDigits(offsets, len(str(max(offsets)))))
+		elif key == 'hash':
+			values.append(getOB8DigestText(getOB8ExportDigests(getOB8ExportRecords(buf))))
+		elif key == 'programGroup':
+			values.append(getOB8LabelText(columns[key], quote))
+		else:
+			values.append(getOB8IntegerDigits(columns[key], 3 if key == 'programIndex' else 2))
+	template = bytearray(start.encode('ascii'))
+	slots = []
+	for i, key in enumerate(ob8ExportKeys):
+		template += prefixes[i].encode('ascii')
+		if key == 'hash':
+			template += quoteChar.encode('ascii')
+		slots.append(len(template))
+		template += bytes(values[i].shape[1])
+		if key == 'hash':
+			template += quoteChar.encode('ascii')
+		template += (end if i == len(ob8ExportKeys) - 1 else separator).encode('ascii')
+
+	text = np.empty((len(offsets), len(template)), dtype=np.uint8)
+	text[:] = np.frombuffer(bytes(template), dtype=np.uint8)
+	for slot, value in zip(slots, values):
+		text[:, slot:slot+value.shape[1]] = value
+	return text.tobytes().translate(None, b'\0')
+
+# yields the batches of iterOB8ExportFrames with only the programs that match a compiled --where expression
+def filterOB8ExportFrames(batches, where):
+	import numpy as np
+	for buf, paths, offsets in batches:
+		mask = where(getOB8ProgramColumns(buf))
+		if mask.all():
+			yield buf, paths, offsets
+		elif mask.any():
+			frames = np.frombuffer(buf, dtype=np.uint8).reshape(-1, 60)
+			yield frames[mask].tobytes(), list(itertools.compress(paths, mask)), list(itertools.compress(offsets, mask))
+
+# returns the header row of a CSV export, or nothing for NDJSON
+def dumpOB8ExportHeaderText(exportFormat):
+	if exportFormat == 'csv':
+		return (','.join(ob8ExportKeys) + '\r\n').encode('utf-8')
+	return b''
+
+# writes batches from iterOB8ExportFrames as CSV with a header row, or as newline-delimited JSON
+def writeOB8ExportText(outputFile, batches, exportFormat):
+	outputFile.write(dumpOB8ExportHeaderText(exportFormat))
+	count = 0
+	for batch in batches:
+		outputFile.write(dumpOB8ExportText(batch, exportFormat))
+		count += len(batch[2])
+	return count
+
+# a SQLite export stores the program slot and the 27 parameter bytes of every program in the parameterBytes table,
+# which is quick to fill, and the parameters view computes every field of ob8ExportKeys from them
+def dumpOB8ExportSchemaSQL():
+	fields = {
+		'path': 'path',
+		'offset': 'offset',
+		'hash': 'hash',
+		'programIndex': 'slot + 1',
+		'programGroup': 'iif((slot / 8 + 1) & 1, \'A\', \'\') || iif((slot / 8 + 1) & 2, \'B\', \'\') || iif((slot / 8 + 1) & 4, \'C\', \'\') || iif((slot / 8 + 1) & 8, \'D\', \'\')',
+		'programNumber': 'slot % 8 + 1'}
+	for name, *parts in ob8ProgramSchema:
+		fields[name] = getOB8FieldSource(parts, 'b{}'.format)
+	columns = ['path TEXT', 'offset INTEGER', 'hash TEXT', 'slot INTEGER'] + ['b{} INTEGER'.format(byte) for byte in range(27)]
+	return ['CREATE TABLE IF NOT EXISTS parameterBytes ({})'.format(', '.join(columns)),
+		'CREATE VIEW IF NOT EXISTS parameters AS SELECT {} FROM parameterBytes'.format(', '.join('{} AS "{}"'.format(fields[key], key) for key in ob8ExportKeys))]
+
+# inserts a batch from iterOB8ExportFrames into the parameterBytes table of a SQLite export
+def insertOB8ExportBatch(db, batch):
+	buf, framePaths, offsets = batch
+	records = getOB8ExportRecords(buf)
+	digests = getOB8ExportDigests(records).tobytes().hex()
+	hashes = [digests[i:i+40] for i in range(0, len(digests), 40)]
+	db.executemany('INSERT INTO parameterBytes VALUES ({})'.format(', '.join('?'*31)), zip(framePaths, offsets, hashes, *records.T.tolist()))
+
+# writes batches from iterOB8ExportFrames to a SQLite database, replacing any programs exported before from the input files
+def writeOB8ExportSQLite(outputPath, paths, batches):
+	import sqlite3
+	db = sqlite3.connect(outputPath)
+	db.execute('PRAGMA synchronous = OFF')
+	for statement in dumpOB8ExportSchemaSQL():
+		db.execute(statement)
+	count = 0
+	with db:
+		# the path index makes the deletes quick, and is then dropped until every batch is in
+		db.executemany('DELETE FROM parameterBytes WHERE path = ?', [(os.path.abspath(path),) for path in paths])
+		db.execute('DROP INDEX IF EXISTS parameterBytesPath')
+		db.execute('DROP INDEX IF EXISTS parameterBytesHash')
+		lastRow = db.execute('SELECT MAX(rowid) FROM parameterBytes').fetchone()[0] or 0
+	for batch in batches:
+		with db:
+			insertOB8ExportBatch(db, batch)
+		count += len(batch[2])
+	# the files in archives and stores are only known once they are read, so their earlier programs go now
+	with db:
+		db.execute('DELETE FROM parameterBytes WHERE rowid <= ? AND path IN (SELECT path FROM parameterBytes WHERE rowid > ?)', (lastRow, lastRow))
+	# indexing once at the end is quicker than keeping the indexes up to date while inserting
+	with db:
+		db.execute('CREATE INDEX parameterBytesPath ON parameterBytes (path)')
+		db.execute('CREATE INDEX parameterBytesHash ON parameterBytes (hash)')
+	db.close()
+	return count
+
+# exports every good program of the input files, or those matching a --where expression, to outputPath as csv, ndjson or sqlite
+# the format is taken from the file extension if it is not given; returns the number of programs written
+def exportOB8Programs(outputPath, paths, exportFormat=None, errorFile=stderr, where=None):
+	if exportFormat is None:
+		exportFormat = ob8ExportFormats.get(os.path.splitext(outputPath)[1].lower())
+		if exportFormat is None:
+			raise ValueError('cannot tell the export format of {}, use --export-format'.format(outputPath))
+	batches = iterOB8ExportFrames(paths, errorFile=errorFile)
+	if where:
+		batches = filterOB8ExportFrames(batches, compileOB8Where(where) if isinstance(where, str) else where)
+	if exportFormat == 'sqlite':
+		return writeOB8ExportSQLite(outputPath, paths, batches)
+	with open(outputPath, 'wb') as outputFile:
+		return writeOB8ExportText(outputFile, batches, exportFormat)
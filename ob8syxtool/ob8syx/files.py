@@ -0,0 +1,348 @@
+#
+# MIT License
+#
+# Copyright (c) 2022 Christian-E! / Ten by Ten Software
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+#
+# This module prints OB-8 sysex files as text, html or sysex banks and times every phase of it
+#
+
+import io
+import os
+import time
+from sys import stderr
+from .programs import OB8Program, OB8ProgramParser, getOB8Program, getOB8ProgramFromRecord, iterOB8Frames, mapOB8File, ob8ProgramRecordSize, printOB8BadFrames, readOB8Chunks, writeOB8Programs
+from .text import writeOB8ColumnsText, writeOB8ProgramsText
+from .columns import compileOB8Where, filterOB8Columns, filterOB8Programs, getOB8ProgramColumns, getOB8ProgramsFromColumns
+
+# yields arrays of program dicts decoded from an input file as they become available
+# the input is read in chunks, memory-mapped (useMmap) or decoded in one pass with NumPy (useBatch)
+# only the programs that match where (a --where expression or compiled expression) are yielded when it is given;
+# the batch decoder picks them from its columns before any dicts are built, and with asColumns yields the columns
+# themselves (as from getOB8ProgramColumns) instead of dicts
+# counts the bytes and frames and times reading, decoding and filtering in fileStats
+def iterOB8FilePrograms(fileReader, useBatch=False, useMmap=False, errorFile=stderr, fileStats=None, where=None, asColumns=False):
+	if fileStats is None:
+		fileStats = newOB8FileStats()
+	if isinstance(where, str):
+		where = compileOB8Where(where)
+	clock = getOB8PhaseClock()
+	if useMmap and fileReader.seekable():
+		# the pages of a mapped file are read as they are decoded, so that time counts as decoding
+		buf = mapOB8File(fileReader)
+	elif useBatch:
+		buf = fileReader.read()
+	else:
+		# decode the programs as the bytes arrive
+		programParser = OB8ProgramParser()
+		for chunk in readOB8Chunks(fileReader):
+			clock = addOB8PhaseTime(fileStats, 'read', clock)
+			fileStats['bytes'] += len(chunk)
+			programsDict = programParser.feed(chunk)
+			printOB8BadFrames(fileReader, programParser.badFrames, errorFile, fileStats)
+			fileStats['frames'] += len(programsDict)
+			clock = addOB8PhaseTime(fileStats, 'decode', clock)
+			if where:
+				programsDict = filterOB8Programs(programsDict, where)
+				addOB8PhaseTime(fileStats, 'filter', clock)
+			yield programsDict
+			clock = getOB8PhaseClock()
+		clock = addOB8PhaseTime(fileStats, 'read', clock)
+		programParser.close()
+		printOB8BadFrames(fileReader, programParser.badFrames, errorFile, fileStats)
+		return
+
+	fileStats['bytes'] += len(buf)
+	clock = addOB8PhaseTime(fileStats, 'read', clock)
+	badFrames = []
+	if useBatch:
+		offsets = [offset for offset, frame in iterOB8Frames(buf, badFrames)]
+		printOB8BadFrames(fileReader, badFrames, errorFile, fileStats)
+		fileStats['frames'] += len(offsets)
+		if len(offsets)*60 != len(buf):
+			buf = b''.join(buf[offset:offset+60] for offset in offsets)
+		if not buf:
+			addOB8PhaseTime(fileStats, 'decode', clock)
+			return
+		columns = getOB8ProgramColumns(buf)
+		if where:
+			clock = addOB8PhaseTime(fileStats, 'decode', clock)
+			columns = filterOB8Columns(columns, where)
+			clock = addOB8PhaseTime(fileStats, 'filter', clock)
+		if asColumns:
+			addOB8PhaseTime(fileStats, 'decode', clock)
+			if len(columns['programIndex']):
+				yield columns
+			return
+		programsDict = getOB8ProgramsFromColumns(columns)
+		addOB8PhaseTime(fileStats, 'decode', clock)
+		if programsDict:
+			yield programsDict
+		return
+
+	programsDict = []
+	for offset, frame in iterOB8Frames(buf, badFrames):
+		programsDict.append(getOB8Program(frame, 0))
+		if len(programsDict) == 1024:
+			fileStats['frames'] += len(programsDict)
+			clock = addOB8PhaseTime(fileStats, 'decode', clock)
+			if where:
+				programsDict = filterOB8Programs(programsDict, where)
+				addOB8PhaseTime(fileStats, 'filter', clock)
+			yield programsDict
+			clock = getOB8PhaseClock()
+			programsDict = []
+	printOB8BadFrames(fileReader, badFrames, errorFile, fileStats)
+	fileStats['frames'] += len(programsDict)
+	clock = addOB8PhaseTime(fileStats, 'decode', clock)
+	if where:
+		programsDict = filterOB8Programs(programsDict, where)
+		addOB8PhaseTime(fileStats, 'filter', clock)
+	yield programsDict
+
+# yields arrays of programs for an input file from the decode cache, as iterOB8FilePrograms does, or of OB8Programs with asRecords
+# counts cacheHits and cacheMisses in fileStats; looking a file up, and reading and decoding it on a miss, counts as reading
+def iterOB8CachedFilePrograms(cache, fileReader, fileStats, errorFile=stderr, asRecords=False):
+	from .cache import getOB8CachedRecords
+	clock = getOB8PhaseClock()
+	records, badFrames, hit = getOB8CachedRecords(cache, fileReader)
+	fileStats['cacheHits' if hit else 'cacheMisses'] += 1
+	# the file is only read when its path, size and time are not in the cache
+	fileStats['bytes'] += fileReader.tell()
+	fileStats['frames'] += int(len(records)/ob8ProgramRecordSize)
+	printOB8BadFrames(fileReader, badFrames, errorFile, fileStats)
+	clock = addOB8PhaseTime(fileStats, 'read', clock)
+	yield from iterOB8RecordPrograms(records, fileStats, clock, asRecords)
+
+# yields arrays of program dicts for the 28-byte program records in records, 1024 programs at a time
+# with asRecords they are OB8Programs instead, which are slower to render but are written as sysex or lazy html
+# without encoding them again
+# counts the time taken in fileStats as decoding, starting from clock
+def iterOB8RecordPrograms(records, fileStats, clock=None, asRecords=False):
+	if clock is None:
+		clock = getOB8PhaseClock()
+	decode = OB8Program if asRecords else getOB8ProgramFromRecord
+	step = 1024*ob8ProgramRecordSize
+	for start in range(0, len(records), step):
+		programsArray = [decode(records[i:i+ob8ProgramRecordSize]) for i in range(start, min(start+step, len(records)), ob8ProgramRecordSize)]
+		addOB8PhaseTime(fileStats, 'decode', clock)
+		yield programsArray
+		clock = getOB8PhaseClock()
+
+# writes the heading of an input file's programs as text or html, as options say
+# the html renderers are only imported for html, so printing text does not load them
+def writeOB8ProgramsHeader(outputFile, fileReader, options):
+	if options.static:
+		from .panels import dumpOB8ProgramsHeaderStaticHTML
+		outputFile.write(dumpOB8ProgramsHeaderStaticHTML(fileReader))
+	elif options.html:
+		from .panels import dumpOB8ProgramsHeaderHTML
+		outputFile.write(dumpOB8ProgramsHeaderHTML(fileReader))
+	else:
+		outputFile.write(fileReader.name + '\n')
+
+# writes programs as text, html, lazy html or static html, as options say
+def writeOB8ProgramsAs(outputFile, programsDict, options):
+	if options.static:
+		from .panels import writeOB8ProgramsStaticHTML
+		writeOB8ProgramsStaticHTML(outputFile, programsDict)
+	elif options.lazy:
+		from .panels import writeOB8ProgramsLazyHTML
+		writeOB8ProgramsLazyHTML(outputFile, programsDict)
+	elif options.html:
+		from .panels import writeOB8ProgramsHTML
+		writeOB8ProgramsHTML(outputFile, programsDict)
+	else:
+		writeOB8ProgramsText(outputFile, programsDict)
+
+# writes the programs of parameter columns (as from getOB8ProgramColumns) as writeOB8ProgramsAs writes their dicts
+def writeOB8ColumnsAs(outputFile, columns, options):
+	if options.static:
+		from .panels import writeOB8ColumnsStaticHTML
+		writeOB8ColumnsStaticHTML(outputFile, columns)
+	elif options.lazy:
+		from .panels import writeOB8ColumnsLazyHTML
+		writeOB8ColumnsLazyHTML(outputFile, columns)
+	elif options.html:
+		from .panels import writeOB8ColumnsHTML
+		writeOB8ColumnsHTML(outputFile, columns)
+	else:
+		writeOB8ColumnsText(outputFile, columns)
+
+# the phases of printing an input file that are timed in its stats: reading the file, decoding its programs,
+# picking the programs that match --where, and rendering them
+ob8StatsPhases = ('read', 'decode', 'filter', 'render')
+
+# returns a dict for counting what happened to an input file: its cache hits and misses, the bytes read, the good
+# and bad frames found, the programs written, and the wall and CPU seconds of every phase of ob8StatsPhases
+# the counts of several files add up to their total
+def newOB8FileStats():
+	fileStats = {'cacheHits': 0, 'cacheMisses': 0, 'bytes': 0, 'frames': 0, 'badFrames': 0, 'programs': 0}
+	for phase in ob8StatsPhases:
+		fileStats[phase + 'Wall'] = 0.0
+		fileStats[phase + 'Cpu'] = 0.0
+	return fileStats
+
+# returns the wall and CPU clocks, for timing a phase with addOB8PhaseTime
+def getOB8PhaseClock():
+	return time.perf_counter(), time.process_time()
+
+# adds the wall and CPU seconds since a clock from getOB8PhaseClock to a phase of fileStats
+# returns the clocks now, so the next phase can be timed from there
+def addOB8PhaseTime(fileStats, phase, clock):
+	now = getOB8PhaseClock()
+	fileStats[phase + 'Wall'] += now[0] - clock[0]
+	fileStats[phase + 'Cpu'] += now[1] - clock[1]
+	return now
+
+# functions called with (path, fileStats) after each input file is printed, so other tools can follow a run
+ob8StatsHooks = []
+
+# subscribes hook(path, fileStats) to the stats of every input file printed from now on
+def addOB8StatsHook(hook):
+	ob8StatsHooks.append(hook)
+
+# unsubscribes a hook added with addOB8StatsHook
+def removeOB8StatsHook(hook):
+	ob8StatsHooks.remove(hook)
+
+# returns the peak resident set size of this process and of its finished child processes, such as the --jobs
+# workers, in bytes, or None where the system does not tell
+def getOB8PeakRSS():
+	try:
+		import resource
+	except ImportError:
+		return None
+	peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+	# ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+	return peak if os.uname().sysname == 'Darwin' else peak*1024
+
+# writes the --stats line of an input file, or of the whole run
+def writeOB8FileStatsText(outputFile, name, fileStats):
+	phases = ', '.join('{} {:.3f}s ({:.3f}s cpu)'.format(phase, fileStats[phase + 'Wall'], fileStats[phase + 'Cpu']) for phase in ob8StatsPhases)
+	outputFile.write('{}: {} bytes, {} frames, {} rejected, {} programs written; {}\n'.format(name, fileStats['bytes'], fileStats['frames'], fileStats['badFrames'], fileStats['programs'], phases))
+
+# returns the stats of a run for --stats and --stats-json: the totals of the input files, the seconds since the run
+# started, the frames decoded per second and the peak memory
+def getOB8RunStats(totalStats, startClock):
+	runStats = dict(totalStats)
+	runStats['wall'] = time.perf_counter() - startClock[0]
+	runStats['cpu'] = time.process_time() - startClock[1]
+	runStats['programsPerSecond'] = runStats['frames'] / runStats['wall'] if runStats['wall'] else None
+	runStats['peakRSS'] = getOB8PeakRSS()
+	return runStats
+
+# writes the stats of every input file and of the run as JSON
+def writeOB8StatsJSON(outputFile, filesStats, runStats):
+	import json
+	json.dump({'files': [dict(path=path, **fileStats) for path, fileStats in filesStats], 'total': runStats}, outputFile, indent='\t')
+	outputFile.write('\n')
+
+# stops a profiler started by --profile and prints the functions the run spent the most time in, with the time
+# spent in each and in everything it called, and saves the full profile to path for other tools when it is given
+def writeOB8Profile(profiler, path=None, errorFile=stderr, count=30):
+	import pstats
+	profiler.disable()
+	if path:
+		profiler.dump_stats(path)
+	pstats.Stats(profiler, stream=errorFile).sort_stats('cumulative', 'tottime').print_stats(count)
+
+# writes every program of an input file to outputFile as text, html (options.html) or a sysex bank (options.syx)
+# the programs come from cache, an open decode cache as from openOB8Cache, when one is given, and straight from
+# their records for the source file of a library store
+# counts what happened and times every phase in fileStats, and returns False if the file holds no OB-8 programs
+def writeOB8File(fileReader, outputFile, options, errorFile=stderr, fileStats=None, cache=None):
+	if fileStats is None:
+		fileStats = newOB8FileStats()
+	where = compileOB8Where(options.where) if options.where else None
+	framesBefore = fileStats['frames']
+	# programs that are written back as records are kept as records
+	asRecords = bool(options.syx or options.lazy)
+	records = getattr(fileReader, 'records', None)
+	asColumns = False
+	if records is not None:
+		fileStats['bytes'] += len(records)
+		fileStats['frames'] += int(len(records)/ob8ProgramRecordSize)
+		programs = iterOB8RecordPrograms(records, fileStats, asRecords=asRecords)
+	elif cache and os.path.isfile(fileReader.name):
+		programs = iterOB8CachedFilePrograms(cache, fileReader, fileStats, errorFile, asRecords)
+	else:
+		# text and html are rendered straight from the columns of the batch decoder
+		asColumns = bool(options.batch and not options.syx)
+		programs = iterOB8FilePrograms(fileReader, options.batch, options.mmap, errorFile, fileStats, where, asColumns)
+		# the file decoder has already picked the programs
+		where = None
+	headerWritten = False
+	for programsDict in programs:
+		if not programsDict:
+			continue
+		clock = getOB8PhaseClock()
+		if where:
+			programsDict = filterOB8Programs(programsDict, where)
+			clock = addOB8PhaseTime(fileStats, 'filter', clock)
+			if not programsDict:
+				continue
+		fileStats['programs'] += len(programsDict['programIndex']) if asColumns else len(programsDict)
+		if options.syx:
+			writeOB8Programs(outputFile, programsDict)
+			addOB8PhaseTime(fileStats, 'render', clock)
+			continue
+		if not headerWritten:
+			headerWritten = True
+			writeOB8ProgramsHeader(outputFile, fileReader, options)
+		if asColumns:
+			writeOB8ColumnsAs(outputFile, programsDict, options)
+		else:
+			writeOB8ProgramsAs(outputFile, programsDict, options)
+		outputFile.flush()
+		addOB8PhaseTime(fileStats, 'render', clock)
+	# every decoded program counts, whether or not it matched --where
+	return fileStats['frames'] > framesBefore
+
+# the decode cache of a --jobs worker process, opened once when the process starts
+ob8JobCache = None
+
+# process pool initializer for --jobs: opens the decode cache of options.cache, if any, for every file of the worker
+def openOB8JobCache(options):
+	global ob8JobCache
+	if options.cache:
+		from .cache import openOB8Cache
+		ob8JobCache = openOB8Cache(options.cache)
+
+# process pool worker for --jobs: writes one input file to memory as writeOB8File does
+# returns (foundPrograms, output, errors, fileStats)
+def writeOB8FileJob(job):
+	path, options = job
+	outputFile = io.BytesIO() if options.syx else io.StringIO()
+	errorFile = io.StringIO()
+	fileStats = newOB8FileStats()
+	with open(path, 'rb') as f:
+		foundPrograms = writeOB8File(f, outputFile, options, errorFile, fileStats, ob8JobCache)
+	return foundPrograms, outputFile.getvalue(), errorFile.getvalue(), fileStats
+
+# yields (foundPrograms, output, errors, fileStats) for every input file in order, rendering up to jobs files at once
+# results are yielded as soon as the file and every file before it are done
+def iterOB8FileJobs(paths, options, jobs):
+	from concurrent.futures import ProcessPoolExecutor
+	with ProcessPoolExecutor(jobs, initializer=openOB8JobCache, initargs=(options,)) as executor:
+		yield from executor.map(writeOB8FileJob, [(path, options) for path in paths])
@@ -0,0 +1,293 @@
+#
+# MIT License
+#
+# Copyright (c) 2022 Christian-E! / Ten by Ten Software
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+#
+# This module indexes, searches and summarises libraries of OB-8 sysex files
+#
+
+import os
+from sys import stderr
+from .programs import getOB8ProgramGroup, getOB8ProgramHash, getOB8ProgramNumber, getOB8ProgramRecord, iterOB8Frames, mapOB8File, ob8KnobKeys, ob8SwitchKeys, printOB8BadFrames
+from .archives import iterOB8InputBuffers
+
+# opens or creates an on-disk index of the programs in a library of sysex files
+# the index maps the content hash of every program to each (file, byte offset, slot) where it occurs
+def openOB8Index(path):
+	import sqlite3
+	index = sqlite3.connect(path)
+	index.execute('CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, size INTEGER, mtime REAL)')
+	index.execute('CREATE TABLE IF NOT EXISTS programs (hash TEXT, path TEXT, offset INTEGER, slot INTEGER)')
+	index.execute('CREATE INDEX IF NOT EXISTS programsHash ON programs (hash)')
+	index.execute('CREATE INDEX IF NOT EXISTS programsPath ON programs (path)')
+	return index
+
+# adds sysex files to the index, skipping files whose size and modification time have not changed
+# files are kept by absolute path, so a file indexed from different directories is still one file
+# returns the number of files that were (re)indexed
+def updateOB8Index(index, paths, errorFile=stderr):
+	updated = 0
+	for path in paths:
+		path = os.path.abspath(path)
+		stat = os.stat(path)
+		row = index.execute('SELECT size, mtime FROM files WHERE path = ?', (path,)).fetchone()
+		if row == (stat.st_size, stat.st_mtime):
+			continue
+		badFrames = []
+		with open(path, 'rb') as f:
+			buf = mapOB8File(f)
+			rows = [(getOB8ProgramHash(getOB8ProgramRecord(frame)), path, offset, frame[4]) for offset, frame in iterOB8Frames(buf, badFrames)]
+			printOB8BadFrames(f, badFrames, errorFile)
+		with index:
+			index.execute('DELETE FROM programs WHERE path = ?', (path,))
+			index.executemany('INSERT INTO programs VALUES (?, ?, ?, ?)', rows)
+			index.execute('INSERT OR REPLACE INTO files VALUES (?, ?, ?)', (path, stat.st_size, stat.st_mtime))
+		updated += 1
+	return updated
+
+# returns (path, offset, slot) for every occurrence of a program hash in the index
+def findOB8ProgramLocations(index, programHash):
+	return index.execute('SELECT path, offset, slot FROM programs WHERE hash = ? ORDER BY path, offset', (programHash,)).fetchall()
+
+# returns (hash, count, path, offset, slot) for every unique program in the index, with the first place it was indexed
+def getOB8UniquePrograms(index):
+	rows = index.execute('SELECT hash, COUNT(*), path, offset, slot, MIN(rowid) FROM programs GROUP BY hash ORDER BY MIN(rowid)')
+	return [row[:5] for row in rows]
+
+# decodes the good frames of many sysex files, archives and stores at once
+# returns the parameter columns from getOB8ProgramColumns and a (path, offset) location for every program
+def getOB8LibraryColumns(paths, errorFile=stderr):
+	from .columns import getOB8ProgramColumns
+	frames = []
+	locations = []
+	for f, buf, bufOffsets in iterOB8InputBuffers(paths):
+		if bufOffsets is not None:
+			# the programs of a store come as good frames back to back
+			frames.append(buf)
+			locations += [(f.name, offset) for offset in bufOffsets]
+			continue
+		badFrames = []
+		for offset, frame in iterOB8Frames(buf, badFrames):
+			frames.append(frame)
+			locations.append((f.name, offset))
+		printOB8BadFrames(f, badFrames, errorFile)
+	return getOB8ProgramColumns(b''.join(frames)), locations
+
+# parses --weight items such as vcfFreq=4 into the weights of getOB8FeatureMatrix
+# raises ValueError for an item that is not name=weight or names a parameter that is not compared
+def getOB8FeatureWeights(items):
+	keys = ob8KnobKeys + ob8SwitchKeys
+	weights = {}
+	for item in items:
+		name, equals, weight = item.partition('=')
+		if name not in keys:
+			raise ValueError('unknown parameter {} in --weight {}, use one of {}'.format(name, item, ', '.join(keys)))
+		try:
+			weights[name] = float(weight)
+		except ValueError:
+			raise ValueError('bad weight {!r}, use name=weight such as {}=2'.format(item, name))
+	return weights
+
+# builds an (N, K) matrix of program features from parameter columns, scaled so that the squared
+# euclidean distance between two rows is the weighted distance between the programs:
+# the sum of weight * (difference / 63)^2 over the knobs plus the sum of weight * difference over the switches
+# weights maps parameter names to weights, every other parameter weighs 1
+def getOB8FeatureMatrix(columns, weights=None):
+	import numpy as np
+	weights = weights or {}
+	keys = ob8KnobKeys + ob8SwitchKeys
+	features = np.empty((len(columns['programIndex']), len(keys)), dtype=np.float32, order='F')
+	for i, name in enumerate(keys):
+		features[:, i] = columns[name]
+	scale = [np.sqrt(weights.get(name, 1.0)) / 63 for name in ob8KnobKeys] + [np.sqrt(weights.get(name, 1.0)) for name in ob8SwitchKeys]
+	features *= np.array(scale, dtype=np.float32)
+	return features
+
+# returns [(row, distance), ...] for the k rows of features nearest to the query row, nearest first
+# the distances are computed in blocks of rows so memory stays bounded; useTree uses a SciPy k-d tree instead
+def findOB8SimilarPrograms(features, query, k=10, useTree=False, blockSize=65536):
+	import numpy as np
+	k = min(k, len(features))
+	if useTree:
+		from scipy.spatial import cKDTree
+		distances, rows = cKDTree(features).query(query, k)
+		return list(zip(np.atleast_1d(rows).tolist(), np.atleast_1d(distances).tolist()))
+
+	distances = np.empty(len(features), dtype=np.float32)
+	for start in range(0, len(features), blockSize):
+		block = features[start:start+blockSize] - query
+		distances[start:start+blockSize] = np.einsum('ij,ij->i', block, block)
+	rows = np.argpartition(distances, k-1)[:k] if k < len(features) else np.arange(len(features))
+	rows = rows[np.argsort(distances[rows], kind='stable')]
+	return [(row, float(np.sqrt(distances[row]))) for row in rows.tolist()]
+
+# finds a program in a file by group and number (A-3) or program number (3)
+# returns the 60-byte frame and its offset
+def findOB8ProgramFrame(path, program):
+	with open(path, 'rb') as f:
+		buf = mapOB8File(f)
+	for offset, frame in iterOB8Frames(buf):
+		programIndex = frame[4]
+		if program in ('{}-{}'.format(getOB8ProgramGroup(programIndex), getOB8ProgramNumber(programIndex)), str(programIndex+1)):
+			return bytes(frame), offset
+	raise KeyError('{} has no program {}'.format(path, program))
+
+# accumulates the statistics of a library of programs one batch of parameter columns at a time, so any number of
+# programs is summarised in one pass and in constant memory: a 64-bucket histogram of every knob, how often every
+# switch is on, and the sums and sums of products of every parameter that the correlations are computed from
+class OB8LibraryStats:
+	__slots__ = ('count', 'histograms', 'switchCounts', 'sums', 'products')
+
+	# the parameters that are counted, knobs first
+	keys = ob8KnobKeys + ob8SwitchKeys
+
+	def __init__(self):
+		import numpy as np
+		self.count = 0
+		self.histograms = np.zeros((len(ob8KnobKeys), 64), dtype=np.int64)
+		self.switchCounts = np.zeros(len(ob8SwitchKeys), dtype=np.int64)
+		self.sums = np.zeros(len(self.keys))
+		self.products = np.zeros((len(self.keys), len(self.keys)))
+
+	# adds the programs of a mapping of parameter columns, as from getOB8ProgramColumns
+	def add(self, columns):
+		import numpy as np
+		count = len(columns['programIndex'])
+		if not count:
+			return
+		values = np.empty((count, len(self.keys)), order='F')
+		for i, key in enumerate(self.keys):
+			values[:, i] = columns[key]
+		for i, key in enumerate(ob8KnobKeys):
+			self.histograms[i] += np.bincount(columns[key], minlength=64)
+		self.switchCounts += values[:, len(ob8KnobKeys):].sum(axis=0).astype(np.int64)
+		self.sums += values.sum(axis=0)
+		self.products += values.T @ values
+		self.count += count
+
+	# returns the mean of every parameter of keys
+	def getMeans(self):
+		return self.sums / max(self.count, 1)
+
+	# returns the median of every knob
+	def getMedians(self):
+		import numpy as np
+		return (np.cumsum(self.histograms, axis=1) < self.count / 2).sum(axis=1)
+
+	# returns the matrix of Pearson correlations between the parameters of keys, with NaN for parameters that never change
+	def getCorrelations(self):
+		import numpy as np
+		means = self.getMeans()
+		covariances = self.products / max(self.count, 1) - np.outer(means, means)
+		deviations = np.sqrt(np.clip(np.diag(covariances), 0, None))
+		with np.errstate(divide='ignore', invalid='ignore'):
+			correlations = covariances / np.outer(deviations, deviations)
+		correlations[np.outer(deviations, deviations) == 0] = np.nan
+		return np.clip(correlations, -1, 1)
+
+	# returns [(correlation, key, otherKey), ...] for the pairCount most strongly correlated pairs of parameters
+	def getCorrelatedPairs(self, pairCount=20):
+		import numpy as np
+		correlations = self.getCorrelations()
+		rows, cols = np.triu_indices(len(self.keys), 1)
+		strengths = np.nan_to_num(np.abs(correlations[rows, cols]), nan=-1)
+		order = np.argsort(-strengths, kind='stable')[:pairCount]
+		return [(float(correlations[rows[i], cols[i]]), self.keys[rows[i]], self.keys[cols[i]]) for i in order if strengths[i] >= 0]
+
+# computes the OB8LibraryStats of the good programs of the input files, or of those matching a --where expression
+def getOB8LibraryStats(paths, where=None, errorFile=stderr):
+	from .columns import compileOB8Where, getOB8ProgramColumns
+	from .export import filterOB8ExportFrames, iterOB8ExportFrames
+	stats = OB8LibraryStats()
+	batches = iterOB8ExportFrames(paths, errorFile=errorFile)
+	if where:
+		batches = filterOB8ExportFrames(batches, compileOB8Where(where) if isinstance(where, str) else where)
+	for buf, framePaths, offsets in batches:
+		stats.add(getOB8ProgramColumns(buf))
+	return stats
+
+# the characters of a text histogram, from empty to full
+ob8HistogramLevels = ' .:-=+*#%@'
+
+# writes OB8LibraryStats as text: a one-line histogram of every knob, the switch frequencies and the most correlated parameters
+def writeOB8StatsText(outputFile, stats, fileCount, pairCount=20):
+	means = stats.getMeans()
+	medians = stats.getMedians()
+	dump = ['OB-8 library statistics: {} programs from {} files\n'.format(stats.count, fileCount)]
+	dump.append('\n{: <14} {: >5} {: >6}   0{: >63}\n'.format('Knob', 'mean', 'median', '63'))
+	for i, key in enumerate(ob8KnobKeys):
+		histogram = stats.histograms[i]
+		top = max(int(histogram.max()), 1)
+		line = ''.join(ob8HistogramLevels[-(-int(count) * (len(ob8HistogramLevels)-1) // top)] for count in histogram)
+		dump.append('{: <14} {: >5.1f} {: >6}  |{}|\n'.format(key, means[i], medians[i], line))
+	dump.append('\n{: <14} {: >9} {: >7}\n'.format('Switch', 'on', 'percent'))
+	for i, key in enumerate(ob8SwitchKeys):
+		dump.append('{: <14} {: >9} {: >6.1f}%\n'.format(key, stats.switchCounts[i], 100 * stats.switchCounts[i] / max(stats.count, 1)))
+	dump.append('\nMost correlated parameters\n')
+	for correlation, key, otherKey in stats.getCorrelatedPairs(pairCount):
+		dump.append('{: >+6.2f}  {} {}\n'.format(correlation, key, otherKey))
+	outputFile.write(''.join(dump))
+
+# writes OB8LibraryStats as an html page of charts: a bar chart of every knob, the switch frequencies and a colored correlation matrix
+def writeOB8StatsHTML(outputFile, stats, fileCount):
+	import math
+	from .panels import dumpOB8HeadHTML
+	means = stats.getMeans()
+	medians = stats.getMedians()
+	dump = [dumpOB8HeadHTML()]
+	dump.append('<h1>OB-8 Library Statistics</h1>\n')
+	dump.append('<p>{} programs from {} files</p>\n'.format(stats.count, fileCount))
+
+	dump.append('<h2>Knobs</h2>\n<table>\n<tr><th>parameter</th><th>mean</th><th>median</th><th>0 &ndash; 63</th></tr>\n')
+	for i, key in enumerate(ob8KnobKeys):
+		histogram = stats.histograms[i]
+		top = max(int(histogram.max()), 1)
+		bars = ''.join('<rect x="{}" y="{:.1f}" width="3" height="{:.1f}"><title>{}: {}</title></rect>'.format(value*4, 40 - 40*int(count)/top, 40*int(count)/top, value, count) for value, count in enumerate(histogram) if count)
+		dump.append('<tr><td>{}</td><td>{:.1f}</td><td>{}</td><td><svg width="256" height="40" fill="#66aaff">{}</svg></td></tr>\n'.format(key, means[i], medians[i], bars))
+	dump.append('</table>\n')
+
+	dump.append('<h2>Switches</h2>\n<table>\n<tr><th>parameter</th><th>on</th><th>percent</th><th></th></tr>\n')
+	for i, key in enumerate(ob8SwitchKeys):
+		percent = 100 * stats.switchCounts[i] / max(stats.count, 1)
+		dump.append('<tr><td>{}</td><td>{}</td><td>{:.1f}%</td><td><svg width="200" height="12"><rect width="{:.1f}" height="12" fill="red"/></svg></td></tr>\n'.format(key, stats.switchCounts[i], percent, 2*percent))
+	dump.append('</table>\n')
+
+	dump.append('<h2>Correlations</h2>\n<table style="border-collapse: collapse; font-size: x-small">\n<tr><th></th>')
+	dump.append(''.join('<th style="writing-mode: vertical-rl; width: auto">{}</th>'.format(key) for key in stats.keys))
+	dump.append('</tr>\n')
+	correlations = stats.getCorrelations()
+	for i, key in enumerate(stats.keys):
+		cells = []
+		for j, otherKey in enumerate(stats.keys):
+			correlation = correlations[i, j]
+			if math.isnan(correlation):
+				cells.append('<td style="width: auto; padding: 0"></td>')
+				continue
+			# red for positive, blue for negative correlation
+			color = '255,0,0' if correlation > 0 else '60,120,255'
+			cells.append('<td style="width: auto; padding: 0; background-color: rgba({},{:.2f})" title="{} {} {:+.2f}">&nbsp;</td>'.format(color, abs(correlation), key, otherKey, correlation))
+		dump.append('<tr><td style="width: auto; text-align: right">{}</td>{}</tr>\n'.format(key, ''.join(cells)))
+	dump.append('</table>\n')
+	dump.append('</body></html>')
+	outputFile.write(''.join(dump))
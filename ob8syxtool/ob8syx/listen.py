@@ -0,0 +1,188 @@
+#
+# MIT License
+#
+# Copyright (c) 2022 Christian-E! / Ten by Ten Software
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+#
+# This module decodes OB-8 programs from live MIDI byte streams
+#
+
+import os
+from sys import stderr, stdin
+from .programs import OB8ProgramParser, getOB8Program, printOB8BadFrames
+from .panels import dumpOB8BottomBoilerplateHTML, dumpOB8LazyRendererHTML, dumpOB8StaticBottomBoilerplateHTML, dumpOB8StaticTopBoilerplateHTML, dumpOB8TopBoilerplateHTML
+from .columns import compileOB8Where, filterOB8Programs
+from .files import writeOB8ProgramsAs, writeOB8ProgramsHeader
+from .export import dumpOB8ExportHeaderText, dumpOB8ExportSchemaSQL, dumpOB8ExportText, filterOB8ExportFrames, insertOB8ExportBatch, ob8ExportFormats
+
+# a live MIDI byte stream read by --listen: 'tcp:HOST:PORT' is a socket to connect to, '-' is standard input,
+# and anything else is a pipe, FIFO or file. name stands in for the file name in headings and errors, and path
+# in exports, where a pipe, FIFO or file is recorded by its absolute path as every exported file is
+class OB8ListenSource:
+	__slots__ = ('name', 'path', 'parser')
+
+	def __init__(self, name):
+		self.name = name
+		self.path = name if name == '-' or name.startswith('tcp:') else os.path.abspath(name)
+		self.parser = OB8ProgramParser(skipRealtime=True)
+
+	# opens the stream and returns (reader, writer), an asyncio stream and the socket writer to close, if any
+	async def open(self):
+		import asyncio
+		if self.name.startswith('tcp:'):
+			host, port = self.name[4:].rsplit(':', 1)
+			return await asyncio.open_connection(host, int(port))
+		loop = asyncio.get_running_loop()
+		if self.name == '-':
+			fileReader = stdin.buffer
+		else:
+			# opening a FIFO waits for a writer, so it is done off the event loop
+			fileReader = await loop.run_in_executor(None, open, self.name, 'rb', 0)
+		reader = asyncio.StreamReader()
+		if fileReader.seekable():
+			# the event loop cannot wait on regular files, and they are all there already
+			reader.feed_data(fileReader.read())
+			reader.feed_eof()
+			fileReader.close()
+		else:
+			await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), fileReader)
+		return reader, None
+
+	# reads the stream until it ends, passing every good frame to listenWriter as soon as it is complete
+	async def listen(self, listenWriter, errorFile=stderr):
+		reader, writer = await self.open()
+		try:
+			while True:
+				# returns whatever has arrived, so frames are not held back waiting for a full chunk
+				chunk = await reader.read(65536)
+				if not chunk:
+					break
+				framesArray = self.parser.feedFrames(chunk)
+				printOB8BadFrames(self, self.parser.badFrames, errorFile)
+				if framesArray:
+					listenWriter.write(self, framesArray)
+		finally:
+			self.parser.close()
+			printOB8BadFrames(self, self.parser.badFrames, errorFile)
+			if writer:
+				writer.close()
+		return self.parser.frameCount
+
+# writes the frames of live sources as they arrive, as text, html, a sysex bank or an export, as options say
+# programs from different sources may interleave, so a heading is written whenever the source changes
+class OB8ListenWriter:
+	__slots__ = ('outputFile', 'options', 'where', 'exportFormat', 'db', 'lastSource')
+
+	def __init__(self, outputFile, options):
+		self.outputFile = outputFile
+		self.options = options
+		self.where = compileOB8Where(options.where) if options.where else None
+		self.exportFormat = None
+		self.db = None
+		self.lastSource = None
+		if options.export:
+			self.exportFormat = options.exportFormat or ob8ExportFormats.get(os.path.splitext(options.export)[1].lower())
+			if self.exportFormat is None:
+				raise ValueError('cannot tell the export format of {}, use --export-format'.format(options.export))
+
+	# writes what comes before the first program and opens the export
+	def start(self, sources):
+		options = self.options
+		if self.exportFormat == 'sqlite':
+			import sqlite3
+			self.db = sqlite3.connect(options.export)
+			with self.db:
+				for statement in dumpOB8ExportSchemaSQL():
+					self.db.execute(statement)
+				self.db.execute('CREATE INDEX IF NOT EXISTS parameterBytesPath ON parameterBytes (path)')
+				self.db.execute('CREATE INDEX IF NOT EXISTS parameterBytesHash ON parameterBytes (hash)')
+				self.db.executemany('DELETE FROM parameterBytes WHERE path = ?', [(source.path,) for source in sources])
+		elif self.exportFormat:
+			self.outputFile = open(options.export, 'wb')
+			self.outputFile.write(dumpOB8ExportHeaderText(self.exportFormat))
+		elif options.syx:
+			self.outputFile = options.syx
+		elif options.static:
+			self.outputFile.write(dumpOB8StaticTopBoilerplateHTML())
+		elif options.html:
+			self.outputFile.write(dumpOB8TopBoilerplateHTML())
+			if options.lazy:
+				self.outputFile.write(dumpOB8LazyRendererHTML())
+		self.outputFile.flush()
+
+	# writes the (offset, frame) pairs just completed by a source
+	def write(self, source, framesArray):
+		options = self.options
+		if self.exportFormat or options.syx:
+			batch = b''.join(frame for offset, frame in framesArray), [source.path]*len(framesArray), [offset for offset, frame in framesArray]
+			batches = filterOB8ExportFrames([batch], self.where) if self.where else [batch]
+			for batch in batches:
+				if self.db:
+					with self.db:
+						insertOB8ExportBatch(self.db, batch)
+				elif self.exportFormat:
+					self.outputFile.write(dumpOB8ExportText(batch, self.exportFormat))
+				else:
+					self.outputFile.write(batch[0])
+		else:
+			programsDict = [getOB8Program(frame, 0) for offset, frame in framesArray]
+			if self.where:
+				programsDict = filterOB8Programs(programsDict, self.where)
+			if not programsDict:
+				return
+			if source is not self.lastSource:
+				self.lastSource = source
+				writeOB8ProgramsHeader(self.outputFile, source, options)
+			writeOB8ProgramsAs(self.outputFile, programsDict, options)
+		if not self.db:
+			self.outputFile.flush()
+
+	# writes what comes after the last program and closes the export
+	def close(self):
+		options = self.options
+		if self.db:
+			self.db.close()
+			return
+		if self.exportFormat:
+			self.outputFile.close()
+			return
+		if options.syx:
+			pass
+		elif options.static:
+			self.outputFile.write(dumpOB8StaticBottomBoilerplateHTML())
+		elif options.html:
+			self.outputFile.write(dumpOB8BottomBoilerplateHTML())
+		self.outputFile.flush()
+
+# reads every live source at once, writing each program with listenWriter as soon as its frame is complete
+# a source that cannot be opened or fails is reported without stopping the others; returns the number of good frames
+async def listenOB8Sources(sources, listenWriter, errorFile=stderr):
+	import asyncio
+	results = await asyncio.gather(*[source.listen(listenWriter, errorFile) for source in sources], return_exceptions=True)
+	frameCount = 0
+	for source, result in zip(sources, results):
+		if isinstance(result, Exception):
+			print('{}: {}'.format(source.name, result), file=errorFile)
+		else:
+			frameCount += result
+	return frameCount
@@ -0,0 +1,754 @@
+#
+# MIT License
+#
+# Copyright (c) 2022 Christian-E! / Ten by Ten Software
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+#
+# This module draws OB-8 programs as html panels, with a script, from compact data as they scroll
+# into view, or as static html
+#
+
+import base64
+import html
+import io
+from .programs import getOB8FieldSource, getOB8ProgramRecords, ob8ProgramKeys, ob8ProgramRecordSize, ob8ProgramSchema
+
+# dumps a JS Dictionay of the parameters
+def dumpOB8ProgramDictToJS(programDict):
+	dump = ['program = {']
+	for key in ob8ProgramKeys:
+		if key == 'programGroup':
+			dump.append('programGroup:\'{}\','.format(programDict['programGroup']))
+		else:
+			dump.append('{}:{},'.format(key, programDict[key]))
+	dump.append('}\n')
+	return ''.join(dump)
+
+# creates the styles of the program panels
+def dumpOB8StyleCSS():
+	dump = ''
+	dump += '	body {\n'
+	dump += '		background-color: black;\n'
+	dump += '		color: white;\n'
+	dump += '	}\n'
+	dump += '	table {\n'
+	dump += '		font-family: \'Handel Gothic\', \'Lucida Sans\', \'Lucida Sans Regular\', \'Lucida Grande\', \'Lucida Sans Unicode\', Geneva, Verdana, sans-serif;\n'
+	dump += '		padding: 0 1em;\n'
+	dump += '	}\n'
+	dump += '	.panel {\n'
+	dump += '		background-image: linear-gradient(#050570 1px, transparent 1px);\n'
+	dump += '		background-size: 100% 1em;\n'
+	dump += '	}\n'
+	dump += '	thead {\n'
+	dump += '		font-weight: bold;\n'
+	dump += '		font-size: larger;\n'
+	dump += '	}\n'
+	dump += '	h1 {\n'
+	dump += '		background-color: black;\n'
+	dump += '		font-family: \'Handel Gothic\', \'Lucida Sans\', \'Lucida Sans Regular\', \'Lucida Grande\', \'Lucida Sans Unicode\', Geneva, Verdana, sans-serif;\n'
+	dump += '		padding-left: 20px;\n'
+	dump += '	}\n'
+	dump += '	h2 {\n'
+	dump += '		background-color: black;\n'
+	dump += '		font-family: \'Handel Gothic\', \'Lucida Sans\', \'Lucida Sans Regular\', \'Lucida Grande\', \'Lucida Sans Unicode\', Geneva, Verdana, sans-serif;\n'
+	dump += '		padding: 0.5em 20px;\n'
+	dump += '		border: solid white 1px;\n'
+	dump += '	}\n'
+	dump += '	tr {\n'
+	dump += '		vertical-align: top;\n'
+	dump += '	}\n'
+	dump += '	td {\n'
+	dump += '		font-weight: light;\n'
+	dump += '		text-align: center;\n'
+	dump += '		padding: .5em .5em 0;\n'
+	dump += '		width: 10em;\n'
+	dump += '	}\n'
+	dump += '	.label polyline {\n'
+	dump += '		fill: none;\n'
+	dump += '		stroke: white;\n'
+	dump += '		stroke-width: 1\n'
+	dump += '	}\n'
+	dump += '	.page2label {\n'
+	dump += '		color:#66aaff;\n'
+	dump += '		font-weight:light;\n'
+	dump += '		font-size: small;\n'
+	dump += '	}\n'
+	dump += '	.button rect {\n'
+	dump += '		fill: black;\n'
+	dump += '		stroke: #050570;\n'
+	dump += '		stroke-width: 1\n'
+	dump += '	}\n'
+	dump += '	.knob circle {\n'
+	dump += '		fill: black;\n'
+	dump += '		stroke: #050570;\n'
+	dump += '		stroke-width: 1\n'
+	dump += '	}\n'
+	dump += '	.knob polygon {\n'
+	dump += '		fill: white;\n'
+	dump += '	}\n'
+	dump += '	.knob td {\n'
+	dump += '		padding: 0\n'
+	dump += '	}\n'
+	dump += '	.button td {\n'
+	dump += '		padding: 0\n'
+	dump += '	}\n'
+	return dump
+
+# creates the html head with the panel styles, followed by any extra styles, and opens the body
+def dumpOB8HeadHTML(extraCSS=''):
+	dump = '<!DOCTYPE html>\n'
+	dump += '<html>\n'
+	dump += '<head>\n'
+	dump += '<style>\n'
+	dump += dumpOB8StyleCSS()
+	dump += extraCSS
+	dump += '</style>\n'
+	dump += '</head>\n'
+	dump += '<body>\n'
+	return dump
+
+def dumpOB8TopBoilerplateHTML():
+	return dumpOB8HeadHTML() + '<script>\n' + dumpOB8RendererJS()
+
+# creates the script functions that draw a program panel
+def dumpOB8RendererJS():
+	dump = '	function makeTriangleSVG() {\n'
+	dump += '		return \'<svg class="label" height="1em" width="2em" viewBox="0 -1 20 12"><polyline <polyline points="0,10 10,0 20,10"/>/></svg>\'\n'
+	dump += '	}\n'
+	dump += '	function makeSquareSVG() {\n'
+	dump += '		return \'<svg class="label" height="1em" width="2em" viewBox="0 -1 20 12"><polyline points="0,10 0,0 10,0 10,10 20,10"/></svg>\'\n'
+	dump += '	}\n'
+	dump += '	function makeThreeWaveSVG() {\n'
+	dump += '		return \'<svg class="label" height="1em" width="8em" viewBox="10 -1 70 12">\\n'
+	dump += '								<polyline points="0,20 20,0, 20,20"/>\\n'
+	dump += '								<polyline points="30,10 40,0 50,10"/>\\n'
+	dump += '								<polyline points="60,10 60,0 70,0 70,10 80,10"/>\\n'
+	dump += '							</svg>\'\n'
+	dump += '	}\n'
+	dump += '	function makeTableCell(cellText, cellClass, doubleWide = false) {\n'
+	dump += '		var cell = document.createElement(\'td\');\n'
+	dump += '		cell.innerHTML = cellText;\n'
+	dump += '		cell.className = cellClass;\n'
+	dump += '		if (doubleWide) {\n'
+	dump += '			cell.colSpan = 2;\n'
+	dump += '		}\n'
+	dump += '		return cell;\n'
+	dump += '	}\n'
+	dump += '	function makeLabelCell(label, doubleWide = false) {\n'
+	dump += '		return makeTableCell(label, \'label\', doubleWide);\n'
+	dump += '	}\n'
+	dump += '	function makeLabelRow(columnArray, doubleWide = false) {\n'
+	dump += '		var row = document.createElement(\'tr\');\n'
+	dump += '		row.className = \'label\';\n'
+	dump += '		columnArray.forEach(label => {\n'
+	dump += '			row.appendChild(makeLabelCell(label, doubleWide));\n'
+	dump += '		});\n'
+	dump += '		return row;\n'
+	dump += '	}\n'
+	dump += '	function makeLabelRow2(columnArray, doubleWide = false) {\n'
+	dump += '		var row = document.createElement(\'tr\');\n'
+	dump += '		row.className = \'page2label\';\n'
+	dump += '		columnArray.forEach(label => {\n'
+	dump += '			row.appendChild(makeLabelCell(label, doubleWide));\n'
+	dump += '		});\n'
+	dump += '		return row;\n'
+	dump += '	}\n'
+	dump += '	function makeKnobCell(value, doubleWide) {\n'
+	dump += '		// rotation 0 points straight up, 180 points straight down\n'
+	dump += '		// values from 0-63 should be -145 to +145\n'
+	dump += '		rotationValue = value * 290 / 62 - 145;\n'
+	dump += '		var cell = document.createElement(\'td\');\n'
+	dump += '		cell.innerHTML = \'<svg class="knob" height="4em" width="4em" viewBox="-1 -1 32 32">\\n'
+	dump += '			<circle r="15" cx="15" cy="15"/>\\n'
+	dump += '			<circle r="7" cx="15" cy="15"/>\\n'
+	dump += '			<circle r="5" cx="15" cy="15"/>\\n'
+	dump += '			<polygon points="15,0 18,8 12,8" transform="rotate(\'\n'
+	dump += '			+ rotationValue +\n'
+	dump += '			\', 15, 15)"/></svg>\';\n'
+	dump += '		if (doubleWide) {\n'
+	dump += '			cell.colSpan = 2;\n'
+	dump += '		}\n'
+	dump += '		return cell;\n'
+	dump += '	}\n'
+	dump += '	function makeKnobRow(valueArray, doubleWide = false) {\n'
+	dump += '		var row = document.createElement(\'tr\');\n'
+	dump += '		row.className = \'knob\';\n'
+	dump += '		valueArray.forEach(value => {\n'
+	dump += '			if (value == null) {\n'
+	dump += '				row.appendChild(makeLabelCell(\'\', doubleWide));\n'
+	dump += '			}\n'
+	dump += '			else {\n'
+	dump += '				row.appendChild(makeKnobCell(value, doubleWide));\n'
+	dump += '			}\n'
+	dump += '		});\n'
+	dump += '		return row;\n'
+	dump += '	}\n'
+	dump += '	function makeButtonSVG(value) {\n'
+	dump += '		led = \'\';\n'
+	dump += '		if (value) {\n'
+	dump += '			led = \'<circle style="fill:red" r="4" cx="15" cy="8"/>\';\n'
+	dump += '		}\n'
+	dump += '		return \'<svg class="button" height="3em" width="3em" viewBox="-1 -1 32 32">\\n'
+	dump += '			<rect width="30" height="30"/>\\n'
+	dump += '			<rect x="2" y="14" width="26" height="14"/>\'\n'
+	dump += '			+ led + \'</svg>\';\n'
+	dump += '	}\n'
+	dump += '	function makeButtonCell(value) {\n'
+	dump += '		var cell = document.createElement(\'td\');\n'
+	dump += '		cell.innerHTML = makeButtonSVG(value);\n'
+	dump += '		return cell;\n'
+	dump += '	}\n'
+	dump += '	function makeButtonRow(columnArray) {\n'
+	dump += '		var row = document.createElement(\'tr\');\n'
+	dump += '		row.className = \'button\';\n'
+	dump += '		columnArray.forEach(value => {\n'
+	dump += '			if (value == null) {\n'
+	dump += '				row.appendChild(makeLabelCell(\'\'));\n'
+	dump += '			}\n'
+	dump += '			else if (value == 0 || value == 1) {\n'
+	dump += '				row.appendChild(makeButtonCell(value));\n'
+	dump += '			}\n'
+	dump += '			else if (Array.isArray(value)) {\n'
+	dump += '				var cell = document.createElement(\'td\');\n'
+	dump += '				if (value[0] == \'triangle\') {\n'
+	dump += '					cell.innerHTML = makeTriangleSVG() + makeButtonSVG(value[1]);\n'
+	dump += '				}\n'
+	dump += '				else if (value[0] == \'square\') {\n'
+	dump += '					cell.innerHTML = makeSquareSVG() + makeButtonSVG(value[1]);\n'
+	dump += '				}\n'
+	dump += '				else if (value[0] == \'s/h\') {\n'
+	dump += '					cell.innerHTML = \'S/H\' + makeButtonSVG(value[1]);\n'
+	dump += '				}\n'
+	dump += '				row.appendChild(cell);\n'
+	dump += '			}\n'
+	dump += '		});\n'
+	dump += '		return row;\n'
+	dump += '	}\n'
+	dump += '	function makeParameterGroupTable() {\n'
+	dump += '		return document.createElement(\'table\');\n'
+	dump += '	}\n'
+	dump += '	function makeMasterTable(program) {\n'
+	dump += '		var table = makeParameterGroupTable();\n'
+	dump += '		table.appendChild(makeLabelRow([\'MASTER<br/>VOLUME\', \'\', \'PROGRAM<br/>VOL/BAL\']));\n'
+	dump += '		table.appendChild(makeKnobRow([0, null, program.volume]));\n'
+	dump += '		table.appendChild(makeLabelRow([\'AUTO<br/>TUNE\', \'<br/>HOLD\', \'CHORD/<br/>PAGE&nbsp;2\']));\n'
+	dump += '		table.appendChild(makeButtonRow([0, 0, 0]));\n'
+	dump += '		table.appendChild(makeLabelRow([\'\', \'MASTER<br/>TUNE\', \'\']));\n'
+	dump += '		table.appendChild(makeKnobRow([null, 31, null]));\n'
+	dump += '		return table;\n'
+	dump += '	}\n'
+	dump += '	function makeControlTable(program) {\n'
+	dump += '		var table = makeParameterGroupTable();\n'
+	dump += '		table.appendChild(makeLabelRow([\'<br/>PORTAMENTO\']));\n'
+	dump += '		table.appendChild(makeKnobRow([program.portAmt]));\n'
+	dump += '		table.appendChild(makeLabelRow([\'<br/>UNISON\']));\n'
+	dump += '		table.appendChild(makeButtonRow([program.unison]));\n'
+	dump += '		table.appendChild(makeLabelRow([\'<br/>OSC&nbsp;2&nbsp;DETUNE\']));\n'
+	dump += '		table.appendChild(makeKnobRow([program.osc2Detune]));\n'
+	dump += '		return table;\n'
+	dump += '	}\n'
+	dump += '	function makeModulationTable(program) {\n'
+	dump += '		var table = makeParameterGroupTable();\n'
+	dump += '		table.appendChild(makeLabelRow([\'LFO<br/>RATE\', \'MODULATION<br/>DEPTH 1\', \'MODULATION<br/>DEPTH&nbsp;2\']));\n'
+	dump += '		table.appendChild(makeKnobRow([program.lfoFreq, program.fmAmnt, program.pwmAmnt]));\n'
+	dump += '		table.appendChild(makeLabelRow([\'WAVEFORM\', \'OSC&nbsp;1&nbsp;FRQ\', \'OSC&nbsp;1&nbsp;PWM\']));\n'
+	dump += '		table.appendChild(makeButtonRow([[\'triangle\', program.lfoWaveTri], program.osc1FM, program.osc1PWM]));\n'
+	dump += '		table.appendChild(makeLabelRow([\'\', \'OSC&nbsp;2&nbsp;FRQ\', \'OSC&nbsp;2&nbsp;PWM\']));\n'
+	dump += '		table.appendChild(makeButtonRow([[\'square\', program.lfoWaveSqr], program.osc2FM, program.osc2PWM]));\n'
+	dump += '		table.appendChild(makeLabelRow([\'\', \'FILTER&nbsp;FRQ\', \'VOLUME&nbsp;MOD\']));\n'
+	dump += '		table.appendChild(makeButtonRow([[\'s/h\', program.lfoWaveSnH], program.filterFM, program.vcaMod]));\n'
+	dump += '		return table;\n'
+	dump += '	}\n'
+	dump += '	function makeOscillatorsTable(program) {\n'
+	dump += '		var table = makeParameterGroupTable();\n'
+	dump += '		table.appendChild(makeLabelRow([\'OSC&nbsp;1<br/>FREQUENCY\', \'1&nbsp;AND&nbsp;2<br/>PULSE&nbsp;WIDTH\', \'OSC&nbsp;2<br/>FREQUENCY\'], true));\n'
+	dump += '		table.appendChild(makeKnobRow([program.vco1Freq, program.oscPWM, program.vco2Freq], true));\n'
+	dump += '		table.appendChild(makeLabelRow([\'WAVEFORM<br/>\' + makeThreeWaveSVG(), \'OSC&nbsp;2<br/>SYNC&nbsp;F-ENV\', \'WAVEFORM<br/>\' + makeThreeWaveSVG()], true));\n'
+	dump += '		table.appendChild(makeButtonRow([program.osc1WaveTri, program.osc1WaveSqr, program.sync, program.fEnv, program.osc2WaveTri, program.osc2WaveSqr]));\n'
+	dump += '		return table;\n'
+	dump += '	}\n'
+	dump += '	function makeFilterTable(program) {\n'
+	dump += '		var table = makeParameterGroupTable();\n'
+	dump += '		table.appendChild(makeLabelRow([\'<br/>FREQUENCY\', \'<br/>RESONANCE\', \'<br/>MODULATION\'], true));\n'
+	dump += '		table.appendChild(makeKnobRow([program.vcfFreq, program.vcfRes, program.vcfMod], true));\n'
+	dump += '		table.appendChild(makeLabelRow([\'OSC&nbsp;1<br/>ON\', \'OSC&nbsp;2<br/>HALF\', \'<br/>FULL\', \'NOISE<br/>ON\', \'<br/>4&nbsp;POLE\', \'KBD<br/>TRACK\']));\n'
+	dump += '		table.appendChild(makeButtonRow([program.osc1On, program.osc2Half, program.osc2On, program.noise, program.fourPole, program.kbdTrack]));\n'
+	dump += '		return table;\n'
+	dump += '	}\n'
+	dump += '	function makeEnvelopesTable(program) {\n'
+	dump += '		var table = makeParameterGroupTable();\n'
+	dump += '		table.appendChild(makeLabelRow([\'FILTER<br/>ATTACK\', \'<br/>DECAY\', \'<br/>SUSTAIN\', \'<br/>RELEASE\']));\n'
+	dump += '		table.appendChild(makeKnobRow([program.vcfAtk, program.vcfDcy, program.vcfSus, program.vcfRel]));\n'
+	dump += '		table.appendChild(makeLabelRow([\'VOLUME<br/>ATTACK\', \'<br/>DECAY\', \'<br/>SUSTAIN\', \'<br/>RELEASE\']));\n'
+	dump += '		table.appendChild(makeKnobRow([program.vcaAtk, program.vcaDcy, program.vcaSus, program.vcaRel]));\n'
+	dump += '		return table;\n'
+	dump += '	}\n'
+	dump += '	\n'
+	dump += '	function makeMasterTable2(program) {\n'
+	dump += '		var table = makeParameterGroupTable();\n'
+	dump += '		table.appendChild(makeLabelRow2([\'\', \'\', \'\']));\n'
+	dump += '		return table;\n'
+	dump += '	}\n'
+	dump += '	function makeControlTable2(program) {\n'
+	dump += '		var table = makeParameterGroupTable();\n'
+	dump += '		table.appendChild(makeButtonRow([program.portBend]));\n'
+	dump += '		table.appendChild(makeLabelRow2([\'PORTAMENTO<br/>BEND\']));\n'
+	dump += '		table.appendChild(makeKnobRow([program.voiceDetune]));\n'
+	dump += '		table.appendChild(makeLabelRow2([\'VOICE&nbsp;DETUNE\']));\n'
+	dump += '		return table;\n'
+	dump += '	}\n'
+	dump += '	function makeModulationTable2(program) {\n'
+	dump += '		var table = makeParameterGroupTable();\n'
+	dump += '		table.appendChild(makeButtonRow([[\'triangle\',  program.trigLfoWaveTri], program.fmQuant, program.pwmQuant]));\n'
+	dump += '		table.appendChild(makeLabelRow2([\'\', \'QUANTIZE&nbsp;1<br/>&nbsp;\', \'QUANTIZE&nbsp;2<br/>&nbsp;\']));\n'
+	dump += '		table.appendChild(makeButtonRow([[\'square\', program.trigLfoWaveSqr], program.fmDlyInvert, program.pwmDlyInvert]));\n'
+	dump += '		table.appendChild(makeLabelRow2([\'\', \'INVERT&nbsp;1<br/>&nbsp;\', \'INVERT&nbsp;2<br/>&nbsp;\']));\n'
+	dump += '		table.appendChild(makeButtonRow([[\'s/h\', program.trigLfoWaveSnH], program.lfoTrack, program.lfoRateDelay]));\n'
+	dump += '		table.appendChild(makeLabelRow2([\'TRIG<br/>WAVEVORM\', \'LFO&nbsp;TRACK\', \'LFO&nbsp;ENV&nbsp;MOD\']));\n'
+	dump += '		return table;\n'
+	dump += '	}\n'
+	dump += '	function makeOscillatorsTable2(program) {\n'
+	dump += '		var table = makeParameterGroupTable();\n'
+	dump += '		table.appendChild(makeButtonRow([program._90, program._180, program.vco1180, program.pw1180, program.portMatch, program.portQuant]));\n'
+	dump += '		table.appendChild(makeLabelRow2([\'90º\', \'180º\',\'FREQUENCY\',\'PULSE&nbsp;WIDTH\', \'MATCH\', \'QUANTIZE\']));\n'
+	dump += '		table.appendChild(makeLabelRow2([\'LFO&nbsp;PHASE\',\'OSC&nbsp;1&nbsp;LFO&nbsp;MOD&nbsp;INVERT\', \'PORTAMENTO\'],true));\n'
+	dump += '		return table;\n'
+	dump += '	}\n'
+	dump += '	function makeFilterTable2(program) {\n'
+	dump += '		var table = makeParameterGroupTable();\n'
+	dump += '		table.appendChild(makeButtonRow([program.legato, program.constPort, program.expoPort]));\n'
+	dump += '		table.appendChild(makeLabelRow2([\'LEGATO\', \'EQUAL&nbsp;TIME\', \'EXPONENTIAL\']));\n'
+	dump += '		table.appendChild(makeLabelRow2([\'-\',\'PORTAMENTO\',\'-\']));\n'
+	dump += '		return table;\n'
+	dump += '	}\n'
+	dump += '	function makeEnvelopesTable2(program) {\n'
+	dump += '		var table = makeParameterGroupTable();\n'
+	dump += '		table.appendChild(makeKnobRow([program.fmVibDelay, program.fmVibRaise, program.vcfSus, program.lfoTrigPoint]));\n'
+	dump += '		table.appendChild(makeLabelRow2([\'DELAY MOD 1\', \'ATTACK MOD 1\', \'\', \'LFO TRIG POINT\']));\n'
+	dump += '		table.appendChild(makeKnobRow([program.vcaAtk, program.pwmVibDelay, program.pwmVibRaise, program.pedalSustn]));\n'
+	dump += '		table.appendChild(makeLabelRow2([\'DELAY MOD 2\', \'ATTACK MOD 2\', \'\', \'PEDAL RELEASE\']));\n'
+	dump += '		return table;\n'
+	dump += '	}\n'
+	dump += '	function appendColumnWithTable(tableBodyRow, table) {\n'
+	dump += '		var tableBodyColumn = document.createElement(\'td\');\n'
+	dump += '		tableBodyColumn.appendChild(table);\n'
+	dump += '		tableBodyRow.appendChild(tableBodyColumn);\n'
+	dump += '	}\n'
+	dump += '	function appendProgramHeading(program, parent = document.body) {\n'
+	dump += '		var heading = document.createElement(\'h2\');\n'
+	dump += '		heading.innerHTML = \'Program \' + program.programGroup + \'-\' + program.programNumber + \' (\' + program.programIndex + \')\';\n'
+	dump += '		parent.appendChild(heading);\n'
+	dump += '	}\n'
+	dump += '	function appendProgramTable(program, parent = document.body) {\n'
+	dump += '		var programTable = document.createElement(\'table\');\n'
+	dump += '		programTable.className = \'panel\';\n'
+	dump += '		parent.appendChild(programTable);\n'
+	dump += '		var tableHead = document.createElement(\'thead\');\n'
+	dump += '		programTable.appendChild(tableHead);\n'
+	dump += '		tableHead.appendChild(makeTableCell("MASTER", "category"));\n'
+	dump += '		tableHead.appendChild(makeTableCell("CONTROL", "category"));\n'
+	dump += '		tableHead.appendChild(makeTableCell("MODULATION", "category"));\n'
+	dump += '		tableHead.appendChild(makeTableCell("OSCILLATORS", "category"));\n'
+	dump += '		tableHead.appendChild(makeTableCell("FILTER", "category"));\n'
+	dump += '		tableHead.appendChild(makeTableCell("ENVELOPES", "category"));\n'
+	dump += '		var tableBody = document.createElement(\'tbody\');\n'
+	dump += '		programTable.appendChild(tableBody);\n'
+	dump += '		var tableBodyRow = document.createElement(\'tr\');\n'
+	dump += '		tableBody.appendChild(tableBodyRow);\n'
+	dump += '		appendColumnWithTable(tableBodyRow, makeMasterTable(program));\n'
+	dump += '		appendColumnWithTable(tableBodyRow, makeControlTable(program));\n'
+	dump += '		appendColumnWithTable(tableBodyRow, makeModulationTable(program));\n'
+	dump += '		appendColumnWithTable(tableBodyRow, makeOscillatorsTable(program));\n'
+	dump += '		appendColumnWithTable(tableBodyRow, makeFilterTable(program));\n'
+	dump += '		appendColumnWithTable(tableBodyRow, makeEnvelopesTable(program));\n'
+	dump += '		var tableBodyRow = document.createElement(\'tr\');\n'
+	dump += '		tableBody.appendChild(tableBodyRow);\n'
+	dump += '		appendColumnWithTable(tableBodyRow, makeMasterTable2(program));\n'
+	dump += '		appendColumnWithTable(tableBodyRow, makeControlTable2(program));\n'
+	dump += '		appendColumnWithTable(tableBodyRow, makeModulationTable2(program));\n'
+	dump += '		appendColumnWithTable(tableBodyRow, makeOscillatorsTable2(program));\n'
+	dump += '		appendColumnWithTable(tableBodyRow, makeFilterTable2(program));\n'
+	dump += '		appendColumnWithTable(tableBodyRow, makeEnvelopesTable2(program));\n'
+	dump += '	}\n'
+	return dump
+
+def dumpOB8ProgramsHeaderHTML(fileReader):
+	dump = 'document.title = \'OB-8 Programs from {}\'\n'.format(fileReader.name)
+	dump += 'heading = document.createElement(\'h1\')\nheading.innerHTML=\'OB-8 Programs from {}\'\ndocument.body.appendChild(heading)\n'.format(fileReader.name)
+	return dump
+
+def dumpOB8ProgramHTML(programDict):
+	return dumpOB8ProgramDictToJS(programDict) + 'appendProgramHeading(program);\nappendProgramTable(program);\n'
+
+# writes the program information as html, one program at a time
+def writeOB8ProgramsHTML(outputFile, programsArray):
+	for programDict in programsArray:
+		outputFile.write(dumpOB8ProgramHTML(programDict))
+
+# writes the programs of parameter columns (as from getOB8ProgramColumns) as html, the same script that
+# writeOB8ProgramsHTML writes for their dicts, filled in one column at a time instead of one dict at a time
+def writeOB8ColumnsHTML(outputFile, columns):
+	from .columns import getOB8ColumnStrings, writeOB8ColumnRows
+	template = ['program = {']
+	for key in ob8ProgramKeys:
+		template.append('programGroup:\'%s\',' if key == 'programGroup' else key + ':%s,')
+	template.append('}\nappendProgramHeading(program);\nappendProgramTable(program);\n')
+	writeOB8ColumnRows(outputFile, ''.join(template), [getOB8ColumnStrings(columns[key]) for key in ob8ProgramKeys])
+
+# creates a string with the program information
+def dumpOB8ProgramsHTML(programsArray):
+	dump = io.StringIO()
+	writeOB8ProgramsHTML(dump, programsArray)
+	return dump.getvalue()
+
+# creates the script that decodes program records and draws each program only when it scrolls into view
+def dumpOB8LazyRendererHTML():
+	dump = ['	function decodeProgramRecord(record) {\n']
+	dump.append('		var program = {};\n')
+	dump.append('		var groupNum = (record[0] >> 3) + 1;\n')
+	dump.append('		program.programIndex = record[0] + 1;\n')
+	dump.append('		program.programGroup = (groupNum & 0x1 ? \'A\' : \'\') + (groupNum & 0x2 ? \'B\' : \'\') + (groupNum & 0x4 ? \'C\' : \'\') + (groupNum & 0x8 ? \'D\' : \'\');\n')
+	dump.append('		program.programNumber = record[0] % 8 + 1;\n')
+	# the same straight-line shifts and masks as getOB8ProgramFromRecord
+	for name, *parts in ob8ProgramSchema:
+		dump.append('		program.{} = {};\n'.format(name, getOB8FieldSource(parts, lambda byte: 'record[{}]'.format(byte+1))))
+	dump.append('		return program;\n')
+	dump.append('	}\n')
+	dump.append('	var programObserver = new IntersectionObserver(entries => {\n')
+	dump.append('		entries.forEach(entry => {\n')
+	dump.append('			if (entry.isIntersecting) {\n')
+	dump.append('				var placeholder = entry.target;\n')
+	dump.append('				programObserver.unobserve(placeholder);\n')
+	dump.append('				var program = decodeProgramRecord(placeholder.record);\n')
+	dump.append('				placeholder.record = null;\n')
+	dump.append('				appendProgramHeading(program, placeholder);\n')
+	dump.append('				appendProgramTable(program, placeholder);\n')
+	dump.append('				placeholder.style.minHeight = \'\';\n')
+	dump.append('			}\n')
+	dump.append('		});\n')
+	dump.append('	}, {rootMargin: \'2000px 0px\'});\n')
+	dump.append('	function addProgramRecords(recordsBase64) {\n')
+	dump.append('		var records = Uint8Array.from(atob(recordsBase64), c => c.charCodeAt(0));\n')
+	dump.append('		for (var i = 0; i + {0} <= records.length; i += {0}) {{\n'.format(ob8ProgramRecordSize))
+	dump.append('			var placeholder = document.createElement(\'div\');\n')
+	dump.append('			placeholder.style.minHeight = \'40em\';\n')
+	dump.append('			placeholder.record = records.subarray(i, i + {});\n'.format(ob8ProgramRecordSize))
+	dump.append('			document.body.appendChild(placeholder);\n')
+	dump.append('			programObserver.observe(placeholder);\n')
+	dump.append('		}\n')
+	dump.append('	}\n')
+	return ''.join(dump)
+
+# writes the programs as one compact block of base64 program records for the lazy renderer
+def writeOB8ProgramsLazyHTML(outputFile, programsArray):
+	records = getOB8ProgramRecords(programsArray)
+	if records:
+		outputFile.write('addProgramRecords(\'{}\');\n'.format(base64.b64encode(records).decode('ascii')))
+
+# writes the programs of parameter columns (as from getOB8ProgramColumns) for the lazy renderer, packed straight
+# from the columns into the records that writeOB8ProgramsLazyHTML writes
+def writeOB8ColumnsLazyHTML(outputFile, columns):
+	from .columns import getOB8RecordsFromColumns
+	records = getOB8RecordsFromColumns(columns).tobytes()
+	if records:
+		outputFile.write('addProgramRecords(\'{}\');\n'.format(base64.b64encode(records).decode('ascii')))
+
+# creates a string with the program information
+def dumpOB8BottomBoilerplateHTML():
+	dump = '</script></body></html>'
+	return dump
+
+# the rows of each column of the program panel, as drawn by the make*Table functions of the html script
+# a row is (kind, values, doubleWide) where kind is 'label', 'label2' (page 2), 'knob' or 'button'
+# a value is a label, a parameter name, a constant, None for an empty cell, or (wave, parameter name) for an LFO wave button
+ob8PanelColumns = (
+	# page 1
+	(('MASTER', (
+		('label', ('MASTER<br/>VOLUME', '', 'PROGRAM<br/>VOL/BAL'), False),
+		('knob', (0, None, 'volume'), False),
+		('label', ('AUTO<br/>TUNE', '<br/>HOLD', 'CHORD/<br/>PAGE&nbsp;2'), False),
+		('button', (0, 0, 0), False),
+		('label', ('', 'MASTER<br/>TUNE', ''), False),
+		('knob', (None, 31, None), False))),
+	('CONTROL', (
+		('label', ('<br/>PORTAMENTO',), False),
+		('knob', ('portAmt',), False),
+		('label', ('<br/>UNISON',), False),
+		('button', ('unison',), False),
+		('label', ('<br/>OSC&nbsp;2&nbsp;DETUNE',), False),
+		('knob', ('osc2Detune',), False))),
+	('MODULATION', (
+		('label', ('LFO<br/>RATE', 'MODULATION<br/>DEPTH 1', 'MODULATION<br/>DEPTH&nbsp;2'), False),
+		('knob', ('lfoFreq', 'fmAmnt', 'pwmAmnt'), False),
+		('label', ('WAVEFORM', 'OSC&nbsp;1&nbsp;FRQ', 'OSC&nbsp;1&nbsp;PWM'), False),
+		('button', (('triangle', 'lfoWaveTri'), 'osc1FM', 'osc1PWM'), False),
+		('label', ('', 'OSC&nbsp;2&nbsp;FRQ', 'OSC&nbsp;2&nbsp;PWM'), False),
+		('button', (('square', 'lfoWaveSqr'), 'osc2FM', 'osc2PWM'), False),
+		('label', ('', 'FILTER&nbsp;FRQ', 'VOLUME&nbsp;MOD'), False),
+		('button', (('s/h', 'lfoWaveSnH'), 'filterFM', 'vcaMod'), False))),
+	('OSCILLATORS', (
+		('label', ('OSC&nbsp;1<br/>FREQUENCY', '1&nbsp;AND&nbsp;2<br/>PULSE&nbsp;WIDTH', 'OSC&nbsp;2<br/>FREQUENCY'), True),
+		('knob', ('vco1Freq', 'oscPWM', 'vco2Freq'), True),
+		('label', ('WAVEFORM<br/><svg class="label" height="1em" width="8em"><use href="#threeWave"/></svg>', 'OSC&nbsp;2<br/>SYNC&nbsp;F-ENV', 'WAVEFORM<br/><svg class="label" height="1em" width="8em"><use href="#threeWave"/></svg>'), True),
+		('button', ('osc1WaveTri', 'osc1WaveSqr', 'sync', 'fEnv', 'osc2WaveTri', 'osc2WaveSqr'), False))),
+	('FILTER', (
+		('label', ('<br/>FREQUENCY', '<br/>RESONANCE', '<br/>MODULATION'), True),
+		('knob', ('vcfFreq', 'vcfRes', 'vcfMod'), True),
+		('label', ('OSC&nbsp;1<br/>ON', 'OSC&nbsp;2<br/>HALF', '<br/>FULL', 'NOISE<br/>ON', '<br/>4&nbsp;POLE', 'KBD<br/>TRACK'), False),
+		('button', ('osc1On', 'osc2Half', 'osc2On', 'noise', 'fourPole', 'kbdTrack'), False))),
+	('ENVELOPES', (
+		('label', ('FILTER<br/>ATTACK', '<br/>DECAY', '<br/>SUSTAIN', '<br/>RELEASE'), False),
+		('knob', ('vcfAtk', 'vcfDcy', 'vcfSus', 'vcfRel'), False),
+		('label', ('VOLUME<br/>ATTACK', '<br/>DECAY', '<br/>SUSTAIN', '<br/>RELEASE'), False),
+		('knob', ('vcaAtk', 'vcaDcy', 'vcaSus', 'vcaRel'), False)))),
+	# page 2
+	(('MASTER', (
+		('label2', ('', '', ''), False),)),
+	('CONTROL', (
+		('button', ('portBend',), False),
+		('label2', ('PORTAMENTO<br/>BEND',), False),
+		('knob', ('voiceDetune',), False),
+		('label2', ('VOICE&nbsp;DETUNE',), False))),
+	('MODULATION', (
+		('button', (('triangle', 'trigLfoWaveTri'), 'fmQuant', 'pwmQuant'), False),
+		('label2', ('', 'QUANTIZE&nbsp;1<br/>&nbsp;', 'QUANTIZE&nbsp;2<br/>&nbsp;'), False),
+		('button', (('square', 'trigLfoWaveSqr'), 'fmDlyInvert', 'pwmDlyInvert'), False),
+		('label2', ('', 'INVERT&nbsp;1<br/>&nbsp;', 'INVERT&nbsp;2<br/>&nbsp;'), False),
+		('button', (('s/h', 'trigLfoWaveSnH'), 'lfoTrack', 'lfoRateDelay'), False),
+		('label2', ('TRIG<br/>WAVEVORM', 'LFO&nbsp;TRACK', 'LFO&nbsp;ENV&nbsp;MOD'), False))),
+	('OSCILLATORS', (
+		('button', ('_90', '_180', 'vco1180', 'pw1180', 'portMatch', 'portQuant'), False),
+		('label2', ('90º', '180º', 'FREQUENCY', 'PULSE&nbsp;WIDTH', 'MATCH', 'QUANTIZE'), False),
+		('label2', ('LFO&nbsp;PHASE', 'OSC&nbsp;1&nbsp;LFO&nbsp;MOD&nbsp;INVERT', 'PORTAMENTO'), True))),
+	('FILTER', (
+		('button', ('legato', 'constPort', 'expoPort'), False),
+		('label2', ('LEGATO', 'EQUAL&nbsp;TIME', 'EXPONENTIAL'), False),
+		('label2', ('-', 'PORTAMENTO', '-'), False))),
+	('ENVELOPES', (
+		('knob', ('fmVibDelay', 'fmVibRaise', 'vcfSus', 'lfoTrigPoint'), False),
+		('label2', ('DELAY MOD 1', 'ATTACK MOD 1', '', 'LFO TRIG POINT'), False),
+		('knob', ('vcaAtk', 'pwmVibDelay', 'pwmVibRaise', 'pedalSustn'), False),
+		('label2', ('DELAY MOD 2', 'ATTACK MOD 2', '', 'PEDAL RELEASE'), False)))))
+
+# the size of the static panel in em: the width of a cell, the gap between the columns of the panel and
+# between its pages, and the height of each kind of row
+ob8StaticCellWidth = 5
+ob8StaticGap = 1
+ob8StaticRowHeights = {'category': 2, 'label': 2.2, 'label2': 1.8, 'knob': 4.5, 'button': 3.5}
+
+# the drawings of a knob pointing straight up and of a button off and on, in a 32 by 32 box
+ob8StaticKnobSVG = '<g fill="black" stroke="#050570"><circle r="15" cx="15" cy="15"/><circle r="7" cx="15" cy="15"/><circle r="5" cx="15" cy="15"/></g><polygon fill="white" points="15,0 18,8 12,8"/>'
+
+ob8StaticButtonSVGs = ['<g fill="black" stroke="#050570"><rect width="30" height="30"/><rect x="2" y="14" width="26" height="14"/></g>' + led for led in ('', '<circle fill="red" r="4" cx="15" cy="8"/>')]
+
+# lays the rows of ob8PanelColumns out on a grid measured in em, one column of the panel after the other and
+# page 2 below page 1, spreading the cells of each row evenly across its column
+# returns (width, height, items), where an item is (kind, x, y, value) with x the middle of a cell and y the top
+# of its row, and kind 'category' for the heading of a column
+def getOB8StaticPanelLayout():
+	categories = [category for category, rows in ob8PanelColumns[0]]
+	cells = [max(len(values)*(2 if doubleWide else 1) for page in ob8PanelColumns for kind, values, doubleWide in page[column][1]) for column in range(len(categories))]
+	lefts = []
+	left = ob8StaticGap/2
+	for count in cells:
+		lefts.append(left)
+		left += count*ob8StaticCellWidth + ob8StaticGap
+	width = left - ob8StaticGap/2
+
+	items = [('category', left + count*ob8StaticCellWidth/2, 0, category) for category, left, count in zip(categories, lefts, cells)]
+	top = ob8StaticRowHeights['category']
+	for columns in ob8PanelColumns:
+		bottom = top
+		for (category, rows), left, count in zip(columns, lefts, cells):
+			y = top
+			for kind, values, doubleWide in rows:
+				cellWidth = count*ob8StaticCellWidth/len(values)
+				items += [(kind, left + (i + 0.5)*cellWidth, y, value) for i, value in enumerate(values)]
+				y += ob8StaticRowHeights[kind]
+			bottom = max(bottom, y)
+		top = bottom + ob8StaticGap
+	return width, top, items
+
+# returns the rotation in degrees of a knob set to value
+def getOB8KnobRotation(value):
+	# rotation 0 points straight up, values from 0-63 should be -145 to +145
+	return value * 290 / 62 - 145
+
+# returns the top left corner of a knob or button drawn in the cell of a layout item
+# the button of an LFO wave moves right to make room for the wave
+def getOB8StaticControlCorner(kind, x, y, value):
+	if kind == 'knob':
+		return x - 2, y + 0.25
+	return x - (0.7 if isinstance(value, tuple) else 1.5), y + 0.25
+
+# creates the svg symbols of the static html: the knob, the button and the wave labels, and the panel itself with
+# every label, heading and fixed control, so that each program only adds its knobs and buttons
+def dumpOB8StaticSpritesHTML():
+	width, height, items = getOB8StaticPanelLayout()
+	dump = ['<svg style="display:none">\n']
+	dump.append('<symbol id="knob" viewBox="-1 -1 32 32">{}</symbol>\n'.format(ob8StaticKnobSVG))
+	dump.append('<symbol id="button" viewBox="-1 -1 32 32">{}</symbol>\n'.format(ob8StaticButtonSVGs[0]))
+	dump.append('<symbol id="triangle" viewBox="0 -1 20 12"><polyline fill="none" stroke="white" points="0,10 10,0 20,10"/></symbol>\n')
+	dump.append('<symbol id="square" viewBox="0 -1 20 12"><polyline fill="none" stroke="white" points="0,10 0,0 10,0 10,10 20,10"/></symbol>\n')
+	dump.append('<symbol id="threeWave" viewBox="10 -1 70 12"><g fill="none" stroke="white"><polyline points="0,20 20,0, 20,20"/><polyline points="30,10 40,0 50,10"/><polyline points="60,10 60,0 70,0 70,10 80,10"/></g></symbol>\n')
+	dump.append('<symbol id="panel" viewBox="0 0 {:g} {:g}"><g fill="white" text-anchor="middle">\n'.format(width, height))
+	for kind, x, y, value in items:
+		if kind == 'category':
+			dump.append('<text x="{:g}" y="{:g}" font-size="1.1" font-weight="bold">{}</text>\n'.format(x, y + 1.3, value))
+		elif kind in ('label', 'label2'):
+			fontSize, lineHeight, fill = (0.75, 0.9, 'white') if kind == 'label' else (0.6, 0.75, '#66aaff')
+			for line, text in enumerate(value.split('<br/>')):
+				top = y + 0.3 + line*lineHeight
+				if text.startswith('<svg'):
+					# a wave drawn in the label, as the script draws it
+					waveWidth = float(text.split('width="')[1].split('em')[0])
+					wave = text.split('href="#')[1].split('"')[0]
+					dump.append('<use href="#{}" x="{:g}" y="{:g}" width="{:g}" height="{:g}"/>\n'.format(wave, x - waveWidth/2, top, waveWidth, lineHeight))
+				elif text:
+					dump.append('<text x="{:g}" y="{:g}" font-size="{:g}" fill="{}">{}</text>\n'.format(x, top + fontSize, fontSize, fill, text))
+		elif isinstance(value, int):
+			left, top = getOB8StaticControlCorner(kind, x, y, value)
+			if kind == 'knob':
+				dump.append('<use href="#knob" x="{:g}" y="{:g}" width="4" height="4" transform="rotate({:g} {:g} {:g})"/>\n'.format(left, top, getOB8KnobRotation(value), left + 2, top + 2))
+			else:
+				dump.append('<use href="#button" x="{:g}" y="{:g}" width="3" height="3"/>\n'.format(left, top))
+		elif isinstance(value, tuple):
+			wave, name = value
+			if wave == 's/h':
+				dump.append('<text x="{:g}" y="{:g}" font-size="0.75">S/H</text>\n'.format(x - 1.6, y + 2))
+			else:
+				dump.append('<use href="#{}" x="{:g}" y="{:g}" width="1.6" height="1"/>\n'.format(wave, x - 2.4, y + 1.25))
+	dump.append('</g></symbol>\n')
+	dump.append('</svg>\n')
+	return ''.join(dump)
+
+# returns a drawing of ob8StaticKnobSVG or ob8StaticButtonSVGs as a data url for the styles of the static html
+def getOB8StaticDataURL(drawing):
+	from urllib.parse import quote
+	return 'data:image/svg+xml,' + quote('<svg xmlns="http://www.w3.org/2000/svg" viewBox="-1 -1 32 32">{}</svg>'.format(drawing))
+
+# creates the styles of the static panels: the size of a panel, the knob and button drawings, the 64 knob
+# rotations, and the position classes p0, p1, ... that put each knob and button of a program in its place
+def dumpOB8StaticStyleCSS():
+	width, height, items = getOB8StaticPanelLayout()
+	dump = ['	.panel {\n']
+	dump.append('		position: relative;\n')
+	dump.append('		width: {:g}em;\n'.format(width))
+	dump.append('		height: {:g}em;\n'.format(height))
+	dump.append('		font-family: \'Handel Gothic\', \'Lucida Sans\', \'Lucida Sans Regular\', \'Lucida Grande\', \'Lucida Sans Unicode\', Geneva, Verdana, sans-serif;\n')
+	dump.append('	}\n')
+	dump.append('	.panel svg {\n')
+	dump.append('		width: 100%;\n')
+	dump.append('		height: 100%;\n')
+	dump.append('	}\n')
+	dump.append('	.panel i, .panel b {\n')
+	dump.append('		position: absolute;\n')
+	dump.append('		background-size: 100% 100%;\n')
+	dump.append('	}\n')
+	dump.append('	.panel i {\n')
+	dump.append('		width: 4em;\n')
+	dump.append('		height: 4em;\n')
+	dump.append('		background-image: url("{}");\n'.format(getOB8StaticDataURL(ob8StaticKnobSVG)))
+	dump.append('	}\n')
+	dump.append('	.panel b {\n')
+	dump.append('		width: 3em;\n')
+	dump.append('		height: 3em;\n')
+	dump.append('		background-image: url("{}");\n'.format(getOB8StaticDataURL(ob8StaticButtonSVGs[0])))
+	dump.append('	}\n')
+	dump.append('	.panel b.on {\n')
+	dump.append('		background-image: url("{}");\n'.format(getOB8StaticDataURL(ob8StaticButtonSVGs[1])))
+	dump.append('	}\n')
+	for value in range(64):
+		dump.append('	.k{} {{ transform: rotate({:g}deg) }}\n'.format(value, getOB8KnobRotation(value)))
+	for position, (kind, x, y, value) in enumerate(getOB8StaticControls(items)):
+		left, top = getOB8StaticControlCorner(kind, x, y, value)
+		dump.append('	.p{} {{ left: {:g}em; top: {:g}em }}\n'.format(position, left, top))
+	return ''.join(dump)
+
+# returns the layout items of the knobs and buttons that every program sets, in layout order; the position class
+# of each is p followed by its number in this list
+def getOB8StaticControls(items):
+	return [(kind, x, y, value) for kind, x, y, value in items if kind in ('knob', 'button') and isinstance(value, (str, tuple))]
+
+# returns the markup of every value of the knob or button with position class p{position}, kept short because
+# every program repeats it
+def getOB8StaticControlCells(kind, position):
+	if kind == 'knob':
+		return ['<i class="p{} k{}"></i>'.format(position, value) for value in range(64)]
+	return ['<b class=p{}></b>'.format(position), '<b class="p{} on"></b>'.format(position)]
+
+# compiles the panel layout into a list of html strings and (cells, parameter name) pairs,
+# so that drawing a panel only looks up the markup of each knob and button
+def getOB8StaticPanelTemplate():
+	width, height, items = getOB8StaticPanelLayout()
+	template = ['<div class="panel"><svg><use href="#panel"/></svg>']
+	for position, (kind, x, y, value) in enumerate(getOB8StaticControls(items)):
+		name = value[1] if isinstance(value, tuple) else value
+		template.append((getOB8StaticControlCells(kind, position), name))
+	template.append('</div>\n')
+	return template
+
+# writes one program as a static html panel that needs no script
+def writeOB8ProgramStaticHTML(outputFile, programDict, template):
+	dump = ['<h2>Program {}-{} ({})</h2>\n'.format(programDict['programGroup'], programDict['programNumber'], programDict['programIndex'])]
+	for part in template:
+		if isinstance(part, str):
+			dump.append(part)
+		else:
+			cells, name = part
+			dump.append(cells[programDict[name]])
+	outputFile.write(''.join(dump))
+
+# writes the programs as static html panels, one program at a time
+def writeOB8ProgramsStaticHTML(outputFile, programsArray):
+	template = getOB8StaticPanelTemplate()
+	for programDict in programsArray:
+		writeOB8ProgramStaticHTML(outputFile, programDict, template)
+
+# writes the programs of parameter columns (as from getOB8ProgramColumns) as the static html panels that
+# writeOB8ProgramsStaticHTML writes for their dicts: each column is looked up in the markup of its knob or button at once
+def writeOB8ColumnsStaticHTML(outputFile, columns):
+	import numpy as np
+	from .columns import getOB8ColumnStrings, writeOB8ColumnRows
+	template = ['<h2>Program %s-%s (%s)</h2>\n']
+	fields = [getOB8ColumnStrings(columns[key]) for key in ('programGroup', 'programNumber', 'programIndex')]
+	for part in getOB8StaticPanelTemplate():
+		if isinstance(part, str):
+			template.append(part.replace('%', '%%'))
+		else:
+			cells, name = part
+			template.append('%s')
+			fields.append(np.array(cells, dtype=object)[np.asarray(columns[name])].tolist())
+	writeOB8ColumnRows(outputFile, ''.join(template), fields)
+
+# creates the static html heading of an input file
+def dumpOB8ProgramsHeaderStaticHTML(fileReader):
+	return '<h1>OB-8 Programs from {}</h1>\n'.format(html.escape(fileReader.name))
+
+# creates the start of a static html page: the head with the static panel styles and the shared svg symbols
+def dumpOB8StaticTopBoilerplateHTML():
+	return dumpOB8HeadHTML(dumpOB8StaticStyleCSS()) + dumpOB8StaticSpritesHTML()
+
+# creates the end of a static html page
+def dumpOB8StaticBottomBoilerplateHTML():
+	return '</body></html>'
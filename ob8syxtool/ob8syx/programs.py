@@ -0,0 +1,604 @@
+#
+# MIT License
+#
+# Copyright (c) 2022 Christian-E! / Ten by Ten Software
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+#
+# This module decodes and encodes Oberheim OB-8 programs: sysex frames, program records and program dicts
+#
+
+import itertools
+import os
+from sys import stderr
+
+# 
+def ledOnOff(val):
+	if val == 0:
+		return ' '
+	return '*'
+
+# gets the program group number ABCD
+def getOB8ProgramGroup(prog):
+
+	groupString = ''
+	groupNum = int(prog / 8) + 1
+	if groupNum & 0x1:
+		groupString += 'A'
+	if groupNum & 0x2:
+		groupString += 'B'
+	if groupNum & 0x4:
+		groupString += 'C'
+	if groupNum & 0x8:
+		groupString += 'D'
+	return groupString
+
+# gets the program number 1-8
+def getOB8ProgramNumber(prog):
+	return prog % 8 + 1
+
+# creates a string with the program information
+def getOB8Programs(buf):
+	programsArray = []
+	for i in range(int(len(buf)/60)):
+		programsArray.append(getOB8Program(buf, i*60))
+	return programsArray
+
+# every OB-8 program starts with this sysex header and ends with F7
+ob8SysexHeader = b'\xf0\x10\x01\x01'
+
+# finds the next OB-8 program frame in buf[pos:end]
+# returns (offset, nextPos, error) where error is None for a good frame, 'incomplete' when the
+# frame runs past end, or a description of a bad frame. offset is -1 when there is no header.
+# scanning resumes at nextPos. base is added to the byte numbers in errors, for a buf that starts base bytes into a stream
+def findOB8Frame(buf, pos, end, base=0):
+	offset = buf.find(ob8SysexHeader, pos, end)
+	if offset < 0:
+		# a header may be split across the end of buf
+		return -1, max(pos, end-3), None
+
+	# a status byte before byte 59 means the message was cut short
+	frameEnd = offset + 60
+	stop = buf.find(b'\xf7', offset+4, min(frameEnd, end))
+	start = buf.find(b'\xf0', offset+1, min(frameEnd-1, end))
+	if start >= 0 and (stop < 0 or start < stop):
+		return offset, start, 'truncated by F0 at byte {}'.format(base+start)
+	if stop >= 0 and stop < frameEnd-1:
+		return offset, stop+1, 'truncated by F7 at byte {}'.format(base+stop)
+	if frameEnd > end:
+		return offset, offset, 'incomplete'
+	if stop < 0:
+		return offset, offset+4, 'no F7 at byte {}'.format(base+frameEnd-1)
+	return offset, frameEnd, None
+
+# every byte that is not a status byte, for counting status bytes with translate
+ob8DataBytes = bytes(range(0x80))
+
+# MIDI realtime messages such as clock, start and stop, which may come between any two bytes, even inside sysex
+ob8RealtimeBytes = bytes(range(0xf8, 0x100))
+
+# number of frames checked at once by isOB8FrameRun
+ob8FrameRunLength = 64
+
+# returns True if buf[pos:end] is nothing but back-to-back good program frames
+# checks every frame at once with strided slices, which is much faster than findOB8Frame on clean files
+def isOB8FrameRun(buf, pos, end):
+	run = bytes(buf[pos:end])
+	count = int(len(run)/60)
+	return (run[0::60] == b'\xf0'*count
+		and run[1::60] == b'\x10'*count
+		and run[2::60] == b'\x01'*count
+		and run[3::60] == b'\x01'*count
+		and run[59::60] == b'\xf7'*count
+		and len(run.translate(None, ob8DataBytes)) == 2*count)
+
+# yields (offset, nextPos, error) for every OB-8 program frame in buf[pos:end] as findOB8Frame does,
+# except that a run of back-to-back good frames may come as one (offset, nextPos, None) spanning all of them
+# stops after a frame that is incomplete
+def scanOB8FrameRuns(buf, pos, end, base=0):
+	runLength = 60*ob8FrameRunLength
+	while True:
+		# fast path for runs of back-to-back good frames
+		if pos + runLength <= end and isOB8FrameRun(buf, pos, pos+runLength):
+			yield pos, pos+runLength, None
+			pos += runLength
+			continue
+		offset, pos, error = findOB8Frame(buf, pos, end, base)
+		if offset < 0:
+			return
+		yield offset, pos, error
+		if error == 'incomplete':
+			return
+
+# yields (offset, nextPos, error) for every OB-8 program frame in buf[pos:end] as findOB8Frame does,
+# stopping after a frame that is incomplete
+def scanOB8FrameRange(buf, pos, end, base=0):
+	for offset, nextPos, error in scanOB8FrameRuns(buf, pos, end, base):
+		if error or nextPos - offset == 60:
+			yield offset, nextPos, error
+		else:
+			for frameOffset in range(offset, nextPos, 60):
+				yield frameOffset, frameOffset+60, None
+
+# yields (offset, error) for every OB-8 program frame in buf, skipping anything between frames
+# error is None for a good frame
+def scanOB8Frames(buf):
+	for offset, nextPos, error in scanOB8FrameRange(buf, 0, len(buf)):
+		yield offset, error
+
+# incrementally decodes programs from chunks of a byte stream
+# partial programs are carried over until the rest of their bytes arrive,
+# and anything that is not an OB-8 program is skipped
+# with skipRealtime, MIDI realtime bytes are dropped from live streams before they are parsed, and offsets
+# count the bytes of the stream without them
+class OB8ProgramParser:
+
+	def __init__(self, skipRealtime=False):
+		# bytes left over from the previous chunk
+		self.pending = bytearray()
+		# stream offset of the first pending byte
+		self.position = 0
+		# (offset, error) for every bad frame found since the caller last cleared it
+		self.badFrames = []
+		self.frameCount = 0
+		self.skipRealtime = skipRealtime
+
+	# returns (offset, frame) for every good 60-byte program frame completed by chunk
+	def feedFrames(self, chunk):
+		framesArray = []
+		if self.skipRealtime:
+			chunk = chunk.translate(None, ob8RealtimeBytes)
+		self.pending += chunk
+		buf = self.pending
+		end = len(buf)
+		pos = 0
+		error = None
+		for offset, pos, error in scanOB8FrameRange(buf, 0, end, self.position):
+			if not error:
+				framesArray.append((self.position+offset, bytes(buf[offset:pos])))
+			elif error != 'incomplete':
+				self.badFrames.append((self.position+offset, error))
+		# keep an incomplete frame, or enough bytes for a header split across chunks
+		if error != 'incomplete':
+			pos = max(pos, end-3)
+		del buf[:pos]
+		self.position += pos
+		self.frameCount += len(framesArray)
+		return framesArray
+
+	# decodes every program completed by chunk and returns them as an array of dicts
+	def feed(self, chunk):
+		return [getOB8Program(frame, 0) for offset, frame in self.feedFrames(chunk)]
+
+	# reports a program left incomplete at the end of the stream as a bad frame
+	def close(self):
+		offset = self.pending.find(ob8SysexHeader)
+		if offset >= 0:
+			self.badFrames.append((self.position+offset, 'incomplete'))
+		self.position += len(self.pending)
+		self.pending = bytearray()
+
+# maps a file into memory so its frames can be decoded in place and the OS page cache does the I/O
+# returns b'' for an empty file, which cannot be mapped
+def mapOB8File(fileReader):
+	import mmap
+	if not os.fstat(fileReader.fileno()).st_size:
+		return b''
+	return mmap.mmap(fileReader.fileno(), 0, access=mmap.ACCESS_READ)
+
+# yields (offset, frame) for every good program frame in buf without copying, where frame is a memoryview into buf
+# bad frames are appended to badFrames as (offset, error)
+def iterOB8Frames(buf, badFrames=None):
+	view = memoryview(buf)
+	for offset, nextPos, error in scanOB8FrameRange(buf, 0, len(buf)):
+		if not error:
+			yield offset, view[offset:nextPos]
+		elif badFrames is not None:
+			badFrames.append((offset, error))
+
+# decodes program k (counting from 0) of an OB-8 sysex file or library store without decoding the rest of the file
+# a file that is nothing but back-to-back programs up to program k has it at byte k*60, anything else is scanned from the start
+# the frames before program k are checked ob8FrameRunLength at a time, so only one run of them is copied at once
+def getOB8ProgramAt(path, k):
+	from .store import OB8LibraryStore, ob8StoreMagic
+	with open(path, 'rb') as f:
+		buf = mapOB8File(f)
+	if buf[:len(ob8StoreMagic)] == ob8StoreMagic:
+		return OB8LibraryStore(buf, path)[k].toDict()
+	offset = k*60
+	runLength = 60*ob8FrameRunLength
+	if offset + 60 <= len(buf) and all(isOB8FrameRun(buf, pos, min(pos+runLength, offset+60)) for pos in range(0, offset+60, runLength)):
+		return getOB8Program(buf, offset)
+	for i, (offset, frame) in enumerate(iterOB8Frames(buf)):
+		if i == k:
+			return getOB8Program(frame, 0)
+	raise IndexError('{} has no program {}'.format(path, k))
+
+# reads chunks from a binary stream as soon as they are available
+def readOB8Chunks(fileReader, chunkSize=65536):
+	read = getattr(fileReader, 'read1', fileReader.read)
+	while True:
+		chunk = read(chunkSize)
+		if not chunk:
+			return
+		yield chunk
+
+# yields one program dict per complete 60-byte program in an iterable of byte chunks
+def iterOB8Programs(chunks):
+	parser = OB8ProgramParser()
+	for chunk in chunks:
+		yield from parser.feed(chunk)
+
+# lookup table of program group strings for every possible program index byte
+ob8ProgramGroups = [getOB8ProgramGroup(prog) for prog in range(256)]
+
+# the bit layout of every parameter, in the order getOB8Program adds them to a program dict after the program index,
+# group and number. A parameter is its name followed by its parts, each (parameter byte, shift, mask) of one of the
+# 27 parameter bytes; a value made of several parts has its first part in the highest bits
+# the decoders, encoders, exporters and renderers are all built from this table, so a parameter is added here only
+ob8ProgramSchema = (
+	('vcfRel', (0, 2, 0x3f)),
+	('vcaRel', (1, 2, 0x3f)),
+	('unison', (1, 0, 0x1)),
+	('lfoWave', (0, 0, 0x3), (1, 1, 0x1)),
+	('lfoWaveTri', (1, 1, 0x1)),
+	('lfoWaveSqr', (0, 0, 0x1)),
+	('lfoWaveSnH', (0, 1, 0x1)),
+	('vcfDcy', (2, 2, 0x3f)),
+	('filterFM', (2, 1, 0x1)),
+	('osc2FM', (2, 0, 0x1)),
+	('vcaDcy', (3, 2, 0x3f)),
+	('osc2Wave', (3, 0, 0x3)),
+	('osc2WaveTri', (3, 0, 0x1)),
+	('osc2WaveSqr', (3, 1, 0x1)),
+	('vcfAtk', (4, 2, 0x3f)),
+	('osc1Wave', (4, 0, 0x3)),
+	('osc1WaveTri', (4, 0, 0x1)),
+	('osc1WaveSqr', (4, 1, 0x1)),
+	('vcaAtk', (5, 2, 0x3f)),
+	('osc2PWM', (5, 1, 0x1)),
+	('osc1PWM', (5, 0, 0x1)),
+	('vcfSus', (6, 2, 0x3f)),
+	('noise', (6, 1, 0x1)),
+	('fourPole', (6, 0, 0x1)),
+	('vcaSus', (7, 2, 0x3f)),
+	('osc2On', (7, 1, 0x1)),
+	('osc2Half', (7, 0, 0x1)),
+	('vcfMod', (8, 2, 0x3f)),
+	('osc1On', (8, 1, 0x1)),
+	('kbdTrack', (8, 0, 0x1)),
+	('vcfRes', (9, 2, 0x3f)),
+	('pw1180', (9, 1, 0x1)),
+	('vco1180', (9, 0, 0x1)),
+	('oscPWM', (10, 2, 0x3f)),
+	('vcaMod', (10, 1, 0x1)),
+	('fEnv', (10, 0, 0x1)),
+	('lfoFreq', (11, 2, 0x3f)),
+	('sync', (11, 1, 0x1)),
+	('osc1FM', (11, 0, 0x1)),
+	('fmAmnt', (12, 2, 0x3f)),
+	('pwmAmnt', (13, 2, 0x3f)),
+	('portAmt', (14, 2, 0x3f)),
+	('volume', (12, 0, 0x3), (13, 0, 0x3), (14, 0, 0x3)),
+	('osc2Detune', (15, 2, 0x3f)),
+	('vcfFreq', (16, 2, 0x3f)),
+	('vco2Freq', (17, 2, 0x3f)),
+	('vco2PW', (15, 0, 0x3), (16, 0, 0x3), (17, 0, 0x3)),
+	('vco1Freq', (18, 2, 0x3f)),
+	('spare', (18, 1, 0x1)),
+	('legato', (18, 0, 0x1)),
+	('lfoTrigPoint', (19, 2, 0x3f)),
+	('trigLfoWave', (19, 0, 0x3), (20, 1, 0x1)),
+	('pedalSustn', (20, 2, 0x3f)),
+	('portBend', (20, 0, 0x1)),
+	('trigLfoWaveTri', (20, 1, 0x1)),
+	('trigLfoWaveSqr', (19, 0, 0x1)),
+	('trigLfoWaveSnH', (19, 1, 0x1)),
+	('fmVibRaise', (21, 2, 0x3f)),
+	('lfoTrack', (21, 1, 0x1)),
+	('fmDlyInvert', (21, 0, 0x1)),
+	('pwmVibRaise', (22, 2, 0x3f)),
+	('portQuant', (22, 1, 0x1)),
+	('portMatch', (22, 0, 0x1)),
+	('fmVibDelay', (23, 2, 0x3f)),
+	('_180', (23, 1, 0x1)),
+	('_90', (23, 0, 0x1)),
+	('pwmVibDelay', (24, 2, 0x3f)),
+	('pwmDlyInvert', (24, 1, 0x1)),
+	('pwmQuant', (24, 0, 0x1)),
+	('voiceDetune', (25, 2, 0x3f)),
+	('expoPort', (25, 1, 0x1)),
+	('constPort', (25, 0, 0x1)),
+	('bendAmount', (26, 2, 0x3f)),
+	('lfoRateDelay', (26, 1, 0x1)),
+	('fmQuant', (26, 0, 0x1)))
+
+# parameter names in the order getOB8Program adds them to a program dict
+ob8ProgramKeys = ('programIndex', 'programGroup', 'programNumber') + tuple(name for name, *parts in ob8ProgramSchema)
+
+# (name, parameter byte, shift, mask) of every parameter that lives in a single parameter byte
+ob8ProgramFields = tuple((name,) + parts[0] for name, *parts in ob8ProgramSchema if len(parts) == 1)
+
+# returns the source of an expression that puts the parts of a parameter together, for the generated decoders
+# byteSource(byte) returns the source of a parameter byte. The operators are left to right in every group of
+# parentheses, so the expression means the same in Python and JavaScript as in SQLite, where they have equal precedence
+def getOB8FieldSource(parts, byteSource):
+	source = ''
+	for byte, shift, mask in parts:
+		value = '({} >> {} & {})'.format(byteSource(byte), shift, mask) if shift else '({} & {})'.format(byteSource(byte), mask)
+		source = '({} << {} | {})'.format(source, mask.bit_length(), value) if source else value
+	return source
+
+# puts the parts of a parameter together from parameterBytes, the 27 parameter bytes of a program or 27 columns of them
+def getOB8FieldValue(parts, parameterBytes):
+	value = None
+	for byte, shift, mask in parts:
+		part = (parameterBytes[byte] >> shift if shift else parameterBytes[byte]) & mask
+		value = part if value is None else (value << mask.bit_length()) | part
+	return value
+
+# returns the parameters of ob8ProgramSchema that getOB8ParameterBytes packs back into the parameter bytes: a parameter
+# with bits that an earlier one already holds, like the Tri/Sqr/SnH views of the waves, is left out
+def getOB8PackedFields():
+	packedFields = []
+	packedBits = set()
+	for name, *parts in ob8ProgramSchema:
+		bits = {(byte, shift+bit) for byte, shift, mask in parts for bit in range(mask.bit_length())}
+		if not bits & packedBits:
+			packedFields.append((name,) + tuple(parts))
+			packedBits |= bits
+	return tuple(packedFields)
+
+# (name, parts) of the parameters packed back into the parameter bytes by getOB8ParameterBytes, as in ob8ProgramSchema
+ob8ProgramPackedFields = getOB8PackedFields()
+
+# keeps the high nibbles of the nibble pairs of a frame's parameters read as one little-endian integer
+ob8HighNibbleMask = int.from_bytes(b'\xf0\x00'*27, 'little')
+
+# returns the source of the functions generated from ob8ProgramSchema, which work with straight-line shifts and masks:
+# getOB8Program and getOB8ProgramFromRecord decode a frame or a record into a dict with one dict display, and
+# getOB8ParameterBytes packs a dict back into its parameter bytes. getOB8Program reads the 54 nibbles of a frame
+# as one integer and folds every high nibble onto the low nibble below it, which puts parameter byte n at byte 2n
+def getOB8SchemaSource():
+	programKeys = "'programIndex': i+1, 'programGroup': ob8ProgramGroups[i], 'programNumber': i % 8 + 1"
+	frameFields = ', '.join("'{}': {}".format(name, getOB8FieldSource(parts, lambda byte: 'd[{}]'.format(byte*2))) for name, *parts in ob8ProgramSchema)
+	recordFields = ', '.join("'{}': {}".format(name, getOB8FieldSource(parts, lambda byte: 'r[{}]'.format(byte+1))) for name, *parts in ob8ProgramSchema)
+	parameterBytes = [[] for byte in range(27)]
+	for name, *parts in ob8ProgramPackedFields:
+		lowBits = 0
+		for byte, shift, mask in reversed(parts):
+			value = "(p['{}'] >> {} & {})".format(name, lowBits, mask) if lowBits else "(p['{}'] & {})".format(name, mask)
+			parameterBytes[byte].append('{} << {}'.format(value, shift) if shift else value)
+			lowBits += mask.bit_length()
+	return ('def getOB8Program(buf, offset):\n'
+		'\tn = int.from_bytes(buf[offset+5:offset+59], \'little\')\n'
+		'\td = (n | ((n >> 4) & ob8HighNibbleMask)).to_bytes(54, \'little\')\n'
+		'\ti = buf[offset+4]\n'
+		'\treturn {{{}, {}}}\n'
+		'def getOB8ProgramFromRecord(r):\n'
+		'\ti = r[0]\n'
+		'\treturn {{{}, {}}}\n'
+		'def getOB8ParameterBytes(p):\n'
+		'\treturn [{}]\n').format(programKeys, frameFields, programKeys, recordFields, ', '.join(' | '.join(values) or '0' for values in parameterBytes))
+
+# compiles the functions of getOB8SchemaSource
+def compileOB8Schema():
+	namespace = {'ob8ProgramGroups': ob8ProgramGroups, 'ob8HighNibbleMask': ob8HighNibbleMask}
+	exec(compile(getOB8SchemaSource(), '<ob8ProgramSchema>', 'exec'), namespace)
+	return namespace['getOB8Program'], namespace['getOB8ProgramFromRecord'], namespace['getOB8ParameterBytes']
+
+# getOB8Program(buf, offset) decodes the 60-byte program that starts at offset in buf into a dict,
+# getOB8ProgramFromRecord(record) decodes a 28-byte program record into the same dict, and
+# getOB8ParameterBytes(programDict) packs the parameters of a program dict back into its 27 parameter bytes;
+# it works on parameter columns as well, packing a whole bank at once
+getOB8Program, getOB8ProgramFromRecord, getOB8ParameterBytes = compileOB8Schema()
+
+# size of a program record: the program index byte followed by the 27 parameter bytes
+ob8ProgramRecordSize = 28
+
+# combines the nibble pairs of the 60-byte program frame at offset into a program record, as getOB8Program does
+def getOB8ProgramRecord(buf, offset=0):
+	n = int.from_bytes(buf[offset+5:offset+59], 'little')
+	return bytes((buf[offset+4],)) + (n | ((n >> 4) & ob8HighNibbleMask)).to_bytes(54, 'little')[::2]
+
+# returns a property that extracts a parameter of ob8ProgramSchema from the parameter bytes of a record
+def makeOB8ProgramField(parts):
+	if len(parts) == 1:
+		(byte, shift, mask), = parts
+		byte += 1
+		return property(lambda self: (self.record[byte] >> shift) & mask)
+	return property(eval('lambda self: ' + getOB8FieldSource(parts, lambda byte: 'self.record[{}]'.format(byte+1))))
+
+# a single OB-8 program, stored as its 28-byte record
+# every parameter is computed when it is read, and program['name'] works like a program dict
+class OB8Program:
+
+	__slots__ = ('record',)
+
+	def __init__(self, record):
+		self.record = bytes(record)
+
+	# makes a program from the 60-byte program frame at offset in buf
+	@classmethod
+	def fromFrame(cls, buf, offset=0):
+		return cls(getOB8ProgramRecord(buf, offset))
+
+	@property
+	def programIndex(self):
+		return self.record[0]+1
+
+	@property
+	def programGroup(self):
+		return ob8ProgramGroups[self.record[0]]
+
+	@property
+	def programNumber(self):
+		return getOB8ProgramNumber(self.record[0])
+
+	def __getitem__(self, key):
+		if key not in ob8ProgramKeySet:
+			raise KeyError(key)
+		return getattr(self, key)
+
+	def __contains__(self, key):
+		return key in ob8ProgramKeySet
+
+	def __iter__(self):
+		return iter(ob8ProgramKeys)
+
+	def __len__(self):
+		return len(ob8ProgramKeys)
+
+	def __eq__(self, other):
+		if isinstance(other, OB8Program):
+			return self.record == other.record
+		return NotImplemented
+
+	def __hash__(self):
+		return hash(self.record)
+
+	def __repr__(self):
+		return 'OB8Program({}-{})'.format(self.programGroup, self.programNumber)
+
+	def keys(self):
+		return ob8ProgramKeys
+
+	# returns the same dict as getOB8Program
+	def toDict(self):
+		return getOB8ProgramFromRecord(self.record)
+
+for name, *parts in ob8ProgramSchema:
+	setattr(OB8Program, name, makeOB8ProgramField(parts))
+
+ob8ProgramKeySet = frozenset(ob8ProgramKeys)
+
+# many OB-8 programs stored back to back as 28-byte records in one buffer
+class OB8ProgramBank:
+
+	__slots__ = ('records',)
+
+	def __init__(self, records=b''):
+		self.records = bytearray(records)
+
+	# makes a bank of every good program frame in buf
+	@classmethod
+	def fromBuffer(cls, buf, badFrames=None):
+		bank = cls()
+		for offset, frame in iterOB8Frames(buf, badFrames):
+			bank.appendFrame(frame)
+		return bank
+
+	def __len__(self):
+		return int(len(self.records)/ob8ProgramRecordSize)
+
+	def __getitem__(self, i):
+		if i < 0:
+			i += len(self)
+		if i < 0 or i >= len(self):
+			raise IndexError('program bank index out of range')
+		start = i*ob8ProgramRecordSize
+		return OB8Program(self.records[start:start+ob8ProgramRecordSize])
+
+	def __iter__(self):
+		records = self.records
+		for start in range(0, len(records), ob8ProgramRecordSize):
+			yield OB8Program(records[start:start+ob8ProgramRecordSize])
+
+	def append(self, program):
+		self.records += program.record
+
+	# appends the 60-byte program frame at offset in buf
+	def appendFrame(self, buf, offset=0):
+		self.records += getOB8ProgramRecord(buf, offset)
+
+# packs the parameters of a program dict back into a 28-byte program record, the inverse of getOB8Program
+def getOB8ProgramRecordFromDict(programDict):
+	return bytes([(programDict['programIndex']-1) & 0x7f] + getOB8ParameterBytes(programDict))
+
+# translate tables that split a byte into its low and high nibbles
+ob8LowNibbles = bytes(b & 0xf for b in range(256))
+
+ob8HighNibbles = bytes(b >> 4 for b in range(256))
+
+# turns a buffer of 28-byte program records into 60-byte program frames
+# works a parameter byte at a time across all of the records, so it is fast for whole banks
+def getOB8FramesFromRecords(records):
+	count = int(len(records)/ob8ProgramRecordSize)
+	records = bytes(records[:count*ob8ProgramRecordSize])
+	frames = bytearray(count*60)
+	for i in range(4):
+		frames[i::60] = ob8SysexHeader[i:i+1]*count
+	frames[4::60] = records[0::ob8ProgramRecordSize]
+	for byte in range(27):
+		d = records[byte+1::ob8ProgramRecordSize]
+		frames[5+byte*2::60] = d.translate(ob8LowNibbles)
+		frames[6+byte*2::60] = d.translate(ob8HighNibbles)
+	frames[59::60] = b'\xf7'*count
+	return bytes(frames)
+
+# returns the 60-byte program frame of an OB8Program or program dict
+def getOB8ProgramFrame(program):
+	if isinstance(program, OB8Program):
+		return getOB8FramesFromRecords(program.record)
+	return getOB8FramesFromRecords(getOB8ProgramRecordFromDict(program))
+
+# returns the 28-byte program records of an array of OB8Programs or program dicts back to back
+def getOB8ProgramRecords(programsArray):
+	if isinstance(programsArray, OB8ProgramBank):
+		return bytes(programsArray.records)
+	return b''.join(program.record if isinstance(program, OB8Program) else getOB8ProgramRecordFromDict(program) for program in programsArray)
+
+# writes OB8Programs, program dicts or an OB8ProgramBank to a binary file as a bank of sysex programs
+def writeOB8Programs(fileWriter, programsArray, batchSize=4096):
+	if isinstance(programsArray, OB8ProgramBank):
+		records = programsArray.records
+		step = batchSize*ob8ProgramRecordSize
+		for start in range(0, len(records), step):
+			fileWriter.write(getOB8FramesFromRecords(records[start:start+step]))
+		return
+
+	programs = iter(programsArray)
+	while True:
+		batch = list(itertools.islice(programs, batchSize))
+		if not batch:
+			return
+		fileWriter.write(getOB8FramesFromRecords(getOB8ProgramRecords(batch)))
+
+# returns the content hash of a program record, which ignores the program index (slot) byte
+def getOB8ProgramHash(record):
+	import hashlib
+	return hashlib.sha1(bytes(record[1:ob8ProgramRecordSize])).hexdigest()
+
+# the knob parameters (0-63) compared by distance in findOB8SimilarPrograms
+ob8KnobKeys = tuple(name for name, byte, shift, mask in ob8ProgramFields if mask == 0x3f) + ('volume', 'vco2PW')
+
+# the switch parameters compared by Hamming distance in findOB8SimilarPrograms
+ob8SwitchKeys = tuple(name for name, byte, shift, mask in ob8ProgramFields if mask == 0x1 and name != 'spare')
+
+# prints the bad frames found in an input file
+# counts them in fileStats when it is given
+def printOB8BadFrames(fileReader, badFrames, errorFile=stderr, fileStats=None):
+	if fileStats is not None:
+		fileStats['badFrames'] += len(badFrames)
+	for offset, error in badFrames:
+		print('{}: bad OB-8 program at byte {}: {}'.format(fileReader.name, offset, error), file=errorFile)
+	badFrames.clear()
@@ -0,0 +1,306 @@
+#
+# MIT License
+#
+# Copyright (c) 2022 Christian-E! / Ten by Ten Software
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+#
+# This module writes OB-8 programs as a site of html pages
+#
+
+import base64
+import hashlib
+import html
+import io
+import os
+from sys import stderr
+from .programs import OB8Program, getOB8ProgramRecord, iterOB8Frames, ob8ProgramGroups, ob8ProgramRecordSize, printOB8BadFrames
+from .panels import dumpOB8LazyRendererHTML, dumpOB8RendererJS, dumpOB8StyleCSS
+
+# the file in a site directory that records which input files its pages were made from
+ob8SiteManifest = 'site.json'
+
+# the program groups in panel order
+ob8SiteGroups = list(dict.fromkeys(ob8ProgramGroups))
+
+# returns the page name of an input file in a site: its name plus a short hash of its path, so files with the same name do not collide
+def getOB8SitePageName(path):
+	stem = ''.join(c if c.isalnum() or c in '-_' else '_' for c in os.path.splitext(os.path.basename(path))[0])
+	return '{}-{}.html'.format(stem, hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:8])
+
+# returns the page name of a program group in a site
+def getOB8SiteGroupPageName(group):
+	return 'group-{}.html'.format(group)
+
+# creates the styles shared by every page of a site
+def dumpOB8SiteCSS():
+	dump = dumpOB8StyleCSS()
+	dump += '	a {\n'
+	dump += '		color: #66aaff;\n'
+	dump += '	}\n'
+	dump += '	.index td {\n'
+	dump += '		width: auto;\n'
+	dump += '		text-align: left;\n'
+	dump += '		padding: 0 .5em;\n'
+	dump += '	}\n'
+	return dump
+
+# creates the script shared by every page of a site: the panel renderer, the lazy renderer and the index search
+def dumpOB8SiteJS():
+	dump = dumpOB8RendererJS()
+	dump += dumpOB8LazyRendererHTML()
+	dump += '	function filterProgramRows(query) {\n'
+	dump += '		var words = query.toLowerCase().split(/\\s+/).filter(word => word);\n'
+	dump += '		document.querySelectorAll(\'#programRows tr\').forEach(row => {\n'
+	dump += '			var text = row.textContent.toLowerCase();\n'
+	dump += '			row.style.display = words.every(word => text.includes(word)) ? \'\' : \'none\';\n'
+	dump += '		});\n'
+	dump += '	}\n'
+	return dump
+
+# creates the start of a site page, which links the shared styles and script instead of inlining them
+def dumpOB8SiteHeadHTML(title):
+	dump = '<!DOCTYPE html>\n'
+	dump += '<html>\n'
+	dump += '<head>\n'
+	dump += '<meta charset="utf-8">\n'
+	dump += '<title>{}</title>\n'.format(html.escape(title))
+	dump += '<link rel="stylesheet" href="ob8.css">\n'
+	dump += '<script src="ob8.js"></script>\n'
+	dump += '</head>\n'
+	dump += '<body>\n'
+	dump += '<p><a href="index.html">All programs</a></p>\n'
+	dump += '<h1>{}</h1>\n'.format(html.escape(title))
+	return dump
+
+# creates the script block that adds program records to a site page
+def dumpOB8SiteRecordsHTML(records):
+	return '<script>addProgramRecords(\'{}\');</script>\n'.format(base64.b64encode(records).decode('ascii'))
+
+# writes a site page only if its content changed, and returns whether it did
+def writeOB8SiteFile(path, dump):
+	try:
+		with open(path, encoding='utf-8') as f:
+			if f.read() == dump:
+				return False
+	except OSError:
+		pass
+	with open(path, 'w', encoding='utf-8') as f:
+		f.write(dump)
+	return True
+
+# writes the site page of one input file
+def writeOB8SiteFilePage(pagePath, path, records):
+	with open(pagePath, 'w', encoding='utf-8') as f:
+		f.write(dumpOB8SiteHeadHTML('OB-8 Programs from {}'.format(path)))
+		if records:
+			f.write(dumpOB8SiteRecordsHTML(records))
+		f.write('</body></html>')
+
+# returns the records of records that belong to a program group
+def getOB8GroupRecords(records, group):
+	return b''.join(records[i:i+ob8ProgramRecordSize] for i in range(0, len(records), ob8ProgramRecordSize) if ob8ProgramGroups[records[i]] == group)
+
+# writes the site page of one program group, with the programs of that group from every input file
+# fileRecords holds (path, records) pairs
+def writeOB8SiteGroupPage(pagePath, group, fileRecords):
+	with open(pagePath, 'w', encoding='utf-8') as f:
+		f.write(dumpOB8SiteHeadHTML('OB-8 Programs in Group {}'.format(group)))
+		for path, records in fileRecords:
+			groupRecords = getOB8GroupRecords(records, group)
+			if groupRecords:
+				f.write('<h2>From {}</h2>\n'.format(html.escape(path)))
+				f.write(dumpOB8SiteRecordsHTML(groupRecords))
+		f.write('</body></html>')
+
+# returns a short description of how a program sounds, for the site index
+def getOB8ProgramSummary(program):
+	def waves(tri, sqr):
+		return '+'.join(name for name, on in (('tri', tri), ('sqr', sqr)) if on) or 'off'
+	summary = ['osc1 ' + (waves(program['osc1WaveTri'], program['osc1WaveSqr']) if program['osc1On'] else 'off')]
+	summary.append('osc2 ' + (waves(program['osc2WaveTri'], program['osc2WaveSqr']) if program['osc2On'] or program['osc2Half'] else 'off'))
+	summary += [name for key, name in (('sync', 'sync'), ('noise', 'noise'), ('unison', 'unison')) if program[key]]
+	summary.append('{}-pole cutoff {} res {}'.format(4 if program['fourPole'] else 2, program['vcfFreq'], program['vcfRes']))
+	summary.append('env {}/{}/{}/{}'.format(program['vcaAtk'], program['vcaDcy'], program['vcaSus'], program['vcaRel']))
+	return ', '.join(summary)
+
+# creates the site index page, with a row for every program that the search box filters
+# fileRecords holds (path, page, records) triples, where page is None to link each program to its group page
+def dumpOB8SiteIndexHTML(fileRecords):
+	dump = [dumpOB8SiteHeadHTML('OB-8 Programs')]
+	dump.append('<p><input type="search" placeholder="Search" oninput="filterProgramRows(this.value)"></p>\n')
+	dump.append('<table class="index"><tbody id="programRows">\n')
+	for path, page, records in fileRecords:
+		for i in range(0, len(records), ob8ProgramRecordSize):
+			program = OB8Program(records[i:i+ob8ProgramRecordSize])
+			dump.append('<tr><td><a href="{}">{}</a></td><td>{}-{} ({})</td><td>{}</td></tr>\n'.format(
+				html.escape(page or getOB8SiteGroupPageName(program.programGroup)), html.escape(path),
+				program.programGroup, program.programNumber, program.programIndex, getOB8ProgramSummary(program)))
+	dump.append('</tbody></table>\n')
+	dump.append('</body></html>')
+	return ''.join(dump)
+
+# returns the name of the file in a site that keeps the program records of an input file, beside its page
+def getOB8SiteRecordsName(path):
+	return os.path.splitext(getOB8SitePageName(path))[0] + '.records'
+
+# removes the pages of a site in the page mode its manifest records, the page of every input file it lists or every
+# group page, and the records of every input file it lists
+def removeOB8SitePages(siteDir, manifest):
+	entries = manifest.get('files', {}).values()
+	pageNames = [entry['recordsFile'] for entry in entries if 'recordsFile' in entry]
+	if manifest.get('pages') == 'file':
+		pageNames += [entry['page'] for entry in entries]
+	elif manifest.get('pages') == 'group':
+		pageNames += [getOB8SiteGroupPageName(group) for group in ob8SiteGroups]
+	for pageName in pageNames:
+		pagePath = os.path.join(siteDir, pageName)
+		if os.path.isfile(pagePath):
+			os.remove(pagePath)
+
+# returns the program records kept in a site for an input file's manifest entry, or b'' if there are none
+def readOB8SiteRecords(siteDir, entry):
+	try:
+		with open(os.path.join(siteDir, entry['recordsFile']), 'rb') as f:
+			return f.read()
+	except (KeyError, OSError):
+		return b''
+
+# process pool worker for --site: decodes one input file and writes its page if pagePath is given
+# returns (records, errors)
+def writeOB8SitePageJob(job):
+	path, pagePath = job
+	errorFile = io.StringIO()
+	badFrames = []
+	with open(path, 'rb') as f:
+		records = b''.join(getOB8ProgramRecord(frame) for offset, frame in iterOB8Frames(f.read(), badFrames))
+		printOB8BadFrames(f, badFrames, errorFile)
+	if pagePath:
+		writeOB8SiteFilePage(pagePath, path, records)
+	return records, errorFile.getvalue()
+
+# returns the program groups that records have programs in
+def getOB8RecordGroups(records):
+	return set(ob8ProgramGroups[records[i]] for i in range(0, len(records), ob8ProgramRecordSize))
+
+# generates a site in siteDir with a page per input file or per program group, a searchable index and shared assets
+# only input files whose size or modification time changed since the last run are decoded and have their pages
+# rewritten, up to jobs at once; returns (pagesWritten, pageCount)
+# the program records of each input file are kept beside the pages, and site.json only holds the size, time and
+# program groups of each, so a run that changes one file writes the records of that file only
+def writeOB8Site(siteDir, paths, pages='file', jobs=1, errorFile=stderr):
+	import json
+	os.makedirs(siteDir, exist_ok=True)
+	manifestPath = os.path.join(siteDir, ob8SiteManifest)
+	try:
+		with open(manifestPath, encoding='utf-8') as f:
+			manifest = json.load(f)
+	except (OSError, ValueError):
+		manifest = {}
+	# switching between file and group pages starts the site over, without the pages of the old mode
+	if manifest.get('pages') != pages:
+		removeOB8SitePages(siteDir, manifest)
+		manifest = {}
+	oldFiles = manifest.get('files', {})
+
+	# find the input files that changed, or whose page or records are gone
+	files = {}
+	changed = []
+	for path in paths:
+		key = os.path.abspath(path)
+		stat = os.stat(path)
+		entry = oldFiles.get(key)
+		page = getOB8SitePageName(path)
+		if (entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime_ns and 'recordsFile' in entry
+				and os.path.isfile(os.path.join(siteDir, entry['recordsFile'])) and (pages == 'group' or os.path.isfile(os.path.join(siteDir, page)))):
+			files[key] = entry
+		elif key not in files:
+			files[key] = {'path': path, 'page': page, 'recordsFile': getOB8SiteRecordsName(path), 'size': stat.st_size, 'mtime': stat.st_mtime_ns}
+			changed.append(key)
+
+	# decode them and write their pages and records
+	pageJobs = [(files[key]['path'], os.path.join(siteDir, files[key]['page']) if pages == 'file' else None) for key in changed]
+	if jobs > 1 and len(pageJobs) > 1:
+		from concurrent.futures import ProcessPoolExecutor
+		with ProcessPoolExecutor(jobs) as executor:
+			results = executor.map(writeOB8SitePageJob, pageJobs)
+	else:
+		results = map(writeOB8SitePageJob, pageJobs)
+	fileRecords = {}
+	for key, (records, errors) in zip(changed, results):
+		errorFile.write(errors)
+		with open(os.path.join(siteDir, files[key]['recordsFile']), 'wb') as f:
+			f.write(records)
+		files[key]['groups'] = sorted(getOB8RecordGroups(records))
+		fileRecords[key] = records
+	pagesWritten = len(changed) if pages == 'file' else 0
+
+	# drop the pages and records of input files that are no longer part of the site
+	removed = [key for key in oldFiles if key not in files]
+	for key in removed:
+		pageNames = [oldFiles[key]['page']] if pages == 'file' else []
+		pageNames += [oldFiles[key]['recordsFile']] if 'recordsFile' in oldFiles[key] else []
+		for pageName in pageNames:
+			pagePath = os.path.join(siteDir, pageName)
+			if os.path.isfile(pagePath):
+				os.remove(pagePath)
+
+	# the records of the unchanged files are only read for the pages that list every file's programs
+	def getSiteRecords():
+		for key in files:
+			if key not in fileRecords:
+				fileRecords[key] = readOB8SiteRecords(siteDir, files[key])
+		return [(files[key]['path'], files[key]['page'] if pages == 'file' else None, fileRecords[key]) for key in files]
+
+	# rewrite the group pages that the changed or removed files have programs in
+	siteRecords = None
+	if pages == 'file':
+		pageCount = len(files)
+	else:
+		groups = set()
+		for key in changed + removed:
+			for entry in (oldFiles.get(key), files.get(key)):
+				if entry:
+					# an entry from before groups were recorded may have programs in any group
+					groups.update(entry.get('groups', ob8SiteGroups))
+		siteGroups = set(group for entry in files.values() for group in entry['groups'])
+		for group in ob8SiteGroups:
+			pagePath = os.path.join(siteDir, getOB8SiteGroupPageName(group))
+			if group in siteGroups and (group in groups or not os.path.isfile(pagePath)):
+				siteRecords = siteRecords or getSiteRecords()
+				writeOB8SiteGroupPage(pagePath, group, [(path, records) for path, page, records in siteRecords])
+				pagesWritten += 1
+			elif group not in siteGroups and group in groups and os.path.isfile(pagePath):
+				os.remove(pagePath)
+		pageCount = len(siteGroups)
+
+	# the shared assets, and the index whenever the site changed
+	writeOB8SiteFile(os.path.join(siteDir, 'ob8.css'), dumpOB8SiteCSS())
+	writeOB8SiteFile(os.path.join(siteDir, 'ob8.js'), dumpOB8SiteJS())
+	indexPath = os.path.join(siteDir, 'index.html')
+	if changed or removed or manifest.get('order') != list(files) or not os.path.isfile(indexPath):
+		with open(indexPath, 'w', encoding='utf-8') as f:
+			f.write(dumpOB8SiteIndexHTML(siteRecords or getSiteRecords()))
+	if changed or removed or manifest.get('order') != list(files):
+		with open(manifestPath, 'w', encoding='utf-8') as f:
+			json.dump({'pages': pages, 'order': list(files), 'files': files}, f)
+	return pagesWritten, pageCount
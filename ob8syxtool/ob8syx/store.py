@@ -0,0 +1,224 @@
+#
+# MIT License
+#
+# Copyright (c) 2022 Christian-E! / Ten by Ten Software
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+
+#
+# This module keeps the programs of a whole library of OB-8 sysex files in one packed store file
+#
+# A store file starts with a 16-byte header: the magic bytes OB8LIB, the format version, the entry size and the
+# record size. Each update appends a segment: a 16-byte segment header (OB8S, the size of the segment's source
+# table and its number of entries), the entries, and the source table, which holds the paths of the source files
+# first stored by the segment, NUL separated and padded to a multiple of 8 bytes. An entry is a 40-byte program:
+# its 28-byte record, the number of its source file among all of the store's sources, and its byte offset in that
+# file. The program index at the start of the record is its slot.
+#
+
+import bisect
+import os
+import struct
+from sys import stderr
+from .programs import OB8Program, mapOB8File, ob8ProgramRecordSize, ob8SysexHeader
+
+ob8StoreMagic = b'OB8LIB'
+
+ob8StoreVersion = 1
+
+ob8StoreHeader = struct.Struct('<6sHII')
+
+ob8StoreSegmentMagic = b'OB8S'
+
+ob8StoreSegmentHeader = struct.Struct('<4sIQ')
+
+ob8StoreEntry = struct.Struct('<{}sIQ'.format(ob8ProgramRecordSize))
+
+# returns the NumPy dtype of a store entry
+def getOB8StoreEntryType():
+	import numpy as np
+	return np.dtype([('record', np.uint8, ob8ProgramRecordSize), ('source', '<u4'), ('offset', '<u8')])
+
+# turns an (N, 28) NumPy array of program records into an (N, 60) array of program frames, as getOB8FramesFromRecords does
+def getOB8FramesFromRecordArray(records):
+	import numpy as np
+	frames = np.empty((len(records), 60), dtype=np.uint8)
+	frames[:, :4] = np.frombuffer(ob8SysexHeader, dtype=np.uint8)
+	frames[:, 4] = records[:, 0]
+	frames[:, 5:59:2] = records[:, 1:] & 0xf
+	frames[:, 6:60:2] = records[:, 1:] >> 4
+	frames[:, 59] = 0xf7
+	return frames
+
+# the programs of one source file in a store, which can be printed like an input file
+# records holds the 28-byte program records back to back and offsets the byte offset of each in the source file
+# frames holds the same programs as 60-byte frames back to back when the store was asked for them
+class OB8StoreSource:
+	__slots__ = ('name', 'records', 'offsets', 'frames')
+
+	def __init__(self, name, records, offsets, frames=None):
+		self.name = name
+		self.records = records
+		self.offsets = offsets
+		self.frames = frames
+
+	def seekable(self):
+		return False
+
+	def close(self):
+		pass
+
+# a store file mapped into memory
+# program k of the store is found at a fixed place in its segment, so it is read without reading anything else
+class OB8LibraryStore:
+	__slots__ = ('name', 'buf', 'sources', 'segments', 'starts', 'count', 'size')
+
+	def __init__(self, buf, name='<store>'):
+		self.name = name
+		self.buf = buf
+		if len(buf) < ob8StoreHeader.size or buf[:len(ob8StoreMagic)] != ob8StoreMagic:
+			raise ValueError('{} is not an OB-8 library store'.format(name))
+		magic, version, entrySize, recordSize = ob8StoreHeader.unpack_from(buf, 0)
+		if (version, entrySize, recordSize) != (ob8StoreVersion, ob8StoreEntry.size, ob8ProgramRecordSize):
+			raise ValueError('{} is a version {} library store, which cannot be read here'.format(name, version))
+		self.sources = []
+		# (offset of the first entry, number of entries) of every segment, and the number of the first program of each
+		self.segments = []
+		self.starts = []
+		self.count = 0
+		pos = ob8StoreHeader.size
+		while pos + ob8StoreSegmentHeader.size <= len(buf):
+			magic, sourcesSize, count = ob8StoreSegmentHeader.unpack_from(buf, pos)
+			entries = pos + ob8StoreSegmentHeader.size
+			end = entries + count*ob8StoreEntry.size + sourcesSize
+			# anything after the last complete segment was left by an update that did not finish
+			if magic != ob8StoreSegmentMagic or end > len(buf):
+				break
+			sources = bytes(buf[end-sourcesSize:end]).rstrip(b'\0')
+			if sources:
+				self.sources += [os.fsdecode(source) for source in sources.split(b'\0')]
+			self.segments.append((entries, count))
+			self.starts.append(self.count)
+			self.count += count
+			pos = end
+		# the end of the last complete segment, where the next segment goes
+		self.size = pos
+
+	def __len__(self):
+		return self.count
+
+	# returns the offset of the entry of program k in buf
+	def getEntryOffset(self, k):
+		if k < 0:
+			k += self.count
+		if k < 0 or k >= self.count:
+			raise IndexError('library store index out of range')
+		segment = bisect.bisect_right(self.starts, k) - 1
+		return self.segments[segment][0] + (k - self.starts[segment])*ob8StoreEntry.size
+
+	def __getitem__(self, k):
+		offset = self.getEntryOffset(k)
+		return OB8Program(bytes(self.buf[offset:offset+ob8ProgramRecordSize]))
+
+	def __iter__(self):
+		for entries, count in self.segments:
+			for offset in range(entries, entries + count*ob8StoreEntry.size, ob8StoreEntry.size):
+				yield OB8Program(bytes(self.buf[offset:offset+ob8ProgramRecordSize]))
+
+	# returns (path, offset) of the source file program k was stored from
+	def getLocation(self, k):
+		record, source, offset = ob8StoreEntry.unpack_from(self.buf, self.getEntryOffset(k))
+		return self.sources[source], offset
+
+	# returns every entry of the store as a NumPy array of getOB8StoreEntryType, a view of buf if there is one segment
+	def getEntries(self):
+		import numpy as np
+		entryType = getOB8StoreEntryType()
+		entries = [np.frombuffer(self.buf, dtype=entryType, count=count, offset=offset) for offset, count in self.segments]
+		if len(entries) == 1:
+			return entries[0]
+		return np.concatenate(entries) if entries else np.empty(0, dtype=entryType)
+
+	# yields an OB8StoreSource for every run of programs from the same source file, in the order they were stored
+	# with withFrames, the frames of a whole segment are made at once and each source gets a view of its own
+	def iterSources(self, withFrames=False):
+		import numpy as np
+		for offset, count in self.segments:
+			entries = np.frombuffer(self.buf, dtype=getOB8StoreEntryType(), count=count, offset=offset)
+			frames = memoryview(getOB8FramesFromRecordArray(entries['record'])).cast('B') if withFrames else None
+			bounds = [0] + (np.flatnonzero(np.diff(entries['source'])) + 1).tolist() + [count]
+			for start, end in zip(bounds, bounds[1:]):
+				run = entries[start:end]
+				yield OB8StoreSource(self.sources[int(run['source'][0])], run['record'].tobytes(), run['offset'].tolist(), frames[start*60:end*60] if withFrames else None)
+
+# maps a store file into memory
+def openOB8LibraryStore(path):
+	with open(path, 'rb') as f:
+		return OB8LibraryStore(mapOB8File(f), path)
+
+# appends the good programs of sysex files, archives and other stores to a store file, creating it if there is none
+# source files are stored by their absolute paths, and files already in the store are skipped, so a library can be
+# stored again after new files are added to it, from any directory
+# returns (programs stored, source files stored)
+def appendOB8LibraryStore(storePath, paths, errorFile=stderr):
+	import numpy as np
+	from .export import getOB8ExportRecords, iterOB8ExportFrames
+	if os.path.exists(storePath):
+		store = openOB8LibraryStore(storePath)
+		known = set(store.sources)
+		sourceCount = len(store.sources)
+		end = store.size
+		store = None
+	else:
+		with open(storePath, 'wb') as storeFile:
+			storeFile.write(ob8StoreHeader.pack(ob8StoreMagic, ob8StoreVersion, ob8StoreEntry.size, ob8ProgramRecordSize))
+		known = set()
+		sourceCount = 0
+		end = ob8StoreHeader.size
+	entryType = getOB8StoreEntryType()
+	newSources = {}
+	count = 0
+	with open(storePath, 'r+b') as storeFile:
+		storeFile.truncate(end)
+		storeFile.seek(end)
+		# the segment header is written last, so a store is never left with a segment that is not complete
+		storeFile.write(bytes(ob8StoreSegmentHeader.size))
+		for buf, framePaths, offsets in iterOB8ExportFrames([path for path in paths if os.path.abspath(path) not in known], errorFile=errorFile):
+			keep = np.array([path not in known for path in framePaths], dtype=bool)
+			entries = np.empty(len(framePaths), dtype=entryType)
+			entries['record'] = getOB8ExportRecords(buf)
+			entries['source'] = [newSources.setdefault(path, sourceCount + len(newSources)) if kept else 0 for path, kept in zip(framePaths, keep.tolist())]
+			entries['offset'] = offsets
+			entries = entries[keep]
+			storeFile.write(entries.tobytes())
+			count += len(entries)
+		if not count:
+			storeFile.truncate(end)
+			return 0, 0
+		sources = b'\0'.join(os.fsencode(path) for path in newSources)
+		sources += bytes(-len(sources) % 8)
+		storeFile.write(sources)
+		storeFile.flush()
+		os.fsync(storeFile.fileno())
+		storeFile.seek(end)
+		storeFile.write(ob8StoreSegmentHeader.pack(ob8StoreSegmentMagic, len(sources), count))
+	return count, len(newSources)
@@ -0,0 +1,123 @@
+#
+# MIT License
+#
+# Copyright (c) 2022 Christian-E! / Ten by Ten Software
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+#
+# This module prints OB-8 programs as text
+#
+
+import io
+from .programs import ledOnOff
+
+# the text of one program, line by line: each line is (format, parameter names, led), where led says that
+# the parameters are switches, printed as '*' when on and ' ' when off (ledOnOff)
+ob8ProgramTextLines = (
+	# program number (ABCD-12345678)
+	('=== Program {}-{}  ({}) ===\n', ('programGroup', 'programNumber', 'programIndex'), False),
+
+	('Master: \n', (), False),
+	('  Program Volume:{}  Bend:{}\n', ('volume', 'bendAmount'), False),
+
+	('Control: \n', (), False),
+	('  Portamento:{}  \n', ('portAmt',), False),
+	('  Unison:{}  \n', ('unison',), True),
+	('  Osc2_Detune:{}  \n', ('osc2Detune',), False),
+
+	('Modulation: \n', (), False),
+	('  LFO_Rate:{: <2}  Mod_Depth_1:{: <2}  Mod_Depth_2:{: <2}  \n', ('lfoFreq', 'fmAmnt', 'pwmAmnt'), False),
+	('  Wave_Tri:{}      Osc1_Frq:{}      Osc1_PWM:{}  \n', ('lfoWaveTri', 'osc1FM', 'osc1PWM'), True),
+	('  Wave_Sqr:{}      Osc2_Frq:{}      Osc2_PWM:{}  \n', ('lfoWaveSqr', 'osc2FM', 'osc2PWM'), True),
+	('  Wave_S/H:{}    Filter_Frq:{}    Volume_Mod:{}  \n', ('lfoWaveSnH', 'filterFM', 'vcaMod'), True),
+
+	('Oscillators: \n', (), False),
+	('  Osc1_Frq:{: <2}                       Pulse_Width:{: <2}   Osc2_Frq:{}  \n', ('vco1Freq', 'oscPWM', 'vco2Freq'), False),
+	('  Osc1_Wave_Tri:{}  Osc1_Wave_Sqr:{}  Sync:{}  F-Env:{}  Osc1_Wave_Tri:{}  Osc1_Wave_Sqr:{}  \n', ('osc1WaveTri', 'osc1WaveSqr', 'sync', 'fEnv', 'osc2WaveTri', 'osc2WaveSqr'), True),
+
+	('Filter: \n', (), False),
+	('  Frequency:{: <2}            Resonance:{: <2}          Mod:ulation:{: <2}  \n', ('vcfFreq', 'vcfRes', 'vcfMod'), False),
+	('  Osc1_On:{}  Osc2_Half:{}  Osc2_Full:{}  Noise:{}  4_Pole:{}  Kbd_Track:{}  \n', ('osc1On', 'osc2Half', 'osc2On', 'noise', 'fourPole', 'kbdTrack'), True),
+
+	('Envelopes: \n', (), False),
+	('  VCF A:{: <2}  D:{: <2}  S:{: <2}  R:{: <2}  \n', ('vcfAtk', 'vcfDcy', 'vcfSus', 'vcfRel'), False),
+	('  VCA A:{: <2}  D:{: <2}  S:{: <2}  R:{: <2}  \n', ('vcaAtk', 'vcaDcy', 'vcaSus', 'vcaRel'), False),
+
+	('-- Page 2 -- \n', (), False),
+	('Control: \n', (), False),
+	('  Portamento_Bend:{}  \n', ('portBend',), True),
+	('  Voice_Detune:{}  \n', ('voiceDetune',), False),
+	('Modulation: \n', (), False),
+	('  Trig_Wave_Tri:{}  Quantize_1:{}   Quantize_2:{}  \n', ('trigLfoWaveTri', 'fmQuant', 'pwmQuant'), True),
+	('  Trig_Wave_Sqr:{}    Invert_1:{}     Invert_2:{}  \n', ('trigLfoWaveSqr', 'fmDlyInvert', 'pwmDlyInvert'), True),
+	('  Trig_Wave_S/H:{}   LFO_Track:{}  LFO_Env_Mod:{}  \n', ('trigLfoWaveSnH', 'lfoTrack', 'lfoRateDelay'), True),
+	('Oscillators: \n', (), False),
+	('  LFO Phase: 90:{}  180:{}  ', ('_90', '_180'), True),
+	('Osc1_LFO_Mod_Invert: Freq:{}  PWM:{}  ', ('vco1180', 'pw1180'), True),
+	('Portamento: Match:{}  Quantize:{}  \n', ('portMatch', 'portQuant'), True),
+	('Filter: \n', (), False),
+	('  Portamento: Legato:{}  Equal_Time:{}  Exponential:{}  \n', ('legato', 'constPort', 'expoPort'), True),
+	('Envelopes: \n', (), False),
+	('  Delay_Mod_1:{}  Attack_Mod_1:{}  LFO_Trig_Point:{}  \n', ('fmVibDelay', 'fmVibRaise', 'lfoTrigPoint'), False),
+	('  Delay_Mod_2:{}  Attack_Mod_2:{}   Pedal_Release:{}  \n', ('pwmVibDelay', 'pwmVibRaise', 'pedalSustn'), False),
+
+	('\n', (), False),
+)
+
+# the lines of ob8ProgramTextLines joined into one format, and its parameters in order as (name, led)
+ob8ProgramTextFormat = ''.join(line for line, names, led in ob8ProgramTextLines)
+ob8ProgramTextFields = tuple((name, led) for line, names, led in ob8ProgramTextLines for name in names)
+
+# writes the program information of one program as text
+def writeOB8ProgramText(outputFile, programDict):
+	outputFile.write(ob8ProgramTextFormat.format(*[ledOnOff(programDict[name]) if led else programDict[name] for name, led in ob8ProgramTextFields]))
+
+# writes the program information as text, one program at a time
+def writeOB8ProgramsText(outputFile, programsArray):
+	for programDict in programsArray:
+		writeOB8ProgramText(outputFile, programDict)
+
+# returns ob8ProgramTextFormat as a template of %s fields, and the format spec of each field
+def getOB8ProgramTextTemplate():
+	import string
+	template = []
+	specs = []
+	for literal, field, spec, conversion in string.Formatter().parse(ob8ProgramTextFormat):
+		template.append(literal.replace('%', '%%'))
+		if field is not None:
+			template.append('%s')
+			specs.append(spec)
+	return ''.join(template), specs
+
+# writes the programs of parameter columns (as from getOB8ProgramColumns) as text, the same text as writeOB8ProgramsText
+# writes for their dicts, without building any dicts: every column is formatted at once (getOB8ColumnStrings), and
+# each program is its row of the formatted columns filled into the template of getOB8ProgramTextTemplate
+def writeOB8ColumnsText(outputFile, columns):
+	from .columns import getOB8ColumnStrings, writeOB8ColumnRows
+	template, specs = getOB8ProgramTextTemplate()
+	writeOB8ColumnRows(outputFile, template, [getOB8ColumnStrings(columns[name], spec, ledOnOff if led else None) for (name, led), spec in zip(ob8ProgramTextFields, specs)])
+
+# creates a string with the program information
+def dumpOB8ProgramsText(programsArray):
+	dump = io.StringIO()
+	writeOB8ProgramsText(dump, programsArray)
+	return dump.getvalue()
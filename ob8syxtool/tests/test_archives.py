@@ -0,0 +1,106 @@
+import bz2
+import gzip
+import io
+import lzma
+import os
+import subprocess
+import sys
+import tarfile
+import zipfile
+import pytest
+from ob8syx import getOB8ArchiveType, iterOB8InputBuffers, iterOB8InputFiles, main
+
+packageDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+factoryPath = os.path.join(packageDir, 'ob8factory.syx')
+
+def readFactoryBank():
+	with open(factoryPath, 'rb') as f:
+		return f.read()
+
+# the files put in every archive: two banks, one in a folder, and a file that is not sysex
+def getArchiveFiles():
+	bank = readFactoryBank()
+	return [('a.syx', bank[:600]), ('notes.txt', b'not sysex'), ('banks/b.SYX', bank[600:1200])]
+
+def writeZip(path):
+	with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+		for name, data in getArchiveFiles():
+			archive.writestr(name, data)
+
+def writeTar(path, mode):
+	with tarfile.open(path, mode) as archive:
+		for name, data in getArchiveFiles():
+			info = tarfile.TarInfo(name)
+			info.size = len(data)
+			archive.addfile(info, io.BytesIO(data))
+
+archiveWriters = {
+	'zip': (writeZip, 'bank.zip'),
+	'tar': (lambda path: writeTar(path, 'w'), 'bank.tar'),
+	'gzip': (lambda path: writeTar(path, 'w:gz'), 'bank.tar.gz'),
+	'bz2': (lambda path: writeTar(path, 'w:bz2'), 'bank.tar.bz2'),
+	'xz': (lambda path: writeTar(path, 'w:xz'), 'bank.tar.xz'),
+}
+
+# returns (name, data) for every input file from paths, with archives replaced by their members
+def readInputFiles(paths):
+	files = []
+	for path in paths:
+		with open(path, 'rb') as f:
+			files += [(fileReader.name, fileReader.read()) for fileReader in iterOB8InputFiles([f])]
+	return files
+
+@pytest.mark.parametrize('archiveType', list(archiveWriters))
+def test_archive_members_are_read_in_order(tmp_path, archiveType):
+	writeArchive, name = archiveWriters[archiveType]
+	path = str(tmp_path / name)
+	writeArchive(path)
+	with open(path, 'rb') as f:
+		assert getOB8ArchiveType(f) == archiveType
+	assert readInputFiles([path]) == [(path + '/' + memberName, data) for memberName, data in getArchiveFiles() if memberName.lower().endswith('.syx')]
+
+@pytest.mark.parametrize('suffix, compress', [('.gz', gzip.compress), ('.bz2', bz2.compress), ('.xz', lzma.compress)])
+def test_a_compressed_sysex_file(tmp_path, suffix, compress):
+	bank = readFactoryBank()
+	path = str(tmp_path / ('bank.syx' + suffix))
+	with open(path, 'wb') as f:
+		f.write(compress(bank))
+	assert readInputFiles([path]) == [(str(tmp_path / 'bank.syx'), bank)]
+
+def test_plain_files_are_not_archives(tmp_path):
+	with open(factoryPath, 'rb') as f:
+		assert getOB8ArchiveType(f) is None
+		assert list(iterOB8InputFiles([f])) == [f]
+	# a stream that cannot be peeked at is taken as it is
+	assert getOB8ArchiveType(io.BytesIO(gzip.compress(b''))) is None
+
+def test_printing_an_archive(tmp_path):
+	path = str(tmp_path / 'bank.zip')
+	writeZip(path)
+	outputPath = str(tmp_path / 'output.txt')
+	main(['-o', outputPath, path])
+	with open(outputPath) as f:
+		text = f.read()
+	assert text.index(path + '/a.syx\n') < text.index(path + '/banks/b.SYX\n')
+	assert text.count('=== Program') == 20
+
+def test_input_buffers_of_an_archive(tmp_path):
+	path = str(tmp_path / 'bank.tar.gz')
+	writeTar(path, 'w:gz')
+	buffers = [(fileReader.name, bytes(buf), offsets) for fileReader, buf, offsets in iterOB8InputBuffers([path, factoryPath])]
+	bank = readFactoryBank()
+	assert buffers == [(path + '/a.syx', bank[:600], None), (path + '/banks/b.SYX', bank[600:1200], None), (factoryPath, bank, None)]
+
+# standard input is a pipe here, which cannot seek, so a zip file is read into memory first
+@pytest.mark.parametrize('archiveType', ['zip', 'gzip'])
+def test_an_archive_on_standard_input(tmp_path, archiveType):
+	writeArchive, name = archiveWriters[archiveType]
+	path = str(tmp_path / name)
+	writeArchive(path)
+	with open(path, 'rb') as f:
+		data = f.read()
+	result = subprocess.run([sys.executable, '-m', 'ob8syx', '-'], input=data, stdout=subprocess.PIPE, cwd=packageDir, check=True)
+	text = result.stdout.decode('utf-8')
+	assert text.startswith('<stdin>/a.syx\n')
+	assert '<stdin>/banks/b.SYX\n' in text
+	assert text.count('=== Program') == 20
@@ -0,0 +1,109 @@
+import os
+from ob8syx import diffOB8Banks, getOB8Bank, getOB8ProgramFromRecord, getOB8ProgramRecordFromDict, getOB8Programs, main, mergeOB8Banks, writeOB8Programs
+
+factoryPath = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ob8factory.syx')
+
+def readFactoryPrograms():
+	with open(factoryPath, 'rb') as f:
+		return getOB8Programs(f.read())
+
+# writes programs as a bank named name and returns its path
+def writeBank(tmp_path, name, programs):
+	path = str(tmp_path / name)
+	with open(path, 'wb') as f:
+		writeOB8Programs(f, programs)
+	return path
+
+# returns a copy of program with some parameters changed, decoded again so that a new slot gets its group and number
+def changeProgram(program, **changes):
+	program = dict(program)
+	program.update(changes)
+	return getOB8ProgramFromRecord(getOB8ProgramRecordFromDict(program))
+
+def readBanks(*paths):
+	return [getOB8Bank(path) for path in paths]
+
+def test_diff_by_slot(tmp_path):
+	programs = readFactoryPrograms()
+	changed = programs[:119] + [programs[0]]
+	changed[3] = changeProgram(programs[3], vcfRes=(programs[3]['vcfRes'] + 1) % 64)
+	bankA, bankB = readBanks(writeBank(tmp_path, 'a.syx', programs), writeBank(tmp_path, 'b.syx', changed))
+	# slot 120 is gone, and the second slot 1 is a program of its own
+	assert diffOB8Banks(bankA, bankB) == ([(3, 3, [('vcfRes', programs[3]['vcfRes'], changed[3]['vcfRes'])])], [119], [119], 118)
+
+def test_diff_by_hash_finds_a_moved_program(tmp_path):
+	programs = readFactoryPrograms()
+	moved = programs[1:] + [changeProgram(programs[0], programIndex=128)]
+	bankA, bankB = readBanks(writeBank(tmp_path, 'a.syx', programs), writeBank(tmp_path, 'b.syx', moved))
+	assert diffOB8Banks(bankA, bankB, 'hash') == ([(0, 119, [])], [], [], 119)
+	changed, removed, added, sameCount = diffOB8Banks(bankA, bankB)
+	assert (changed, removed, added, sameCount) == ([], [0], [119], 119)
+
+def test_diff_output(tmp_path):
+	programs = readFactoryPrograms()
+	changed = list(programs)
+	changed[5] = changeProgram(programs[5], volume=(programs[5]['volume'] + 1) % 64)
+	paths = [writeBank(tmp_path, 'a.syx', programs), writeBank(tmp_path, 'b.syx', changed)]
+	outputPath = str(tmp_path / 'diff.txt')
+	main(['--diff', '-o', outputPath] + paths)
+	with open(outputPath) as f:
+		assert f.read() == '--- {}\n+++ {}\n  A-6 (6) at byte 300: volume {} -> {}\n119 programs the same, 1 changed, 0 removed, 0 added\n'.format(
+			paths[0], paths[1], programs[5]['volume'], changed[5]['volume'])
+
+# returns the programs of merged records
+def getMergedPrograms(records):
+	return [getOB8ProgramFromRecord(bytes(record)) for record in records]
+
+def test_merge_takes_the_changes_of_both_sides(tmp_path):
+	base = readFactoryPrograms()[:10]
+	ours = list(base)
+	ours[1] = changeProgram(base[1], vcfRes=(base[1]['vcfRes'] + 1) % 64)
+	theirs = list(base)
+	theirs[1] = changeProgram(base[1], vcaAtk=(base[1]['vcaAtk'] + 1) % 64)
+	theirs[2] = changeProgram(base[2], volume=(base[2]['volume'] + 1) % 64)
+	records, conflicts = mergeOB8Banks(*readBanks(writeBank(tmp_path, 'base.syx', base), writeBank(tmp_path, 'ours.syx', ours), writeBank(tmp_path, 'theirs.syx', theirs)))
+	expected = list(base)
+	expected[1] = changeProgram(base[1], vcfRes=ours[1]['vcfRes'], vcaAtk=theirs[1]['vcaAtk'])
+	expected[2] = theirs[2]
+	assert conflicts == []
+	assert getMergedPrograms(records) == expected
+
+def test_merge_conflicts_keep_ours(tmp_path):
+	base = readFactoryPrograms()[:10]
+	ours = list(base)
+	ours[4] = changeProgram(base[4], vcfFreq=(base[4]['vcfFreq'] + 1) % 64)
+	theirs = list(base)
+	theirs[4] = changeProgram(base[4], vcfFreq=(base[4]['vcfFreq'] + 2) % 64)
+	# both sides add slot 20 with different programs
+	ours.append(changeProgram(base[0], programIndex=20))
+	theirs.append(changeProgram(base[0], programIndex=20, vcfFreq=(base[0]['vcfFreq'] + 1) % 64))
+	records, conflicts = mergeOB8Banks(*readBanks(writeBank(tmp_path, 'base.syx', base), writeBank(tmp_path, 'ours.syx', ours), writeBank(tmp_path, 'theirs.syx', theirs)))
+	assert conflicts == [('A-5 (5)', 'vcfFreq', base[4]['vcfFreq'], ours[4]['vcfFreq'], theirs[4]['vcfFreq']),
+		('AB-4 (20)', 'vcfFreq', None, ours[10]['vcfFreq'], theirs[10]['vcfFreq'])]
+	assert getMergedPrograms(records) == ours
+
+def test_merge_removals_and_additions(tmp_path):
+	base = readFactoryPrograms()[:10]
+	changed = changeProgram(base[7], vcfRes=(base[7]['vcfRes'] + 1) % 64)
+	added = changeProgram(base[0], programIndex=30)
+	# ours removes slots 3 and 8, theirs changes slot 8 and adds slot 30
+	ours = base[:2] + base[3:7] + base[8:]
+	theirs = base[:7] + [changed] + base[8:] + [added]
+	records, conflicts = mergeOB8Banks(*readBanks(writeBank(tmp_path, 'base.syx', base), writeBank(tmp_path, 'ours.syx', ours), writeBank(tmp_path, 'theirs.syx', theirs)))
+	assert conflicts == []
+	assert getMergedPrograms(records) == base[:2] + base[3:7] + base[8:] + [changed, added]
+
+def test_merge_output(tmp_path):
+	base = readFactoryPrograms()[:10]
+	ours = list(base)
+	ours[4] = changeProgram(base[4], vcfFreq=(base[4]['vcfFreq'] + 1) % 64)
+	theirs = list(base)
+	theirs[4] = changeProgram(base[4], vcfFreq=(base[4]['vcfFreq'] + 2) % 64)
+	mergedPath = str(tmp_path / 'merged.syx')
+	outputPath = str(tmp_path / 'merge.txt')
+	main(['--merge', mergedPath, '-o', outputPath, writeBank(tmp_path, 'base.syx', base), writeBank(tmp_path, 'ours.syx', ours), writeBank(tmp_path, 'theirs.syx', theirs)])
+	with open(mergedPath, 'rb') as f:
+		assert getOB8Programs(f.read()) == ours
+	with open(outputPath) as f:
+		assert f.read() == 'conflict A-5 (5) vcfFreq: base {} ours {} theirs {}, kept ours\nMerged 10 programs into {} with 1 conflicts\n'.format(
+			base[4]['vcfFreq'], ours[4]['vcfFreq'], theirs[4]['vcfFreq'], mergedPath)
@@ -0,0 +1,78 @@
+import json
+import os
+import shutil
+from ob8syx import getOB8CachedRecords, getOB8ProgramRecord, iterOB8Frames, main, openOB8Cache, touchOB8Cache, trimOB8Cache
+
+factoryPath = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ob8factory.syx')
+
+def readFactoryBank():
+	with open(factoryPath, 'rb') as f:
+		return f.read()
+
+# returns the program records of every good frame in buf, as the cache keeps them
+def getRecords(buf):
+	return b''.join(getOB8ProgramRecord(frame) for offset, frame in iterOB8Frames(buf))
+
+def readCached(cache, path):
+	with open(path, 'rb') as f:
+		return getOB8CachedRecords(cache, f)
+
+def listCached(cache):
+	return sorted(row[0] for row in cache.execute('SELECT path FROM files'))
+
+def test_a_file_is_decoded_once(tmp_path):
+	path = str(tmp_path / 'bank.syx')
+	shutil.copy(factoryPath, path)
+	cache = openOB8Cache(str(tmp_path / 'cache.db'))
+	records = getRecords(readFactoryBank())
+	assert readCached(cache, path) == (records, [], False)
+	assert readCached(cache, path) == (records, [], True)
+
+def test_a_changed_file_is_decoded_again(tmp_path):
+	path = str(tmp_path / 'bank.syx')
+	bank = readFactoryBank()
+	shutil.copy(factoryPath, path)
+	cache = openOB8Cache(str(tmp_path / 'cache.db'))
+	readCached(cache, path)
+	with open(path, 'ab') as f:
+		f.write(bank[:90])
+	assert readCached(cache, path) == (getRecords(bank + bank[:60]), [(len(bank)+60, 'incomplete')], False)
+	assert readCached(cache, path)[1:] == ([(len(bank)+60, 'incomplete')], True)
+
+def test_a_copied_file_is_found_by_its_content(tmp_path):
+	paths = [str(tmp_path / 'a.syx'), str(tmp_path / 'b.syx')]
+	for path in paths:
+		shutil.copy(factoryPath, path)
+	cache = openOB8Cache(str(tmp_path / 'cache.db'))
+	assert not readCached(cache, paths[0])[2]
+	assert readCached(cache, paths[1]) == (getRecords(readFactoryBank()), [], True)
+	assert listCached(cache) == paths
+
+def test_trimming_drops_the_least_recently_used_files(tmp_path):
+	bank = readFactoryBank()
+	paths = []
+	for i in range(3):
+		path = str(tmp_path / 'bank{}.syx'.format(i))
+		# every file holds different programs, so none is found by another's hash
+		with open(path, 'wb') as f:
+			f.write(bank[i*60:])
+		paths.append(path)
+	cache = openOB8Cache(str(tmp_path / 'cache.db'))
+	for path in paths:
+		readCached(cache, path)
+	touchOB8Cache(cache, [paths[0], paths[2]])
+	trimOB8Cache(cache, len(getRecords(bank))*2)
+	assert listCached(cache) == [paths[0], paths[2]]
+	trimOB8Cache(cache, 0)
+	assert listCached(cache) == []
+
+def test_stats_count_hits_and_misses(tmp_path):
+	path = str(tmp_path / 'bank.syx')
+	shutil.copy(factoryPath, path)
+	statsPath = str(tmp_path / 'stats.json')
+	options = ['--cache', str(tmp_path / 'cache.db'), '--stats-json', statsPath, '-o', str(tmp_path / 'output'), path]
+	for hits, misses in ((0, 1), (1, 0)):
+		main(options)
+		with open(statsPath) as f:
+			total = json.load(f)['total']
+		assert (total['cacheHits'], total['cacheMisses']) == (hits, misses)
@@ -0,0 +1,68 @@
+import io
+import os
+import pytest
+from ob8syx import compileOB8Where, filterOB8Programs, getOB8ProgramColumns, getOB8Programs, getOB8ProgramsFromColumns, iterOB8FilePrograms, main
+from ob8syx import writeOB8ColumnsHTML, writeOB8ColumnsLazyHTML, writeOB8ColumnsStaticHTML, writeOB8ColumnsText
+from ob8syx import writeOB8ProgramsHTML, writeOB8ProgramsLazyHTML, writeOB8ProgramsStaticHTML, writeOB8ProgramsText
+
+factoryPath = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ob8factory.syx')
+
+def readFactoryBank():
+	with open(factoryPath, 'rb') as f:
+		return f.read()
+
+# returns every program of the factory bank decoded with or without NumPy, keeping those that match where
+def readFactoryPrograms(useBatch, where=None):
+	fileReader = io.BytesIO(readFactoryBank())
+	fileReader.name = factoryPath
+	return [program for programsDict in iterOB8FilePrograms(fileReader, useBatch, where=where) for program in programsDict]
+
+def test_filter_a_generator():
+	programs = getOB8Programs(readFactoryBank())
+	expected = [program for program in programs if program['vcfRes'] > 40]
+	assert expected
+	assert filterOB8Programs((program for program in programs), 'vcfRes > 40') == expected
+	assert filterOB8Programs(iter([]), 'vcfRes > 40') == []
+
+def test_batch_filter_matches_streaming_filter():
+	for where in ('vcfRes > 40', 'vcfRes > 999'):
+		assert readFactoryPrograms(True, where) == readFactoryPrograms(False, where)
+	assert len(readFactoryPrograms(True, 'vcfRes > 40')) < len(readFactoryPrograms(True))
+
+@pytest.mark.parametrize('expression', ['programGroup > 3', 'programGroup == 3', 'vcfRes < programGroup', 'programGroup + 1 > 0', '-programGroup', "'A' * 2 == programGroup"])
+def test_text_mixed_with_numbers_is_rejected(expression):
+	with pytest.raises(ValueError):
+		compileOB8Where(expression)
+
+def test_text_mixed_with_numbers_is_a_usage_error(capsys):
+	with pytest.raises(SystemExit) as e:
+		main(['--where', 'programGroup > 3', factoryPath])
+	assert e.value.code == 2
+	assert 'programGroup > 3' in capsys.readouterr().err
+
+def test_text_compared_with_text():
+	programs = getOB8Programs(readFactoryBank())
+	expected = [program for program in programs if program['programGroup'] >= 'B' and not program['unison']]
+	assert expected
+	assert filterOB8Programs(programs, "programGroup >= 'B' and not unison") == expected
+
+@pytest.mark.parametrize('writePrograms, writeColumns', [(writeOB8ProgramsText, writeOB8ColumnsText), (writeOB8ProgramsHTML, writeOB8ColumnsHTML),
+	(writeOB8ProgramsStaticHTML, writeOB8ColumnsStaticHTML), (writeOB8ProgramsLazyHTML, writeOB8ColumnsLazyHTML)])
+def test_columns_render_as_their_programs(writePrograms, writeColumns):
+	columns = getOB8ProgramColumns(readFactoryBank())
+	expected = io.StringIO()
+	writePrograms(expected, getOB8ProgramsFromColumns(columns))
+	output = io.StringIO()
+	writeColumns(output, columns)
+	assert output.getvalue() == expected.getvalue()
+
+# returns what the command line writes for the factory bank with options
+def readOutput(tmp_path, options):
+	path = str(tmp_path / 'output')
+	main(options + ['-o', path, factoryPath])
+	with open(path) as f:
+		return f.read()
+
+@pytest.mark.parametrize('options', [[], ['--html'], ['--static'], ['--where', 'vcfRes > 40'], ['--html', '--where', 'vcfRes > 999']])
+def test_batch_output_matches_streaming_output(tmp_path, options):
+	assert readOutput(tmp_path, options + ['--batch']) == readOutput(tmp_path, options)
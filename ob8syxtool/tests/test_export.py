@@ -0,0 +1,99 @@
+import csv
+import json
+import os
+import shutil
+import sqlite3
+import pytest
+from ob8syx import exportOB8Programs, getOB8ProgramHash, getOB8ProgramRecord, getOB8Programs, ob8ExportKeys
+
+factoryPath = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ob8factory.syx')
+
+# a 60-byte sysex message from another manufacturer
+foreignMessage = b'\xf0\x43' + bytes(57) + b'\xf7'
+
+def readFactoryBank():
+	with open(factoryPath, 'rb') as f:
+		return f.read()
+
+# writes buf after a foreign message, so the programs start at byte 60, and returns its path
+def writeBank(tmp_path, name, buf):
+	path = tmp_path / name
+	path.write_bytes(foreignMessage + buf)
+	return str(path)
+
+# returns the export rows expected for the programs of buf written by writeBank to path, every field as text
+def getExpectedRows(path, buf):
+	rows = []
+	for i, program in enumerate(getOB8Programs(buf)):
+		program.update(path=os.path.abspath(path), offset=60 + i*60, hash=getOB8ProgramHash(getOB8ProgramRecord(buf, i*60)))
+		rows.append({key: str(program[key]) for key in ob8ExportKeys})
+	return rows
+
+# returns the rows of the parameters view of a SQLite export, every field as text
+def readSQLiteRows(path):
+	db = sqlite3.connect(path)
+	try:
+		return [{key: str(value) for key, value in zip(ob8ExportKeys, row)} for row in db.execute('SELECT * FROM parameters ORDER BY path, offset')]
+	finally:
+		db.close()
+
+# a bank small enough to be written a row at a time, and one written with NumPy
+@pytest.mark.parametrize('programCount', [10, 120])
+def test_csv_export(tmp_path, programCount):
+	buf = readFactoryBank()[:programCount*60]
+	path = writeBank(tmp_path, 'bank.syx', buf)
+	outputPath = str(tmp_path / 'programs.csv')
+	assert exportOB8Programs(outputPath, [path]) == programCount
+	with open(outputPath, newline='') as f:
+		reader = csv.DictReader(f)
+		assert tuple(reader.fieldnames) == ob8ExportKeys
+		assert list(reader) == getExpectedRows(path, buf)
+
+@pytest.mark.parametrize('programCount', [10, 120])
+def test_ndjson_export(tmp_path, programCount):
+	buf = readFactoryBank()[:programCount*60]
+	path = writeBank(tmp_path, 'bank.syx', buf)
+	outputPath = str(tmp_path / 'programs.ndjson')
+	assert exportOB8Programs(outputPath, [path]) == programCount
+	with open(outputPath) as f:
+		rows = [json.loads(line) for line in f]
+	assert [list(row) for row in rows] == [list(ob8ExportKeys)] * programCount
+	assert [{key: str(value) for key, value in row.items()} for row in rows] == getExpectedRows(path, buf)
+
+def test_sqlite_export(tmp_path):
+	buf = readFactoryBank()
+	path = writeBank(tmp_path, 'bank.syx', buf)
+	outputPath = str(tmp_path / 'programs.db')
+	assert exportOB8Programs(outputPath, [path]) == 120
+	assert readSQLiteRows(outputPath) == getExpectedRows(path, buf)
+
+def test_sqlite_export_replaces_the_programs_of_a_file(tmp_path, monkeypatch):
+	bank = readFactoryBank()
+	paths = [writeBank(tmp_path, 'a.syx', bank), writeBank(tmp_path, 'b.syx', bank[:600])]
+	outputPath = str(tmp_path / 'programs.db')
+	exportOB8Programs(outputPath, paths)
+	exportOB8Programs(outputPath, paths[:1])
+	assert readSQLiteRows(outputPath) == getExpectedRows(paths[0], bank) + getExpectedRows(paths[1], bank[:600])
+	# the file changed, and is named from another directory
+	writeBank(tmp_path, 'a.syx', bank[600:1200])
+	monkeypatch.chdir(tmp_path)
+	assert exportOB8Programs(outputPath, ['a.syx']) == 10
+	assert readSQLiteRows(outputPath) == getExpectedRows(paths[0], bank[600:1200]) + getExpectedRows(paths[1], bank[:600])
+
+def test_export_where(tmp_path):
+	buf = readFactoryBank()
+	path = writeBank(tmp_path, 'bank.syx', buf)
+	outputPath = str(tmp_path / 'programs.csv')
+	expected = [row for row in getExpectedRows(path, buf) if int(row['vcfRes']) > 40]
+	assert expected
+	assert exportOB8Programs(outputPath, [path], where='vcfRes > 40') == len(expected)
+	with open(outputPath, newline='') as f:
+		assert list(csv.DictReader(f)) == expected
+
+def test_export_format_from_the_extension(tmp_path):
+	with pytest.raises(ValueError):
+		exportOB8Programs(str(tmp_path / 'programs.txt'), [factoryPath])
+	outputPath = str(tmp_path / 'programs.txt')
+	assert exportOB8Programs(outputPath, [factoryPath], 'ndjson') == 120
+	with open(outputPath) as f:
+		assert len(f.readlines()) == 120
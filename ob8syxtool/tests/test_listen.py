@@ -0,0 +1,100 @@
+import asyncio
+import io
+import json
+import os
+import threading
+import time
+import pytest
+from ob8syx import OB8ListenSource, getOB8Programs, listenOB8Sources, main
+
+factoryPath = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ob8factory.syx')
+
+def readFactoryBank():
+	with open(factoryPath, 'rb') as f:
+		return f.read()
+
+# returns buf with MIDI clock after every 7 bytes and active sensing after every 50, so both land inside sysex frames
+def addRealtimeBytes(buf):
+	return b''.join(buf[i:i+7] + (b'\xf8\xfe' if i % 50 < 7 else b'\xf8') for i in range(0, len(buf), 7))
+
+# an OB8ListenWriter that keeps the frames of every source
+class FrameCollector:
+	def __init__(self):
+		self.frames = {}
+
+	def write(self, source, framesArray):
+		self.frames.setdefault(source.name, []).extend(framesArray)
+
+def readText(path):
+	with open(path) as f:
+		return f.read()
+
+def test_realtime_bytes_inside_sysex_are_dropped(tmp_path):
+	path = str(tmp_path / 'live.mid')
+	with open(path, 'wb') as f:
+		f.write(addRealtimeBytes(readFactoryBank()))
+	main(['--listen', path, '-o', str(tmp_path / 'live.txt')])
+	main([factoryPath, '-o', str(tmp_path / 'bank.txt')])
+	live = readText(str(tmp_path / 'live.txt'))
+	assert live.startswith(path + '\n')
+	assert live[len(path):] == readText(str(tmp_path / 'bank.txt'))[len(factoryPath):]
+
+@pytest.mark.skipif(not hasattr(os, 'mkfifo'), reason='needs FIFOs')
+def test_a_fifo_written_a_few_bytes_at_a_time(tmp_path):
+	bank = readFactoryBank()
+	path = str(tmp_path / 'live.fifo')
+	os.mkfifo(path)
+	# the frames are split across writes, with pauses so they arrive in pieces
+	def writeSlowly():
+		with open(path, 'wb', buffering=0) as f:
+			data = addRealtimeBytes(bank[:600])
+			for i in range(0, len(data), 97):
+				f.write(data[i:i+97])
+				time.sleep(0.002)
+	writer = threading.Thread(target=writeSlowly)
+	writer.start()
+	syxPath = str(tmp_path / 'live.syx')
+	main(['--listen', path, '--syx', syxPath])
+	writer.join()
+	with open(syxPath, 'rb') as f:
+		assert f.read() == bank[:600]
+
+def test_tcp_source_and_a_failing_source():
+	bank = readFactoryBank()
+	collector = FrameCollector()
+	errorFile = io.StringIO()
+
+	async def run():
+		async def send(reader, writer):
+			data = addRealtimeBytes(bank)
+			for i in range(0, len(data), 1000):
+				writer.write(data[i:i+1000])
+				await writer.drain()
+			writer.close()
+		server = await asyncio.start_server(send, '127.0.0.1', 0)
+		port = server.sockets[0].getsockname()[1]
+		async with server:
+			sources = [OB8ListenSource('tcp:127.0.0.1:{}'.format(port)), OB8ListenSource('missing.mid')]
+			return await listenOB8Sources(sources, collector, errorFile), sources[0].name
+
+	frameCount, name = asyncio.run(run())
+	assert frameCount == 120
+	assert list(collector.frames) == [name]
+	frames = collector.frames[name]
+	# offsets count the bytes of the stream without the realtime bytes
+	assert [offset for offset, frame in frames] == list(range(0, len(bank), 60))
+	assert getOB8Programs(b''.join(frame for offset, frame in frames)) == getOB8Programs(bank)
+	assert errorFile.getvalue().startswith('missing.mid: ')
+
+def test_live_export_records_offsets_and_path(tmp_path, monkeypatch):
+	bank = readFactoryBank()
+	monkeypatch.chdir(tmp_path)
+	with open('live.mid', 'wb') as f:
+		f.write(addRealtimeBytes(b'junk' + bank[:600]))
+	main(['--listen', 'live.mid', '--export', 'live.ndjson', '--where', 'vcfRes > 0'])
+	with open('live.ndjson') as f:
+		rows = [json.loads(line) for line in f]
+	expected = [(4 + i*60, program) for i, program in enumerate(getOB8Programs(bank[:600])) if program['vcfRes'] > 0]
+	assert expected
+	assert [(row['path'], row['offset']) for row in rows] == [(str(tmp_path / 'live.mid'), offset) for offset, program in expected]
+	assert [{key: row[key] for key in program} for row, (offset, program) in zip(rows, expected)] == [program for offset, program in expected]
@@ -0,0 +1,40 @@
+import os
+import re
+from ob8syx import getOB8Programs, getOB8StaticControls, getOB8StaticPanelLayout, writeOB8ProgramsStaticHTML
+from ob8syx.panels import dumpOB8StaticStyleCSS
+
+factoryPath = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ob8factory.syx')
+
+def readFactoryPrograms():
+	with open(factoryPath, 'rb') as f:
+		return getOB8Programs(f.read())
+
+# returns the parameter name of every position class of the static panel
+def getControlNames():
+	width, height, items = getOB8StaticPanelLayout()
+	return [value[1] if isinstance(value, tuple) else value for kind, x, y, value in getOB8StaticControls(items)]
+
+def test_static_controls_show_their_program(tmp_path):
+	programs = readFactoryPrograms()
+	path = tmp_path / 'static.html'
+	with open(path, 'w') as f:
+		writeOB8ProgramsStaticHTML(f, programs)
+	names = getControlNames()
+	panels = re.findall(r'<div class="panel">(.*?)</div>', path.read_text())
+	assert len(panels) == len(programs)
+	for panel, program in zip(panels, programs):
+		positions = []
+		for tag, classes in re.findall(r'<(i|b) class="?([^">]*)"?></\1>', panel):
+			classes = classes.split()
+			position = int(classes[0][1:])
+			positions.append(position)
+			if tag == 'i':
+				assert classes[1] == 'k{}'.format(program[names[position]])
+			else:
+				assert ('on' in classes) == bool(program[names[position]])
+		assert sorted(positions) == list(range(len(names)))
+
+def test_every_position_class_is_placed():
+	css = dumpOB8StaticStyleCSS()
+	assert 'nth-child' not in css
+	assert sorted(int(position) for position in re.findall(r'\.p(\d+) \{ left', css)) == list(range(len(getControlNames())))
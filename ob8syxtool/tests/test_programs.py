@@ -0,0 +1,125 @@
+import os
+import pytest
+import tracemalloc
+from ob8syx import OB8ProgramParser, findOB8Frame, getOB8Program, getOB8ProgramAt, getOB8Programs, iterOB8Frames, iterOB8Programs, ob8FrameRunLength, scanOB8FrameRange, scanOB8FrameRuns
+
+factoryPath = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ob8factory.syx')
+
+# a 60-byte sysex message from another manufacturer
+foreignMessage = b'\xf0\x43' + bytes(57) + b'\xf7'
+
+# a 60-byte OB-8 frame that has no F7 at its end
+badFrame = b'\xf0\x10\x01\x01' + bytes(56)
+
+def readFactoryBank():
+	with open(factoryPath, 'rb') as f:
+		return f.read()
+
+def writeBank(tmp_path, buf):
+	path = tmp_path / 'bank.syx'
+	path.write_bytes(buf)
+	return str(path)
+
+def test_program_at_in_a_bank(tmp_path):
+	bank = readFactoryBank()
+	path = writeBank(tmp_path, bank)
+	for k in (0, 1, len(bank)//60 - 1):
+		assert getOB8ProgramAt(path, k) == getOB8Program(bank, k*60)
+
+@pytest.mark.parametrize('prefix', [foreignMessage, badFrame], ids=['foreign', 'bad'])
+def test_program_at_after_a_60_byte_message(tmp_path, prefix):
+	bank = readFactoryBank()
+	path = writeBank(tmp_path, prefix + bank)
+	for k in (0, 1, len(bank)//60 - 1):
+		assert getOB8ProgramAt(path, k) == getOB8Program(bank, k*60)
+
+def test_program_at_past_the_end(tmp_path):
+	bank = readFactoryBank()
+	path = writeBank(tmp_path, foreignMessage + bank)
+	with pytest.raises(IndexError):
+		getOB8ProgramAt(path, len(bank)//60)
+
+def test_program_at_in_a_large_bank_does_not_copy_it(tmp_path):
+	bank = readFactoryBank()
+	count = len(bank)//60
+	path = writeBank(tmp_path, bank*1000)
+	k = 1000*count - 7
+	tracemalloc.start()
+	try:
+		program = getOB8ProgramAt(path, k)
+		peak = tracemalloc.get_traced_memory()[1]
+	finally:
+		tracemalloc.stop()
+	assert program == getOB8Program(bank, (k % count)*60)
+	# the bank is 7 MB, and checking the programs before k copies a few KB of it at a time
+	assert peak < 1000000
+
+# returns the programs of buf fed to a parser chunkSize bytes at a time, with the bad frames it found
+def parseInChunks(buf, chunkSize):
+	parser = OB8ProgramParser()
+	programs = []
+	for start in range(0, len(buf), chunkSize):
+		programs += parser.feed(buf[start:start+chunkSize])
+	parser.close()
+	return programs, parser.badFrames
+
+@pytest.mark.parametrize('chunkSize', [1, 3, 59, 61, 1000, 65536])
+def test_parser_joins_frames_split_across_chunks(chunkSize):
+	bank = readFactoryBank()
+	assert parseInChunks(bank, chunkSize) == (getOB8Programs(bank), [])
+
+def test_parser_yields_a_frame_once_its_last_byte_arrives():
+	bank = readFactoryBank()
+	parser = OB8ProgramParser()
+	assert parser.feed(bank[:59]) == []
+	assert parser.feed(bank[59:61]) == [getOB8Program(bank, 0)]
+	assert parser.feedFrames(bank[61:120]) == [(60, bank[60:120])]
+	assert parser.frameCount == 2
+
+def test_parser_finds_a_header_split_across_chunks():
+	bank = readFactoryBank()
+	parser = OB8ProgramParser()
+	assert parser.feedFrames(b'junk' + bank[:2]) == []
+	assert parser.feedFrames(bank[2:60]) == [(4, bank[:60])]
+
+def test_parser_reports_a_frame_cut_off_by_the_end_of_the_stream():
+	bank = readFactoryBank()
+	assert parseInChunks(bank[:150], 7) == (getOB8Programs(bank[:120]), [(120, 'incomplete')])
+
+def test_iterating_programs_of_chunks():
+	bank = readFactoryBank()
+	assert list(iterOB8Programs(bank[start:start+100] for start in range(0, len(bank), 100))) == getOB8Programs(bank)
+
+# the factory bank with junk, another synth's message and frames cut short by F0, cut short by F7 and missing their F7
+# between its programs, and the programs that are left whole
+def makeMessyBank():
+	bank = readFactoryBank()
+	messy = (b'junk' + bank[:60] + foreignMessage + bank[60:80] + bank[120:180] + bank[180:200] + b'\xf7' + bank[240:300]
+		+ bank[300:359] + b'\x00' + bank[360:])
+	return messy, bank[:60] + bank[120:180] + bank[240:300] + bank[360:]
+
+def test_scanner_skips_junk_and_reports_bad_frames():
+	messy, whole = makeMessyBank()
+	badFrames = []
+	assert [getOB8Program(frame, 0) for offset, frame in iterOB8Frames(messy, badFrames)] == getOB8Programs(whole)
+	assert badFrames == [(124, 'truncated by F0 at byte 144'), (204, 'truncated by F7 at byte 224'), (285, 'no F7 at byte 344')]
+
+def test_scanner_reports_a_truncated_last_message():
+	bank = readFactoryBank()
+	badFrames = []
+	assert len(list(iterOB8Frames(bank[:150], badFrames))) == 2
+	assert badFrames == [(120, 'incomplete')]
+
+def test_scanner_runs_match_scanning_frame_by_frame():
+	messy, whole = makeMessyBank()
+	expected = []
+	pos = 0
+	while True:
+		offset, pos, error = findOB8Frame(messy, pos, len(messy))
+		if offset < 0:
+			break
+		expected.append((offset, pos, error))
+	assert list(scanOB8FrameRange(messy, 0, len(messy))) == expected
+	# the scanner is back to checking whole runs of frames at once after the last bad frame
+	runLength = 60*ob8FrameRunLength
+	assert (345+60, 345+60+runLength, None) in list(scanOB8FrameRuns(messy, 0, len(messy)))
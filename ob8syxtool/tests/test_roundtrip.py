@@ -0,0 +1,31 @@
+import os
+import random
+from ob8syx import getOB8FramesFromRecords, getOB8Program, getOB8ProgramFrame, getOB8Programs, main, writeOB8Programs
+
+factoryPath = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ob8factory.syx')
+
+def readFactoryBank():
+	with open(factoryPath, 'rb') as f:
+		return f.read()
+
+# returns count program frames with random parameter bytes
+def getRandomFrames(count, seed=0):
+	rng = random.Random(seed)
+	records = b''.join(bytes([rng.randrange(120)] + [rng.randrange(256) for i in range(27)]) for program in range(count))
+	frames = getOB8FramesFromRecords(records)
+	return [frames[i:i+60] for i in range(0, len(frames), 60)]
+
+def test_syx_reproduces_factory_bank(tmp_path):
+	path = tmp_path / 'factory.syx'
+	main(['--syx', str(path), factoryPath])
+	assert path.read_bytes() == readFactoryBank()
+
+def test_write_programs_reproduces_factory_bank(tmp_path):
+	path = tmp_path / 'factory.syx'
+	with open(path, 'wb') as f:
+		writeOB8Programs(f, getOB8Programs(readFactoryBank()))
+	assert path.read_bytes() == readFactoryBank()
+
+def test_encoding_inverts_decoding():
+	for frame in getRandomFrames(1000):
+		assert getOB8ProgramFrame(getOB8Program(frame, 0)) == frame
@@ -0,0 +1,47 @@
+import json
+import os
+import shutil
+from ob8syx import getOB8SiteGroupPageName, getOB8SitePageName, ob8SiteGroups, writeOB8Site
+
+factoryPath = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ob8factory.syx')
+
+def readFactoryBank():
+	with open(factoryPath, 'rb') as f:
+		return f.read()
+
+# returns the html pages of a site other than its index
+def listPages(siteDir):
+	return sorted(name for name in os.listdir(siteDir) if name.endswith('.html') and name != 'index.html')
+
+def test_switching_page_modes_removes_the_old_pages(tmp_path):
+	siteDir = str(tmp_path / 'site')
+	path = str(tmp_path / 'factory.syx')
+	shutil.copy(factoryPath, path)
+	filePages = [getOB8SitePageName(path)]
+	groupPages = set(getOB8SiteGroupPageName(group) for group in ob8SiteGroups)
+	writeOB8Site(siteDir, [path])
+	assert listPages(siteDir) == filePages
+	writeOB8Site(siteDir, [path], 'group')
+	assert listPages(siteDir) and set(listPages(siteDir)) <= groupPages
+	writeOB8Site(siteDir, [path])
+	assert listPages(siteDir) == filePages
+
+def test_an_incremental_run_rewrites_only_what_changed(tmp_path):
+	siteDir = str(tmp_path / 'site')
+	paths = [str(tmp_path / 'bank{}.syx'.format(i)) for i in range(3)]
+	for path in paths:
+		shutil.copy(factoryPath, path)
+	assert writeOB8Site(siteDir, paths) == (3, 3)
+	with open(os.path.join(siteDir, 'site.json')) as f:
+		assert 'records' not in json.load(f)['files'][paths[0]]
+	times = {name: os.stat(os.path.join(siteDir, name)).st_mtime_ns for name in os.listdir(siteDir)}
+	assert writeOB8Site(siteDir, paths) == (0, 3)
+	assert times == {name: os.stat(os.path.join(siteDir, name)).st_mtime_ns for name in os.listdir(siteDir)}
+	with open(paths[1], 'ab') as f:
+		f.write(readFactoryBank()[:60])
+	assert writeOB8Site(siteDir, paths) == (1, 3)
+	rewritten = sorted(name for name in os.listdir(siteDir) if times.get(name) != os.stat(os.path.join(siteDir, name)).st_mtime_ns)
+	stem = os.path.splitext(getOB8SitePageName(paths[1]))[0]
+	assert rewritten == sorted([stem + '.html', stem + '.records', 'index.html', 'site.json'])
+	with open(os.path.join(siteDir, 'index.html')) as f:
+		assert f.read().count('<tr>') == 3*120 + 1
@@ -0,0 +1,82 @@
+import os
+import pytest
+from ob8syx import OB8LibraryStore, appendOB8LibraryStore, getOB8Program, getOB8ProgramAt, getOB8Programs, main, openOB8LibraryStore
+
+factoryPath = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ob8factory.syx')
+
+# a 60-byte sysex message from another manufacturer
+foreignMessage = b'\xf0\x43' + bytes(57) + b'\xf7'
+
+def readFactoryBank():
+	with open(factoryPath, 'rb') as f:
+		return f.read()
+
+# writes the factory programs from start to end as a file that begins with a foreign message, so the programs
+# start at byte 60, and returns its path
+def writeBank(tmp_path, name, start, end):
+	path = tmp_path / name
+	path.write_bytes(foreignMessage + readFactoryBank()[start*60:end*60])
+	return str(path)
+
+# returns (path, offset, program) for every program of the banks written by writeBank, in order
+def getExpectedPrograms(banks):
+	bank = readFactoryBank()
+	return [(path, 60 + (k - start)*60, getOB8Program(bank, k*60)) for path, start, end in banks for k in range(start, end)]
+
+def readStore(storePath):
+	store = openOB8LibraryStore(storePath)
+	return [store.getLocation(k) + (store[k].toDict(),) for k in range(len(store))]
+
+def test_appending_banks(tmp_path):
+	banks = [(writeBank(tmp_path, 'a.syx', 0, 100), 0, 100), (writeBank(tmp_path, 'b.syx', 100, 120), 100, 120)]
+	storePath = str(tmp_path / 'library.ob8')
+	assert appendOB8LibraryStore(storePath, [path for path, start, end in banks]) == (120, 2)
+	assert readStore(storePath) == getExpectedPrograms(banks)
+	assert [program.toDict() for program in openOB8LibraryStore(storePath)] == getOB8Programs(readFactoryBank())
+
+def test_known_files_are_skipped(tmp_path, monkeypatch):
+	banks = [(writeBank(tmp_path, 'a.syx', 0, 100), 0, 100), (writeBank(tmp_path, 'b.syx', 100, 120), 100, 120)]
+	storePath = str(tmp_path / 'library.ob8')
+	appendOB8LibraryStore(storePath, [banks[0][0]])
+	size = os.path.getsize(storePath)
+	# the same file named from its own directory, and a new one
+	monkeypatch.chdir(tmp_path)
+	assert appendOB8LibraryStore(storePath, ['a.syx']) == (0, 0)
+	assert os.path.getsize(storePath) == size
+	assert appendOB8LibraryStore(storePath, ['a.syx', 'b.syx']) == (20, 1)
+	assert readStore(storePath) == getExpectedPrograms(banks)
+
+def test_an_unfinished_update_is_ignored_and_replaced(tmp_path):
+	banks = [(writeBank(tmp_path, 'a.syx', 0, 100), 0, 100), (writeBank(tmp_path, 'b.syx', 100, 120), 100, 120)]
+	storePath = str(tmp_path / 'library.ob8')
+	appendOB8LibraryStore(storePath, [banks[0][0]])
+	with open(storePath, 'ab') as f:
+		f.write(b'OB8S' + bytes(100))
+	assert readStore(storePath) == getExpectedPrograms(banks[:1])
+	assert appendOB8LibraryStore(storePath, [banks[1][0]]) == (20, 1)
+	assert readStore(storePath) == getExpectedPrograms(banks)
+
+def test_program_at_in_a_store(tmp_path):
+	banks = [(writeBank(tmp_path, 'a.syx', 0, 100), 0, 100), (writeBank(tmp_path, 'b.syx', 100, 120), 100, 120)]
+	storePath = str(tmp_path / 'library.ob8')
+	for path, start, end in banks:
+		appendOB8LibraryStore(storePath, [path])
+	programs = getOB8Programs(readFactoryBank())
+	# the first and last program of both segments
+	for k in (0, 99, 100, 119):
+		assert getOB8ProgramAt(storePath, k) == programs[k]
+	with pytest.raises(IndexError):
+		getOB8ProgramAt(storePath, 120)
+
+def test_printing_a_store(tmp_path):
+	banks = [(writeBank(tmp_path, 'a.syx', 0, 100), 0, 100), (writeBank(tmp_path, 'b.syx', 100, 120), 100, 120)]
+	storePath = str(tmp_path / 'library.ob8')
+	appendOB8LibraryStore(storePath, [path for path, start, end in banks])
+	main(['-o', str(tmp_path / 'store.txt'), storePath])
+	main(['-o', str(tmp_path / 'banks.txt')] + [path for path, start, end in banks])
+	with open(str(tmp_path / 'store.txt')) as f, open(str(tmp_path / 'banks.txt')) as g:
+		assert f.read() == g.read()
+
+def test_other_files_are_not_stores():
+	with pytest.raises(ValueError):
+		OB8LibraryStore(readFactoryBank(), factoryPath)